@@ -1,31 +1,193 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING, Optional
+
 import streamlit as st
-import pandas as pd
-from src.load_wb_data import load_gdp_data
+from src.constants import DEFAULT_INDICATORS
+
+# The loader stack (pandas, requests, pyarrow) is imported inside the
+# functions below, after the page header has been sent to the browser
+if TYPE_CHECKING:
+    import pandas as pd
+    from src.analysis import AnalysisIndex
+    from src.compare import ComparisonEngine
+    from src.growth import GrowthEngine
+    from src.memo import VersionedMemo
+    from src.query import PanelQuery
+    from src.refresh import BackgroundRefresher
+    from src.shared_panel import SharedPanelReader
+
+
+# How old the in-memory snapshot may get before a background refresh starts
+REFRESH_INTERVAL_SECONDS = 60 * 60
+
+# Years of the World Bank panel
+START_YEAR, END_YEAR = 2000, 2020
 
-from src.analysis import (
-    compute_global_yearly_average,
-    summarize_global_trend,
-    compute_region_vs_world,
-    # compute_rich_poor_gap,  # <- keep/import if you actually use it later
-)
+# Rows per page of the data preview table
+PREVIEW_PAGE_SIZE = 50
 
+# Multi-process deployments: attach to the panel published by
+# `python -m src.shared_panel --dir <dir>` instead of loading a private copy
+SHARED_PANEL_DIR = os.environ.get("WEALTH_SHARED_PANEL")
 
-@st.cache_data
-def load_worldbank_data() -> pd.DataFrame:
+# Results of the per-selection analytics kept across reruns and sessions
+QUERY_MEMO_SIZE = 512
+
+# Peer comparison: peer set choices and the number of nearest peers
+PEER_MODES = {
+    "Nearest peers (trajectory)": "nearest",
+    "Same income level": "income_level",
+    "Same region": "region",
+    "Custom selection": "custom",
+}
+PEER_COUNT = 5
+
+
+def fetch_worldbank_panel(offline: bool = False):
     """
-    Load and cache the World Bank GDP per capita dataset,
-    using the API loader which includes the country-level filter.
+    Load the World Bank multi-indicator panel (GDP per capita, population,
+    life expectancy) through the unified loader, which includes the
+    country-level filter.
+
+    Args:
+        offline (bool): Serve whatever the on-disk cache holds, however old,
+            without revalidating it over the network.
     """
-    # Use the unified load_gdp_data function
-    # It attempts API first, then falls back to CSV, and includes the country filter.
-    df = load_gdp_data(use_api=True)
+    from src.cache import IndicatorCache
+    from src.load_wb_data import load_gdp_data
+
+    # The on-disk cache survives process restarts, unlike st.cache_data.
+    cache = IndicatorCache(ttl_seconds=float("inf")) if offline else IndicatorCache()
+    return load_gdp_data(
+        use_api=True, indicators=DEFAULT_INDICATORS, start_year=START_YEAR, end_year=END_YEAR,
+        cache=cache, compact=True,
+    )
+
+
+def cached_panel_fetched_at() -> float:
+    """
+    When the on-disk snapshot read by the offline load was downloaded or
+    last revalidated (its oldest indicator; 0 if one is not cached).
+    """
+    from src.cache import IndicatorCache
+
+    return IndicatorCache().fetched_at(DEFAULT_INDICATORS.values(), START_YEAR, END_YEAR)
+
+
+@st.cache_resource
+def get_refresher() -> BackgroundRefresher:
+    """
+    One refresher per server process (st.cache_resource is shared by all
+    sessions): the first render reads the last on-disk snapshot, later
+    refreshes run in a background thread, one at a time. The snapshot's
+    age is that of the cache entries, so an old one is refreshed at once.
+    """
+    from src.refresh import BackgroundRefresher
+
+    return BackgroundRefresher(
+        loader=fetch_worldbank_panel,
+        initial_loader=lambda: fetch_worldbank_panel(offline=True),
+        initial_loaded_at=cached_panel_fetched_at,
+        max_age_seconds=REFRESH_INTERVAL_SECONDS,
+    )
+
+
+@st.cache_resource
+def get_shared_reader() -> SharedPanelReader:
+    """
+    One reader per server process, mapping the published panel: every
+    process on the machine shares the same pages, and the reader switches
+    to a new version as soon as it is published.
+    """
+    from src.shared_panel import SharedPanelReader
+
+    return SharedPanelReader(SHARED_PANEL_DIR)
+
+
+def load_worldbank_data() -> tuple:
+    """
+    Return the current World Bank panel without blocking on the network:
+    stale data is served while a background refresh is in flight.
+    The returned frame is shared by all sessions and must not be modified.
+
+    Returns:
+        tuple: (DataFrame, version). The version changes whenever the
+        background refresh (or the shared panel publisher) swaps in new
+        data and keys the derived caches.
+    """
+    import pandas as pd
+
+    source = get_shared_reader() if SHARED_PANEL_DIR else get_refresher()
+    snapshot = source.get()
 
     # Handle failure (Streamlit best practice)
-    if df is None:
-        st.error("Could not load data from API or local file. Check console for details.")
-        return pd.DataFrame()
+    if snapshot is None:
+        if SHARED_PANEL_DIR:
+            st.error(f"No panel has been published to '{SHARED_PANEL_DIR}' yet. Is the publisher running?")
+        else:
+            st.error("Could not load data from API or local file. Check console for details.")
+        return pd.DataFrame(), 0
+
+    return snapshot.data, snapshot.version
+
+
+@st.cache_resource(max_entries=2)
+def get_panel_query(version: int, _df: pd.DataFrame) -> PanelQuery:
+    """
+    Sorted, country-indexed view of one snapshot, built once per data
+    version and shared by all sessions (`_df` is not hashed).
+    """
+    from src.query import PanelQuery
+
+    return PanelQuery(_df, group_type="country")
+
+
+@st.cache_resource(max_entries=8)
+def get_analysis_index(
+    version: int, value_col: str, weight_col: Optional[str], _frame: pd.DataFrame
+) -> AnalysisIndex:
+    """Per-year aggregates of one indicator, built once per data version."""
+    from src.analysis import AnalysisIndex
+
+    return AnalysisIndex(_frame, value_col, weight_col=weight_col)
+
+
+@st.cache_resource(max_entries=8)
+def get_weighted_stats(version: int, value_col: str, _frame: pd.DataFrame) -> pd.DataFrame:
+    """Population-weighted mean, median and inequality per year, once per data version."""
+    from src.analysis import compute_weighted_yearly_stats
+
+    return compute_weighted_yearly_stats(_frame, value_col, "population")
+
 
-    return df
+@st.cache_resource(max_entries=8)
+def get_comparison_engine(version: int, value_col: str, _frame: pd.DataFrame) -> ComparisonEngine:
+    """Country x year peer comparisons of one indicator, built once per data version."""
+    from src.compare import ComparisonEngine
+
+    return ComparisonEngine(_frame, value_col)
+
+
+@st.cache_resource
+def get_query_memo() -> VersionedMemo:
+    """
+    Results of the analysis helpers, keyed by data version and arguments
+    (the frame is never hashed) and shared by all sessions: a country or
+    indicator that was shown before is answered from memory.
+    """
+    from src.memo import VersionedMemo
+
+    return VersionedMemo(maxsize=QUERY_MEMO_SIZE)
+
+
+@st.cache_resource(max_entries=8)
+def get_growth_engine(version: int, value_col: str, _frame: pd.DataFrame) -> GrowthEngine:
+    """Country x year growth analytics of one indicator, built once per data version."""
+    from src.growth import GrowthEngine
+
+    return GrowthEngine(_frame, value_col)
 
 
 def main() -> None:
@@ -42,8 +204,27 @@ def main() -> None:
         "This is the skeleton version – we will add more sections next."
     )
 
-    # Load data (cached)
-    df = load_worldbank_data()
+    # The header above is already on screen while the data stack loads
+    import pandas as pd
+    from src.load_wb_data import memory_footprint
+    from src.analysis import (
+        compute_global_yearly_average,
+        summarize_global_trend,
+        compute_region_vs_world,
+        # compute_rich_poor_gap,  # <- keep/import if you actually use it later
+    )
+
+    # Load data (last good snapshot, refreshed in the background)
+    df, data_version = load_worldbank_data()
+
+    # Per-selection analytics are memoized per data version
+    memo = get_query_memo()
+    memo_stats = memo.stats()
+    st.sidebar.caption(
+        f"Query cache: {memo_stats.hit_rate:.0%} hits "
+        f"({memo_stats.hits:,} hits, {memo_stats.misses:,} misses, "
+        f"{memo_stats.size:,}/{memo_stats.maxsize:,} entries)"
+    )
 
     if df.empty:
         st.info("No data available. Please check data loading configuration.")
@@ -60,24 +241,32 @@ def main() -> None:
 
     st.write(f"Showing data for: **{preview_label}**")
 
-    # Filter once by group_type
-    filtered_df = df[df["group_type"] == preview_type].copy()
+    # Filter and sort once per data version; reruns only slice this view
+    query = get_panel_query(data_version, df)
+    filtered_df = query.frame
 
     if filtered_df.empty:
         st.info("No country-level data available.")
         return
 
-    # Table: drop group_type column
-    preview_df = (
-        filtered_df.loc[:, ["region_code", "region_name", "year", "gdp_per_capita"]]
-        .reset_index(drop=True)
-    )
+    # Indicator columns available in the loaded panel
+    indicator_cols = [col for col in DEFAULT_INDICATORS if col in filtered_df.columns]
+    if not indicator_cols:
+        st.info("No indicator columns available.")
+        return
+
+    # Table: drop group_type column, materialize only the visible page
+    preview_cols = ["region_code", "region_name", "year"] + indicator_cols
+    n_pages = query.n_pages(PREVIEW_PAGE_SIZE)
+    page_no = st.number_input("Page", min_value=1, max_value=n_pages, value=1, step=1)
+    preview_df = query.page(int(page_no), PREVIEW_PAGE_SIZE, preview_cols)
 
-    st.dataframe(preview_df.head(50), use_container_width=True)
+    st.dataframe(preview_df, use_container_width=True, hide_index=True)
 
     st.caption(
-        f"Showing {min(50, len(filtered_df)):,} of {len(filtered_df):,} rows "
-        f"for group type: **{preview_label}**"
+        f"Page {int(page_no):,} of {n_pages:,} – {len(query):,} rows "
+        f"for group type: **{preview_label}** "
+        f"(cached frame: {memory_footprint(df)['total_bytes'] / 1024:,.0f} KiB)"
     )
 
     # ----------------------------
@@ -85,8 +274,23 @@ def main() -> None:
     # ----------------------------
     st.subheader("Focus on a single country")
 
-    # 👉 ALL countries available
-    country_options = sorted(filtered_df["region_name"].unique())
+    value_col = st.selectbox(
+        "Indicator:",
+        indicator_cols,
+        format_func=lambda col: col.replace("_", " ").capitalize(),
+    )
+    value_label = value_col.replace("_", " ")
+
+    # World figures per head (population-weighted) instead of per country
+    can_weight = "population" in filtered_df.columns and value_col != "population"
+    weighted = can_weight and st.checkbox("Population-weighted world average", value=True)
+    weight_col = "population" if weighted else None
+
+    # Per-year aggregates computed once per data version, shared by every chart below
+    analysis_index = get_analysis_index(data_version, value_col, weight_col, filtered_df)
+
+    # 👉 ALL countries available (already sorted by the query layer)
+    country_options = query.countries
 
     if not country_options:
         st.info("No country list available.")
@@ -97,23 +301,21 @@ def main() -> None:
         )
 
         # Show all rows for this country (no .head(50) here!)
-        country_detail = (
-            filtered_df[filtered_df["region_name"] == selected_country]
-            .loc[:, ["year", "gdp_per_capita"]]
-            .sort_values("year")
-            .reset_index(drop=True)
-        )
+        country_detail = query.country(selected_country, ["year"] + indicator_cols)
 
-        st.write(f"GDP per capita over time – **{selected_country}**")
-        st.dataframe(country_detail, use_container_width=True)
+        st.write(f"Indicators over time – **{selected_country}**")
+        st.dataframe(country_detail, use_container_width=True, hide_index=True)
 
         # Country vs world chart synced with selection
-        country_vs_world = compute_region_vs_world(df, selected_country)
+        country_vs_world = memo.call(
+            compute_region_vs_world, data_version, analysis_index,
+            selected_country, value_col, weight_col,
+        )
         # Make 'year' the index for a nice line chart
         if "year" in country_vs_world.columns:
             country_vs_world = country_vs_world.set_index("year")
 
-        st.subheader(f"{selected_country} vs World – GDP per Capita")
+        st.subheader(f"{selected_country} vs World – {value_label.capitalize()}")
         st.line_chart(country_vs_world, height=350)
 
     # ----------------------------
@@ -125,27 +327,149 @@ def main() -> None:
     if filtered_df.empty:
         st.info("No data available for this group type.")
     else:
-        summary_group = summarize_global_trend(filtered_df)
+        summary_group = memo.call(
+            summarize_global_trend, data_version, analysis_index, value_col, weight_col
+        )
 
         c1, c2, c3 = st.columns(3)
         c1.metric(
-            label=f"GDP per capita in {summary_group['first_year']}",
-            value=f"${summary_group['first_value']:,.0f}",
+            label=f"{value_label.capitalize()} in {summary_group['first_year']}",
+            value=f"{summary_group['first_value']:,.0f}",
         )
         c2.metric(
-            label=f"GDP per capita in {summary_group['last_year']}",
-            value=f"${summary_group['last_value']:,.0f}",
+            label=f"{value_label.capitalize()} in {summary_group['last_year']}",
+            value=f"{summary_group['last_value']:,.0f}",
         )
         c3.metric(
             label=f"Growth since {summary_group['first_year']}",
             value=f"{summary_group['growth_pct']:.1f}%",
         )
 
-        st.subheader(f"{nice_name}: Average GDP per Capita Over Time")
+        st.subheader(f"{nice_name}: Average {value_label.capitalize()} Over Time")
 
-        yearly_avg_group = compute_global_yearly_average(filtered_df)
+        yearly_avg_group = memo.call(
+            compute_global_yearly_average, data_version, analysis_index, value_col, weight_col
+        )
         st.line_chart(yearly_avg_group, height=350)
 
+        if can_weight:
+            st.subheader(f"Between-country inequality – {value_label.capitalize()} (population-weighted)")
+            inequality = get_weighted_stats(data_version, value_col, filtered_df)
+            i1, i2 = st.columns(2)
+            i1.line_chart(inequality[["gini", "theil"]], height=300)
+            i2.line_chart(inequality[["top_share", "bottom_share"]], height=300)
+            st.caption(
+                "Each country counts as its population at its per-capita value. "
+                "top_share / bottom_share: income share of the richest 10% / poorest 40%."
+            )
+
+    # ----------------------------
+    # PEER COMPARISON
+    # ----------------------------
+    st.header(f"🤝 Peer comparison – {value_label.capitalize()}")
+
+    comparison = get_comparison_engine(data_version, value_col, filtered_df)
+    panel_countries = list(comparison.panel.names)
+
+    if not country_options or selected_country not in comparison.panel.row_of:
+        st.info("No data for the selected country and indicator.")
+    else:
+        # Every peer set below comes from batched calls on the pivoted matrix
+        nearest = comparison.nearest_peers([selected_country], k=PEER_COUNT)
+        peer_mode = PEER_MODES[st.radio("Compare with:", list(PEER_MODES), horizontal=True)]
+        if peer_mode == "nearest":
+            peers = nearest["peer"].tolist()
+        elif peer_mode == "custom":
+            peers = st.multiselect(
+                "Peer countries:",
+                [name for name in panel_countries if name != selected_country],
+                default=nearest["peer"].tolist(),
+            )
+        else:
+            peers = comparison.peer_group(selected_country, peer_mode)
+
+        if not peers:
+            st.info(f"No peers found for {selected_country}.")
+        else:
+            versus = comparison.versus_peers(selected_country, peers)
+            latest = versus.dropna(subset=["gap_pct"])
+            if not latest.empty:
+                year, row = latest.index[-1], latest.iloc[-1]
+                p1, p2, p3 = st.columns(3)
+                p1.metric(label=f"Peers observed in {year}", value=f"{int(row['peers'])}")
+                p2.metric(label=f"Gap to peer mean in {year}", value=f"{row['gap_pct']:+.1f}%")
+                p3.metric(label=f"Percentile among peers in {year}", value=f"{row['percentile']:.0f}")
+
+            st.subheader(f"{selected_country} vs {len(peers)} peers")
+            st.line_chart(
+                versus[["value", "peer_mean", "peer_median"]].rename(columns={"value": selected_country}),
+                height=350,
+            )
+
+        with st.expander(f"Nearest peers of {selected_country} by trajectory"):
+            st.dataframe(nearest, use_container_width=True, hide_index=True)
+            st.caption("Distance: RMS difference of log values over the common years (0.1 ≈ 10%).")
+
+        compared = st.multiselect(
+            "Countries to compare:",
+            panel_countries,
+            default=[selected_country] + [name for name in peers if name in comparison.panel.row_of][:3],
+        )
+        if compared:
+            st.line_chart(
+                pd.DataFrame({name: comparison.panel.row(name) for name in compared}), height=350
+            )
+            panel_years = [int(year) for year in comparison.panel.years]
+            rank_start, rank_end = st.select_slider(
+                "Rank movement between:", options=panel_years, value=(panel_years[0], panel_years[-1])
+            )
+            st.dataframe(
+                comparison.rank_movements(rank_start, rank_end, countries=compared),
+                use_container_width=True,
+            )
+            st.caption("Ranks among all countries (1 = highest); rank_change > 0 means the country moved up.")
+
+    # ----------------------------
+    # GROWTH ANALYTICS
+    # ----------------------------
+    st.header(f"📈 Growth analytics – {value_label.capitalize()}")
+
+    growth = get_growth_engine(data_version, value_col, filtered_df)
+    years = growth.panel.years
+    if len(years) < 2:
+        st.info("Not enough years for growth analytics.")
+        return
+
+    start_year, end_year = st.slider(
+        "Window:",
+        min_value=int(years[0]),
+        max_value=int(years[-1]),
+        value=(int(years[0]), int(years[-1])),
+    )
+    if start_year == end_year:
+        st.info("Select a window of at least two years.")
+        return
+
+    # Every window is answered from the engine's cached matrices
+    window_summary = growth.summary(start_year, end_year).dropna(subset=["cagr_pct"])
+    regions_summary = growth.rollup("region").summary(start_year, end_year)
+
+    g1, g2 = st.columns(2)
+    g1.write(f"Fastest-growing countries, CAGR {start_year}–{end_year}")
+    g1.dataframe(window_summary.nlargest(10, "cagr_pct"), use_container_width=True)
+    g2.write(f"Regions, CAGR {start_year}–{end_year}")
+    g2.dataframe(regions_summary.sort_values("cagr_pct", ascending=False), use_container_width=True)
+
+    if not country_options or selected_country not in growth.panel.row_of:
+        st.info("No growth series for the selected country and indicator.")
+    else:
+        st.write(f"Year-over-year growth and 5-year volatility – **{selected_country}**")
+        country_growth = pd.DataFrame({
+            "yoy_growth_pct": growth.yoy_growth().loc[selected_country],
+            "volatility_5y": growth.rolling_volatility(5, min_periods=2).loc[selected_country],
+        })
+        st.line_chart(country_growth.loc[start_year:end_year], height=300)
+
 
 if __name__ == "__main__":
     main()
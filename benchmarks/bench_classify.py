@@ -0,0 +1,52 @@
+"""
+Benchmark: per-row GroupClassifier.classify apply vs. the vectorized
+classify_series / aggregate_mask paths (object and categorical columns).
+The variants without "(names)" also look up the ISO3 codes, i.e. do
+twice the work of the name-only apply.
+
+Run from the project root:
+    python -m benchmarks.bench_classify
+"""
+
+import timeit
+
+from benchmarks.synthetic import make_wb_frame
+from src.grouping import GroupClassifier
+
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+
+def main() -> None:
+    classifier = GroupClassifier()
+
+    print(f"{'rows':>10} | {'variant':<26} | {'time (s)':>9} | {'speedup':>7}")
+    for n_rows in SIZES:
+        df = make_wb_frame(n_rows)
+        names, codes = df["region_name"], df["region_code"]
+        cat_names, cat_codes = names.astype("category"), codes.astype("category")
+
+        # The vectorized paths must agree with the per-row classifier
+        expected = names.apply(classifier.classify)
+        assert (classifier.classify_series(names).astype(object) == expected).all()
+        assert (classifier.classify_series(cat_names).astype(object) == expected).all()
+        assert (classifier.aggregate_mask(names) == (expected != "other")).all()
+
+        variants = {
+            "apply(classify)": lambda: names.apply(classifier.classify),
+            "classify_series (names)": lambda: classifier.classify_series(names),
+            "classify_series": lambda: classifier.classify_series(names, codes),
+            "classify_series (category)": lambda: classifier.classify_series(cat_names, cat_codes),
+            "aggregate_mask": lambda: classifier.aggregate_mask(names, codes),
+            "aggregate_mask (category)": lambda: classifier.aggregate_mask(cat_names, cat_codes),
+        }
+
+        baseline = None
+        for label, func in variants.items():
+            seconds = min(timeit.repeat(func, number=1, repeat=3))
+            baseline = baseline or seconds
+            print(f"{len(df):>10,} | {label:<26} | {seconds:>9.4f} | {baseline / seconds:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
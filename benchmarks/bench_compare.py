@@ -0,0 +1,151 @@
+"""
+Benchmark: peer comparisons with ad hoc pandas loops (previous approach:
+one groupby / filter per country) vs. the ComparisonEngine's batched
+NumPy calls, on a panel of the catalog's real countries (so income
+levels and regions are known) over 65 years, 10% of values missing.
+
+Every engine result is checked against the loop version first.
+
+Run from the project root:
+    python -m benchmarks.bench_compare
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.compare import ComparisonEngine
+from src.country_catalog import load_country_catalog
+
+
+FIRST_YEAR, N_YEARS = 1960, 65
+MISSING_SHARE = 0.1
+K = 5
+N_LOOP_QUERIES = 20
+
+
+def make_country_panel(seed: int = 0) -> pd.DataFrame:
+    """Long frame over the catalog's countries with log-normal GDP-like paths."""
+    rng = np.random.default_rng(seed)
+    countries = load_country_catalog().frame
+    countries = countries[~countries["aggregate"].astype(bool)]
+    n = len(countries)
+
+    base = rng.lognormal(8.5, 1.2, size=n)[:, None]
+    growth = rng.normal(0.02, 0.015, size=(n, N_YEARS)).cumsum(axis=1)
+    values = base * np.exp(growth)
+    values[rng.random(values.shape) < MISSING_SHARE] = np.nan
+
+    return pd.DataFrame(
+        {
+            "region_code": np.repeat(countries.index.to_numpy(dtype=object), N_YEARS),
+            "region_name": np.repeat(countries["name"].to_numpy(dtype=object), N_YEARS),
+            "year": np.tile(np.arange(FIRST_YEAR, FIRST_YEAR + N_YEARS), n),
+            "gdp_per_capita": values.ravel(),
+        }
+    ).dropna()
+
+
+# --- Previous approach: loops over countries ---
+
+def versus_group_loop(df: pd.DataFrame) -> pd.DataFrame:
+    income = df["region_code"].map(load_country_catalog().income_level_of)
+    out = {}
+    for name, own in df.groupby("region_name"):
+        group = income[own.index[0]]
+        others = df[(income == group) & (df["region_name"] != name)]
+        mean = others.groupby("year")["gdp_per_capita"].mean()
+        values = own.set_index("year")["gdp_per_capita"]
+        out[name] = (values / mean.reindex(values.index) - 1) * 100
+    return pd.DataFrame(out).T
+
+
+def nearest_peers_loop(df: pd.DataFrame, country: str, k: int, min_years: int) -> list:
+    wide = np.log(df.pivot(index="year", columns="region_name", values="gdp_per_capita"))
+    own = wide[country]
+    distances = {}
+    for other in wide.columns:
+        if other == country:
+            continue
+        diff = (own - wide[other]).dropna()
+        if len(diff) >= min_years:
+            distances[other] = float(np.sqrt((diff ** 2).mean()))
+    return sorted(distances.items(), key=lambda item: item[1])[:k]
+
+
+def rank_movements_loop(df: pd.DataFrame, start_year: int, end_year: int) -> pd.DataFrame:
+    ranks = {}
+    for year in (start_year, end_year):
+        rows = df[df["year"] == year].sort_values("region_name")
+        ranks[year] = rows.set_index("region_name")["gdp_per_capita"].rank(ascending=False, method="first")
+    out = pd.DataFrame({"rank_start": ranks[start_year], "rank_end": ranks[end_year]})
+    out["rank_change"] = out["rank_start"] - out["rank_end"]
+    return out
+
+
+def timed(func) -> tuple:
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    df = make_country_panel()
+    countries = sorted(df["region_name"].unique())
+    end_year = FIRST_YEAR + N_YEARS - 1
+    min_years = N_YEARS // 2
+    print(f"Panel: {len(countries)} countries x {N_YEARS} years, {len(df):,} observations\n")
+    print(f"{'comparison':<34} | {'loops (s)':>10} | {'engine (s)':>10} | {'speedup':>8}")
+
+    def report(label: str, loop_seconds: float, engine_seconds: float) -> None:
+        print(f"{label:<34} | {loop_seconds:>10.4f} | {engine_seconds:>10.4f} | "
+              f"{loop_seconds / engine_seconds:>7.0f}x")
+
+    # Pivot once; a new engine per timing so no cached result is reused
+    engine, pivot_seconds = timed(lambda: ComparisonEngine(df))
+    print(f"{'(pivot into the matrix, once)':<34} | {'':>10} | {pivot_seconds:>10.4f} |")
+
+    # --- every country vs the rest of its income level ---
+    expected, loop_seconds = timed(lambda: versus_group_loop(df))
+    result, engine_seconds = timed(lambda: ComparisonEngine(engine.panel).versus_group("income_level"))
+    result = result.loc[expected.index, expected.columns]
+    assert np.allclose(result.to_numpy(), expected.to_numpy(dtype=np.float64), equal_nan=True)
+    report("all countries vs income group", loop_seconds, engine_seconds)
+
+    # --- k nearest peers by trajectory ---
+    queries = countries[:N_LOOP_QUERIES]
+    expected, loop_seconds = timed(lambda: [nearest_peers_loop(df, c, K, min_years) for c in queries])
+    result, engine_seconds = timed(lambda: ComparisonEngine(engine.panel).nearest_peers(queries, K))
+    for country, peers in zip(queries, expected):
+        found = result[result["region_name"] == country]
+        assert list(found["peer"]) == [name for name, _ in peers]
+        assert np.allclose(found["distance"], [distance for _, distance in peers])
+    report(f"{K} nearest peers, {N_LOOP_QUERIES} countries", loop_seconds, engine_seconds)
+
+    _, all_seconds = timed(lambda: ComparisonEngine(engine.panel).nearest_peers(countries, K))
+    report(f"{K} nearest peers, all {len(countries)} countries",
+           loop_seconds / N_LOOP_QUERIES * len(countries), all_seconds)
+
+    # --- rank movements ---
+    expected, loop_seconds = timed(lambda: rank_movements_loop(df, FIRST_YEAR + 20, end_year))
+    result, engine_seconds = timed(
+        lambda: ComparisonEngine(engine.panel).rank_movements(FIRST_YEAR + 20, end_year)
+    )
+    result = result.loc[expected.index, expected.columns]
+    assert np.allclose(result.to_numpy(), expected.to_numpy(), equal_nan=True)
+    report("rank movements, all countries", loop_seconds, engine_seconds)
+
+    # --- one country vs an arbitrary peer set ---
+    country, peers = countries[0], countries[1:40]
+    peer_rows = df[df["region_name"].isin(peers)]
+    expected_mean = peer_rows.groupby("year")["gdp_per_capita"].mean()
+    expected_median = peer_rows.groupby("year")["gdp_per_capita"].median()
+    result = engine.versus_peers(country, peers)
+    assert np.allclose(result["peer_mean"].reindex(expected_mean.index), expected_mean)
+    assert np.allclose(result["peer_median"].reindex(expected_median.index), expected_median)
+    print("\nAll engine results match the loop versions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: work done by one dashboard rerun (preview table, country detail,
+per-year aggregates) with the previous full-frame filtering vs. the
+per-version PanelQuery / AnalysisIndex, over a synthetic 1M-row panel.
+
+Run from the project root:
+    python -m benchmarks.bench_dashboard_rerun
+"""
+
+import timeit
+
+import pandas as pd
+
+from benchmarks.synthetic import make_wb_frame
+from src.analysis import AnalysisIndex, compute_global_yearly_average
+from src.grouping import get_default_classifier
+from src.query import PanelQuery
+
+
+N_ROWS = 1_000_000
+INDICATORS = ("gdp_per_capita", "population", "life_expectancy")
+COUNTRY = "Country 00100"
+
+
+def rerun_previous(df: pd.DataFrame, country: str) -> tuple:
+    """The previous rerun: copy, scan and sort the full frame every time."""
+    filtered_df = df[df["group_type"] == "country"].copy()
+    preview = (
+        filtered_df.loc[:, ["region_code", "region_name", "year", *INDICATORS]]
+        .reset_index(drop=True)
+        .head(50)
+    )
+    detail = (
+        filtered_df[filtered_df["region_name"] == country]
+        .loc[:, ["year", *INDICATORS]]
+        .sort_values("year")
+        .reset_index(drop=True)
+    )
+    yearly = compute_global_yearly_average(AnalysisIndex(filtered_df, "gdp_per_capita"))
+    return preview, detail, yearly
+
+
+def rerun_query(query: PanelQuery, index: AnalysisIndex, country: str) -> tuple:
+    """The new rerun: slices of objects built once per data version."""
+    preview = query.page(1, 50, ["region_code", "region_name", "year", *INDICATORS])
+    detail = query.country(country, ["year", *INDICATORS])
+    yearly = compute_global_yearly_average(index)
+    return preview, detail, yearly
+
+
+def main() -> None:
+    # Same shape as load_gdp_data's output: aggregates dropped, group_type "country"
+    df = make_wb_frame(N_ROWS, indicators=INDICATORS)
+    df = df[~get_default_classifier().aggregate_mask(df["region_name"], df["region_code"])]
+    df = df.assign(group_type="country").reset_index(drop=True)
+    country = COUNTRY if COUNTRY in set(df["region_name"]) else df["region_name"].iloc[0]
+
+    build_seconds = min(timeit.repeat(lambda: PanelQuery(df), number=1, repeat=3))
+    query = PanelQuery(df)
+    index = AnalysisIndex(query.frame, "gdp_per_capita")
+
+    # Same country detail either way
+    _, old_detail, old_yearly = rerun_previous(df, country)
+    _, new_detail, new_yearly = rerun_query(query, index, country)
+    pd.testing.assert_frame_equal(old_detail, new_detail.reset_index(drop=True))
+    pd.testing.assert_series_equal(old_yearly, new_yearly)
+
+    previous = min(timeit.repeat(lambda: rerun_previous(df, country), number=1, repeat=5))
+    current = min(timeit.repeat(lambda: rerun_query(query, index, country), number=1, repeat=5))
+
+    print(f"Panel: {len(df):,} rows, {len(query.countries):,} countries")
+    print(f"PanelQuery build (once per data version): {build_seconds:.4f} s")
+    print(f"{'variant':<20} | {'rerun (s)':>10} | {'speedup':>7}")
+    print(f"{'previous':<20} | {previous:>10.4f} | {1.0:>6.1f}x")
+    print(f"{'PanelQuery':<20} | {current:>10.4f} | {previous / current:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: the pure-Python demo path on a synthetic 1M-row demo CSV,
+readlines() + split(",") dictionaries with three analysis passes
+(previous) vs. streaming csv.reader into typed array columns with a
+single-pass summary. Reports time and peak traced memory.
+
+Run from the project root:
+    python -m benchmarks.bench_demo_data
+"""
+
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from src.demo_data import load_demo_data, summarize_demo_data
+
+
+N_ROWS = 1_000_000
+
+
+def load_previous(filepath: str) -> list:
+    """The previous loader: whole file in memory, one dict of strings per row."""
+    countries = []
+    with open(filepath, "r") as file:
+        lines = file.readlines()
+        header = lines[0].strip().split(",")
+        for line in lines[1:]:
+            values = line.strip().split(",")
+            countries.append({header[i]: values[i] for i in range(len(header))})
+    return countries
+
+
+def summarize_previous(countries: list) -> dict:
+    """The previous analysis: three passes, re-parsing strings in each."""
+    total_gdp = 0
+    for country in countries:
+        total_gdp += float(country["gdp_per_capita"])
+    average_gdp = total_gdp / len(countries)
+
+    max_life, max_country = None, None
+    for country in countries:
+        life_value = float(country["life_expectancy"])
+        if (max_life is None) or (life_value > max_life):
+            max_life, max_country = life_value, country["country"]
+
+    above_average = [
+        c["country"] for c in countries if float(c["gdp_per_capita"]) > average_gdp
+    ]
+    return {"average_gdp": average_gdp, "max_life": max_life,
+            "max_country": max_country, "above_average": above_average}
+
+
+def write_demo_csv(filepath: str, n_rows: int) -> None:
+    rng = random.Random(0)
+    with open(filepath, "w") as file:
+        file.write("country,year,gdp_per_capita,life_expectancy\n")
+        for i in range(n_rows):
+            file.write(f"Country {i},2020,{rng.randint(500, 90000)},{rng.uniform(50, 85):.1f}\n")
+
+
+def measure(func) -> tuple:
+    """Time one run, then trace a second run's peak memory (tracemalloc is slow)."""
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "demo.csv")
+        write_demo_csv(path, N_ROWS)
+
+        old, old_seconds, old_peak = measure(lambda: summarize_previous(load_previous(path)))
+        new, new_seconds, new_peak = measure(lambda: summarize_demo_data(load_demo_data(path)))
+
+    assert old["max_country"] == new["max_country"]
+    assert old["above_average"] == new["above_average"]
+    assert abs(old["average_gdp"] - new["average_gdp"]) < 1e-6
+
+    print(f"Demo CSV: {N_ROWS:,} rows")
+    print(f"{'variant':<26} | {'time (s)':>9} | {'peak MiB':>9}")
+    print(f"{'readlines + 3 passes':<26} | {old_seconds:>9.3f} | {old_peak / 2**20:>9.1f}")
+    print(f"{'csv.reader + array cols':<26} | {new_seconds:>9.3f} | {new_peak / 2**20:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
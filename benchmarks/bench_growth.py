@@ -0,0 +1,82 @@
+"""
+Benchmark: YoY growth, 5-year rolling mean / volatility and a CAGR window
+for every country, per-country pandas loop vs. GrowthEngine (one pivoted
+country x year matrix), over a synthetic 200-country x 65-year panel.
+
+Run from the project root:
+    python -m benchmarks.bench_growth
+"""
+
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_wb_frame
+from src.growth import GrowthEngine
+from src.grouping import WB_AGGREGATES
+
+
+N_COUNTRIES = 200
+N_YEARS = 65
+WINDOW = 5
+
+
+def growth_loop(df: pd.DataFrame, start_year: int, end_year: int) -> pd.DataFrame:
+    """Per-country pandas version of GrowthEngine.summary."""
+    rows = {}
+    for name, group in df.groupby("region_name"):
+        series = group.set_index("year")["gdp_per_capita"].sort_index()
+        series = series.reindex(range(series.index.min(), series.index.max() + 1))
+        yoy = series.pct_change(fill_method=None) * 100
+        volatility = yoy.rolling(WINDOW, min_periods=2).std()
+        series.rolling(WINDOW).mean()
+        start, end = series.get(start_year), series.get(end_year)
+        rows[name] = {
+            "cagr_pct": ((end / start) ** (1 / (end_year - start_year)) - 1) * 100,
+            "volatility": volatility.get(end_year),
+        }
+    return pd.DataFrame.from_dict(rows, orient="index")
+
+
+def growth_engine(df: pd.DataFrame, start_year: int, end_year: int) -> pd.DataFrame:
+    engine = GrowthEngine(df)
+    engine.rolling_mean(WINDOW)
+    return engine.summary(start_year, end_year, WINDOW)
+
+
+def main() -> None:
+    n_rows = (N_COUNTRIES + len(WB_AGGREGATES)) * N_YEARS
+    df = make_wb_frame(n_rows, n_years=N_YEARS, missing_share=0.05)
+    df = df[~df["region_code"].isin(WB_AGGREGATES)]
+    start_year, end_year = 1980, 2020
+
+    expected = growth_loop(df, start_year, end_year)
+    actual = growth_engine(df, start_year, end_year)
+    for column in ("cagr_pct", "volatility"):
+        assert np.allclose(actual[column], expected[column], equal_nan=True)
+
+    engine = GrowthEngine(df)
+    engine.summary(start_year, end_year, WINDOW)
+    variants = {
+        "per-country loop": lambda: growth_loop(df, start_year, end_year),
+        "GrowthEngine (cold)": lambda: growth_engine(df, start_year, end_year),
+        "GrowthEngine (cached)": lambda: engine.summary(start_year, end_year, WINDOW),
+    }
+
+    print(f"Panel: {len(df):,} rows")
+    print(f"{'variant':<24} | {'time (s)':>9} | {'speedup':>7}")
+    baseline = None
+    for label, func in variants.items():
+        seconds = min(timeit.repeat(func, number=1, repeat=5))
+        baseline = baseline or seconds
+        print(f"{label:<24} | {seconds:>9.5f} | {baseline / seconds:>6.0f}x")
+
+    # Windows not seen before reuse the cached YoY / volatility / rank matrices
+    windows = [(start, start + 10) for start in range(1960, 2010)]
+    seconds = timeit.timeit(lambda: [engine.summary(s, e, WINDOW) for s, e in windows], number=1)
+    print(f"{'new window (warm)':<24} | {seconds / len(windows):>9.5f} | {baseline * len(windows) / seconds:>6.0f}x")
+
+
+if __name__ == "__main__":
+    main()
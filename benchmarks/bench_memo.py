@@ -0,0 +1,88 @@
+"""
+Benchmark: one dashboard "country view" (country vs world series plus
+the global trend summary) over a synthetic 1M-row panel, computed from
+the full frame, from the per-version AnalysisIndex, or answered by a
+VersionedMemo keyed by data version.
+
+Then replays 2,000 random views over 50 countries through a memo
+smaller than the number of distinct views, to show the hit rate and
+evictions.
+
+Run from the project root:
+    python -m benchmarks.bench_memo
+"""
+
+import math
+import random
+import timeit
+
+import pandas as pd
+
+from benchmarks.synthetic import make_wb_frame
+from src.analysis import AnalysisIndex, compute_region_vs_world, summarize_global_trend
+from src.memo import VersionedMemo
+
+
+N_ROWS = 1_000_000
+N_VIEWS = 2_000
+N_COUNTRIES = 50
+VERSION = 1
+
+
+def view(data, country: str) -> tuple:
+    return compute_region_vs_world(data, country), summarize_global_trend(data)
+
+
+def memo_view(memo: VersionedMemo, index: AnalysisIndex, country: str) -> tuple:
+    return (
+        memo.call(compute_region_vs_world, VERSION, index, country),
+        memo.call(summarize_global_trend, VERSION, index),
+    )
+
+
+def best_seconds(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3)) / number
+
+
+def main() -> None:
+    df = make_wb_frame(N_ROWS)
+    index = AnalysisIndex(df, "gdp_per_capita")
+    memo = VersionedMemo()
+    country = "Country 00100"
+
+    # Same results, whichever way they are computed
+    expected = view(df, country)
+    for result in (view(index, country), memo_view(memo, index, country), memo_view(memo, index, country)):
+        pd.testing.assert_frame_equal(result[0], expected[0])
+        assert all(math.isclose(result[1][k], v, rel_tol=1e-12) for k, v in expected[1].items())
+
+    print(f"One country view, {len(df):,} rows")
+    print(f"{'variant':<26} | {'per view':>12} | {'speedup':>8}")
+    variants = [
+        ("full frame", lambda: view(df, country), 3),
+        ("AnalysisIndex", lambda: view(index, country), 200),
+        ("VersionedMemo (hit)", lambda: memo_view(memo, index, country), 20_000),
+    ]
+    base = None
+    for label, func, number in variants:
+        seconds = best_seconds(func, number)
+        base = base or seconds
+        print(f"{label:<26} | {seconds * 1e6:>9.1f} µs | {base / seconds:>7.0f}x")
+
+    # A browsing session: random countries, memo smaller than the views
+    countries = sorted(df["region_name"].unique())[:N_COUNTRIES]
+    rng = random.Random(0)
+    session = VersionedMemo(maxsize=32)
+    for _ in range(N_VIEWS):
+        memo_view(session, index, rng.choice(countries))
+
+    stats = session.stats()
+    print(f"\n{N_VIEWS:,} views over {N_COUNTRIES} countries, maxsize {stats.maxsize}: "
+          f"{stats.hit_rate:.1%} hits, {stats.misses:,} misses, {stats.evictions:,} evictions")
+    for name, function_stats in session.stats_by_function().items():
+        print(f"  {name:<24} {function_stats.hits:>6,} hits {function_stats.misses:>5,} misses "
+              f"{function_stats.size:>4} entries")
+
+
+if __name__ == "__main__":
+    main()
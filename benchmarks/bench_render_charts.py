@@ -0,0 +1,81 @@
+"""
+Benchmark: rendering one chart per country (200 countries x 65 years),
+a new pyplot figure per chart (previous approach) vs. render_charts with
+one reused figure per worker, a process pool, and the render cache.
+
+Run from the project root:
+    python -m benchmarks.bench_render_charts
+"""
+
+import os
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from benchmarks.synthetic import make_wb_frame
+from src.grouping import WB_AGGREGATES
+from src.visualization import build_chart_jobs, render_charts
+
+
+N_COUNTRIES = 200
+N_YEARS = 65
+
+
+def render_previous(jobs: list, out_dir: str) -> None:
+    """The previous pattern: a new pyplot figure and tight_layout per chart."""
+    for job in jobs:
+        fig, ax = plt.subplots(figsize=(8, 4))
+        ax.plot(job["years"], job["values"], label=job["label"])
+        ax.plot(job["years"], job["reference"], label="World average", linestyle="--")
+        ax.set_title(job["title"])
+        ax.legend()
+        plt.tight_layout()
+        fig.savefig(os.path.join(out_dir, job["filename"]))
+        # Closed here only so the benchmark itself does not leak figures
+        plt.close(fig)
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    n_rows = (N_COUNTRIES + len(WB_AGGREGATES)) * N_YEARS
+    df = make_wb_frame(n_rows, n_years=N_YEARS)
+    df = df[~df["region_code"].isin(WB_AGGREGATES)]
+    jobs = build_chart_jobs(df, kinds=("country",))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dirs = {name: os.path.join(tmp, name) for name in ("old", "serial", "pool")}
+        for path in dirs.values():
+            os.makedirs(path)
+
+        results = {
+            "pyplot per chart": timed(lambda: render_previous(jobs, dirs["old"])),
+            "reused figure, 1 proc": timed(
+                lambda: render_charts(df, dirs["serial"], kinds=("country",), max_workers=1)
+            ),
+            "reused figure, pool": timed(
+                lambda: render_charts(df, dirs["pool"], kinds=("country",))
+            ),
+            "cached rerun": timed(
+                lambda: render_charts(df, dirs["pool"], kinds=("country",))
+            ),
+        }
+        rerun = render_charts(df, dirs["pool"], kinds=("country",))
+        assert rerun["rendered"] == 0 and rerun["skipped"] == len(jobs)
+
+    print(f"Charts: {len(jobs)} countries x {N_YEARS} years, {os.cpu_count()} CPUs")
+    print(f"{'variant':<24} | {'time (s)':>9} | {'speedup':>7}")
+    baseline = results["pyplot per chart"]
+    for label, seconds in results.items():
+        print(f"{label:<24} | {seconds:>9.3f} | {baseline / seconds:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
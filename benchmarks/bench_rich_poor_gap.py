@@ -0,0 +1,79 @@
+"""
+Benchmark: compute_rich_poor_gap, per-year Python loop vs. the vectorized
+sort-and-segment pass (and the prebuilt AnalysisIndex), over a synthetic
+200-country x 65-year x 20-indicator panel.
+
+Run from the project root:
+    python -m benchmarks.bench_rich_poor_gap
+"""
+
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_wb_frame
+from src.analysis import AnalysisIndex, compute_rich_poor_gap, compute_top_bottom_per_year
+from src.grouping import WB_AGGREGATES
+
+
+N_COUNTRIES = 200
+N_YEARS = 65
+INDICATORS = tuple(f"indicator_{i:02d}" for i in range(20))
+
+
+def rich_poor_gap_loop(df: pd.DataFrame, value_col: str) -> pd.DataFrame:
+    """The previous implementation: one idxmax/idxmin per year group."""
+    grouped = df.groupby(["year", "region_name"])[value_col].mean().dropna().reset_index()
+
+    records = []
+    for year, subset in grouped.groupby("year"):
+        richest_row = subset.loc[subset[value_col].idxmax()]
+        poorest_row = subset.loc[subset[value_col].idxmin()]
+        records.append(
+            {
+                "year": int(year),
+                "richest_region": richest_row["region_name"],
+                "poorest_region": poorest_row["region_name"],
+                "richest_gdp": float(richest_row[value_col]),
+                "poorest_gdp": float(poorest_row[value_col]),
+                "gap": float(richest_row[value_col] - poorest_row[value_col]),
+            }
+        )
+    return pd.DataFrame(records).sort_values("year")
+
+
+def main() -> None:
+    # make_wb_frame also appends the World Bank aggregates; keep only countries
+    n_rows = (N_COUNTRIES + len(WB_AGGREGATES)) * N_YEARS
+    df = make_wb_frame(n_rows, n_years=N_YEARS, indicators=INDICATORS, missing_share=0.05)
+    df = df[~df["region_code"].isin(WB_AGGREGATES)]
+    indexes = {col: AnalysisIndex(df, col) for col in INDICATORS}
+
+    # Same schema and values as the loop implementation
+    for col in INDICATORS:
+        expected = rich_poor_gap_loop(df, col).reset_index(drop=True)
+        actual = compute_rich_poor_gap(df, col)
+        assert list(actual.columns) == list(expected.columns)
+        assert (actual["richest_region"] == expected["richest_region"]).all()
+        assert (actual["poorest_region"] == expected["poorest_region"]).all()
+        assert np.allclose(actual["gap"], expected["gap"])
+
+    variants = {
+        "loop (previous)": lambda: [rich_poor_gap_loop(df, c) for c in INDICATORS],
+        "vectorized": lambda: [compute_rich_poor_gap(df, c) for c in INDICATORS],
+        "AnalysisIndex": lambda: [compute_rich_poor_gap(indexes[c], c) for c in INDICATORS],
+        "top/bottom-5 vectorized": lambda: [compute_top_bottom_per_year(df, 5, c) for c in INDICATORS],
+    }
+
+    print(f"Panel: {len(df):,} rows x {len(INDICATORS)} indicators")
+    print(f"{'variant':<24} | {'time (s)':>9} | {'speedup':>7}")
+    baseline = None
+    for label, func in variants.items():
+        seconds = min(timeit.repeat(func, number=1, repeat=3))
+        baseline = baseline or seconds
+        print(f"{label:<24} | {seconds:>9.4f} | {baseline / seconds:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
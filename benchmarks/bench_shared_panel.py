@@ -0,0 +1,203 @@
+"""
+Benchmark: memory of N reader processes holding the same 2M-row,
+three-indicator panel. Each process either loads its own copy (as with
+one loader per Streamlit process or batch worker) or attaches to the
+panel published by PanelPublisher through a SharedPanelReader.
+
+Also checks that the mapped frame matches the published one (sorted by
+region and year), that the dashboard helpers give the same results on
+it without copying it, and that a reader switches to a new version
+while frames of the old one stay readable.
+
+Memory is measured twice per process: once the panel is loaded, and
+again after building the dashboard's per-version objects on it
+(PanelQuery, AnalysisIndex, GrowthEngine), since a helper that copies
+the frame would undo the sharing.
+
+Memory is read from /proc/self/smaps_rollup, so the memory part only
+runs on Linux. PSS (proportional set size) charges shared pages to each
+process in proportion, so its sum over processes is the real footprint.
+
+Run from the project root:
+    python -m benchmarks.bench_shared_panel
+"""
+
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+
+from benchmarks.synthetic import make_wb_frame
+from src.analysis import AnalysisIndex, compute_global_yearly_average, compute_weighted_yearly_stats
+from src.growth import GrowthEngine
+from src.load_wb_data import compact_frame
+from src.query import PanelQuery, sort_panel
+from src.shared_panel import PanelPublisher, SharedPanelReader, read_pointer
+
+
+N_ROWS = 2_000_000
+N_PROCESSES = 4
+INDICATORS = ("gdp_per_capita", "population", "life_expectancy")
+SMAPS_ROLLUP = "/proc/self/smaps_rollup"
+
+
+def make_panel() -> pd.DataFrame:
+    df = make_wb_frame(N_ROWS, indicators=INDICATORS, missing_share=0.05)
+    df["group_type"] = "country"
+    df = compact_frame(df)
+    df["imputed"] = False
+    return df
+
+
+def memory_kib() -> dict:
+    """Rss, Pss and private (unshared) memory of this process, in KiB."""
+    fields = {}
+    with open(SMAPS_ROLLUP) as file:
+        for line in file:
+            key, _, value = line.partition(":")
+            if value.strip().endswith("kB"):
+                fields[key] = int(value.split()[0])
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "private": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def build_derived(df: pd.DataFrame) -> tuple:
+    """The objects the dashboard builds once per data version."""
+    return (
+        PanelQuery(df),
+        AnalysisIndex(df, "gdp_per_capita", "population"),
+        GrowthEngine(df),
+    )
+
+
+def worker(mode: str, directory: str, barrier, results) -> None:
+    """Load or attach the panel, touch every value, build the derived objects, report memory."""
+    before = memory_kib()
+    start = time.perf_counter()
+    if mode == "shared":
+        df = SharedPanelReader(directory).get().data
+    else:
+        path = os.path.join(directory, read_pointer(directory)["file"])
+        df = feather.read_table(path, memory_map=False).to_pandas()
+    seconds = time.perf_counter() - start
+
+    # Read every value, as the dashboard's aggregations do
+    checksum = sum(float(np.nansum(df[column].to_numpy())) for column in INDICATORS)
+
+    # Measure once every process holds the panel, so shared pages are split
+    barrier.wait()
+    loaded = memory_kib()
+    barrier.wait()
+
+    derived = build_derived(df)
+    barrier.wait()
+    built = memory_kib()
+    results.put((
+        {key: loaded[key] - before[key] for key in loaded},
+        {key: built[key] - before[key] for key in built},
+        seconds,
+        checksum,
+    ))
+    barrier.wait()
+    del derived
+
+
+def measure_processes(mode: str, directory: str) -> tuple:
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(N_PROCESSES)
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(mode, directory, barrier, results))
+        for _ in range(N_PROCESSES)
+    ]
+    for process in processes:
+        process.start()
+    reports = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return reports
+
+
+def assert_same_frame(left: pd.DataFrame, right: pd.DataFrame) -> None:
+    """Same values (NaN == NaN) and dtypes; much faster than assert_frame_equal on categoricals."""
+    assert left.equals(right) and left.dtypes.equals(right.dtypes)
+
+
+def check_dashboard_helpers(original: pd.DataFrame, mapped: pd.DataFrame) -> None:
+    """The dashboard's per-version objects give the same results on the mapped frame."""
+    query = PanelQuery(mapped)
+    pd.testing.assert_frame_equal(PanelQuery(original).page(3, 50), query.page(3, 50))
+    # Already sorted by the publisher: the query shares the mapped buffers
+    assert np.shares_memory(
+        query.frame["gdp_per_capita"].to_numpy(), mapped["gdp_per_capita"].to_numpy()
+    ), "PanelQuery copied the mapped frame"
+    pd.testing.assert_series_equal(
+        compute_global_yearly_average(AnalysisIndex(original, "gdp_per_capita", "population")),
+        compute_global_yearly_average(AnalysisIndex(mapped, "gdp_per_capita", "population")),
+    )
+    pd.testing.assert_frame_equal(
+        compute_weighted_yearly_stats(original, "gdp_per_capita"),
+        compute_weighted_yearly_stats(mapped, "gdp_per_capita"),
+    )
+    pd.testing.assert_frame_equal(
+        GrowthEngine(original).summary(1970, 2020), GrowthEngine(mapped).summary(1970, 2020)
+    )
+
+
+def main() -> None:
+    df = make_panel()
+
+    with tempfile.TemporaryDirectory() as directory:
+        publisher = PanelPublisher(directory)
+        version = publisher.publish(df)
+
+        # --- 1. Correctness of the mapped frame ---
+        reader = SharedPanelReader(directory, poll_seconds=0)
+        first = reader.get()
+        assert first.version == version
+        df = sort_panel(df)
+        assert_same_frame(first.data, df)
+        assert not first.data["gdp_per_capita"].to_numpy().flags.writeable, "expected a zero-copy column"
+        check_dashboard_helpers(df, first.data)
+
+        # --- 2. Version switch ---
+        revised = df.assign(gdp_per_capita=df["gdp_per_capita"] * 1.01)
+        publisher.publish(revised)
+        second = reader.get()
+        assert second.version == version + 1
+        assert_same_frame(second.data, revised)
+        # Frames of the previous version stay valid
+        assert_same_frame(first.data, df)
+        print(f"Panel: {len(df):,} rows, {read_pointer(directory)['bytes'] / 2**20:,.1f} MiB on disk; "
+              f"mapped frame matches, version switch {version} -> {second.version} ok")
+
+        # --- 3. Memory of N processes ---
+        if not os.path.exists(SMAPS_ROLLUP):
+            print(f"{SMAPS_ROLLUP} not available: skipping the memory comparison.")
+            return
+
+        print(f"\n{N_PROCESSES} processes holding the panel (MiB per process, PSS summed)")
+        print(f"{'variant':<36} | {'load s':>7} | {'RSS':>7} | {'private':>7} | {'PSS':>7} | {'PSS total':>9}")
+        checksums = set()
+        for label, mode in (("private copy each", "copy"), ("shared mapping", "shared")):
+            reports = measure_processes(mode, directory)
+            seconds = np.mean([r[2] for r in reports])
+            checksums.update(round(r[3], 3) for r in reports)
+            for stage, suffix in ((0, ""), (1, " + derived objects")):
+                rss = np.mean([r[stage]["rss"] for r in reports]) / 1024
+                private = np.mean([r[stage]["private"] for r in reports]) / 1024
+                pss = np.mean([r[stage]["pss"] for r in reports]) / 1024
+                print(f"{label + suffix:<36} | {seconds:>7.3f} | {rss:>7.1f} | {private:>7.1f} | "
+                      f"{pss:>7.1f} | {pss * N_PROCESSES:>9.1f}")
+        assert len(checksums) == 1
+
+
+if __name__ == "__main__":
+    main()
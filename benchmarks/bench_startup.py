@@ -0,0 +1,163 @@
+"""
+Benchmark: startup cost of each entry point, checked against a budget.
+
+Every entry point is imported in a fresh interpreter under
+`python -X importtime`; the module's cumulative import time (best of
+`--repeat` runs) must stay within its budget, and none of the heavy
+libraries (pandas, NumPy, requests, pyarrow, matplotlib) may be loaded
+before the work that needs them starts. For app.py, Streamlit's own
+import is subtracted (it is skipped if Streamlit is not installed).
+
+The full loader and plotting stacks are measured too, for reference:
+that is what every invocation paid at startup before imports were
+deferred.
+
+Exits with status 1 if an entry point is over budget or imports a heavy
+library, so it can gate a CI job.
+
+Run from the project root:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --repeat 10 --budget-scale 2
+"""
+
+import argparse
+import importlib.util
+import subprocess
+import sys
+import time
+from typing import Optional
+
+
+HEAVY_MODULES = ("pandas", "numpy", "requests", "pyarrow", "matplotlib")
+
+# Entry point -> (module imported at startup, budget in ms)
+ENTRY_POINTS = {
+    "demo (src.demo_data)": ("src.demo_data", 30),
+    "python -m src.main": ("src.main", 50),
+    "python -m src.cli": ("src.cli", 100),
+    "streamlit run app.py": ("app", 50),
+}
+
+# Deferred stacks, reported without a budget
+REFERENCE_STACKS = {
+    "loader stack": "src.load_wb_data",
+    "plotting stack": "src.visualization",
+}
+
+DEFAULT_REPEAT = 5
+
+
+def parse_importtime(stderr: str) -> list:
+    """
+    Parse `-X importtime` output into (self_us, cumulative_us, depth, name)
+    tuples, in import order (a module's imports come before it).
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_part, cumulative_us, name = line.split("|", 2)
+        # One leading space, then two more per nesting level
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        entries.append((int(self_part.split(":")[1]), int(cumulative_us), depth, name.strip()))
+    return entries
+
+
+def module_cost(entries: list, module: str, exclude: Optional[str] = None) -> Optional[float]:
+    """
+    Cumulative import time of `module` in ms, minus its direct imports of
+    `exclude` (and their subpackages). None if the module was not imported.
+    """
+    for i, (_, cumulative_us, depth, name) in enumerate(entries):
+        if name != module:
+            continue
+        excluded = 0
+        if exclude is not None:
+            # Direct children are the depth+1 entries since the previous sibling
+            j = i - 1
+            while j >= 0 and entries[j][2] > depth:
+                child = entries[j]
+                if child[2] == depth + 1 and (child[3] == exclude or child[3].startswith(exclude + ".")):
+                    excluded += child[1]
+                j -= 1
+        return (cumulative_us - excluded) / 1000
+    return None
+
+
+def measure(
+    module: str, repeat: int, exclude: Optional[str] = None, check_modules: tuple = HEAVY_MODULES
+) -> dict:
+    """
+    Best-of-`repeat` import cost and wall time of `module` in a fresh
+    interpreter, plus which of `check_modules` it loaded.
+    """
+    best_ms, best_wall, heavy = None, None, []
+    probe = (
+        f"import {module}, sys; "
+        f"print(','.join(m for m in {tuple(check_modules)!r} if m in sys.modules))"
+    )
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", probe],
+            capture_output=True, text=True,
+        )
+        wall = time.perf_counter() - start
+        if result.returncode != 0:
+            raise RuntimeError(f"importing {module} failed:\n{result.stderr[-2000:]}")
+
+        cost = module_cost(parse_importtime(result.stderr), module, exclude)
+        heavy = [m for m in result.stdout.strip().split(",") if m]
+        if best_ms is None or cost < best_ms:
+            best_ms = cost
+        if best_wall is None or wall < best_wall:
+            best_wall = wall
+    return {"import_ms": best_ms, "wall_ms": best_wall * 1000, "heavy": heavy}
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Runs per entry point (best is kept)")
+    parser.add_argument("--budget-scale", type=float, default=1.0,
+                        help="Multiply every budget (e.g. 2 on a slow CI runner)")
+    args = parser.parse_args(argv)
+
+    baseline = measure("sys", args.repeat)["wall_ms"]
+    print(f"Interpreter startup (python -c 'import sys'): {baseline:.1f} ms\n")
+    print(f"{'entry point':<22} | {'import ms':>9} | {'budget':>7} | {'wall ms':>8} | status")
+
+    failures = []
+    for label, (module, budget) in ENTRY_POINTS.items():
+        budget *= args.budget_scale
+        exclude = None
+        if module == "app":
+            if importlib.util.find_spec("streamlit") is None:
+                print(f"{label:<22} | {'-':>9} | {budget:>7.0f} | {'-':>8} | skipped (streamlit not installed)")
+                continue
+            exclude = "streamlit"
+
+        result = measure(module, args.repeat, exclude)
+        status = "ok"
+        if result["import_ms"] > budget:
+            status = "OVER BUDGET"
+        # Streamlit itself loads pandas; only the other entry points must stay light
+        if result["heavy"] and exclude is None:
+            status = f"imports {', '.join(result['heavy'])}"
+        if status != "ok":
+            failures.append(label)
+        print(f"{label:<22} | {result['import_ms']:>9.1f} | {budget:>7.0f} | {result['wall_ms']:>8.1f} | {status}")
+
+    print()
+    for label, module in REFERENCE_STACKS.items():
+        result = measure(module, args.repeat)
+        print(f"{label:<22} | {result['import_ms']:>9.1f} | {'-':>7} | {result['wall_ms']:>8.1f} | (deferred)")
+
+    if failures:
+        print(f"\nStartup budget exceeded: {', '.join(failures)}")
+        return 1
+    print("\nEvery entry point is within its startup budget.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Benchmark: population-weighted mean, median, Gini, Theil and top/bottom
+shares for every year, per-year groupby-apply vs. the fused
+sort-and-segment kernel (compute_weighted_yearly_stats), over a synthetic
+200-country x 65-year panel.
+
+Run from the project root:
+    python -m benchmarks.bench_weighted_stats
+"""
+
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_wb_frame
+from src.analysis import compute_weighted_yearly_stats
+from src.grouping import WB_AGGREGATES
+
+
+N_COUNTRIES = 200
+N_YEARS = 65
+
+
+def weighted_stats_year(group: pd.DataFrame) -> pd.Series:
+    """Straightforward per-year implementation (pairwise Gini)."""
+    group = group[(group["gdp_per_capita"] > 0) & (group["population"] > 0)]
+    group = group.sort_values("gdp_per_capita")
+    x = group["gdp_per_capita"].to_numpy()
+    w = group["population"].to_numpy()
+    p = w / w.sum()
+    mu = (p * x).sum()
+    cum_pop = np.r_[0, np.cumsum(p)]
+    lorenz = np.r_[0, np.cumsum(p * x) / mu]
+    return pd.Series({
+        "weighted_mean": mu,
+        "weighted_median": x[np.searchsorted(cum_pop[1:], 0.5)],
+        "gini": (p[:, None] * p[None, :] * np.abs(x[:, None] - x[None, :])).sum() / (2 * mu),
+        "theil": (p * (x / mu) * np.log(x / mu)).sum(),
+        "top_share": 1 - np.interp(0.9, cum_pop, lorenz),
+        "bottom_share": np.interp(0.4, cum_pop, lorenz),
+    })
+
+
+def weighted_stats_loop(df: pd.DataFrame) -> pd.DataFrame:
+    return df.groupby("year")[["gdp_per_capita", "population"]].apply(weighted_stats_year)
+
+
+def main() -> None:
+    n_rows = (N_COUNTRIES + len(WB_AGGREGATES)) * N_YEARS
+    df = make_wb_frame(
+        n_rows, n_years=N_YEARS, indicators=("gdp_per_capita", "population"), missing_share=0.05
+    )
+    df = df[~df["region_code"].isin(WB_AGGREGATES)].dropna()
+
+    expected = weighted_stats_loop(df)
+    actual = compute_weighted_yearly_stats(df)
+    for column in expected.columns:
+        assert np.allclose(actual[column], expected[column]), column
+
+    variants = {
+        "per-year apply": lambda: weighted_stats_loop(df),
+        "fused kernel": lambda: compute_weighted_yearly_stats(df),
+    }
+
+    print(f"Panel: {len(df):,} rows")
+    print(f"{'variant':<16} | {'time (s)':>9} | {'speedup':>7}")
+    baseline = None
+    for label, func in variants.items():
+        seconds = min(timeit.repeat(func, number=1, repeat=5))
+        baseline = baseline or seconds
+        print(f"{label:<16} | {seconds:>9.5f} | {baseline / seconds:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
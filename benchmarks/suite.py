@@ -0,0 +1,244 @@
+"""
+Pipeline benchmark suite: load, classify, analyze and plot stages over
+synthetic World Bank-shaped datasets, fully offline.
+
+For every scale, each stage is timed (best of `repeat` runs) and then run
+once more under tracemalloc for its peak memory. Results are written as
+JSON together with the library versions, and can be compared against a
+previous run to flag regressions.
+
+Run from the project root:
+    python -m benchmarks.suite                                  # 10k, 100k, 1M rows
+    python -m benchmarks.suite --scales 10k 100k 1M 10M
+    python -m benchmarks.suite --baseline benchmarks/results/baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Optional
+
+import matplotlib
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_wb_frame, write_sdmx_csv
+from src.analysis import (
+    AnalysisIndex,
+    analyze_worldbank_data,
+    compute_global_yearly_average,
+    compute_region_vs_world,
+    compute_rich_poor_gap,
+    summarize_global_trend,
+)
+from src.grouping import get_default_classifier
+from src.load_wb_data import load_gdp_data
+from src.visualization import plot_global_gdp_trend
+
+
+DEFAULT_SCALES = ["10k", "100k", "1M"]
+DEFAULT_RESULTS_DIR = "benchmarks/results"
+
+# A stage regresses if it is this much slower than the baseline...
+DEFAULT_THRESHOLD = 0.20
+# ...and slower by at least this many seconds (ignores timer noise)
+MIN_REGRESSION_SECONDS = 0.005
+
+
+def parse_scale(scale: str) -> int:
+    """Turn "10k" / "1M" / "2500" into a row count."""
+    units = {"k": 1_000, "m": 1_000_000}
+    scale = scale.strip().lower()
+    if scale[-1] in units:
+        return int(float(scale[:-1]) * units[scale[-1]])
+    return int(scale)
+
+
+def build_stages(csv_path: str, plot_path: str) -> dict:
+    """
+    Return the benchmarked stages, in pipeline order.
+
+    Every stage takes the shared context dict and returns the value it
+    stores there (the next stages read the loaded frame from it).
+    """
+    classifier = get_default_classifier()
+
+    def quiet(func: Callable) -> Callable:
+        # analyze_worldbank_data prints its report; keep benchmark output readable
+        def run(ctx):
+            with contextlib.redirect_stdout(io.StringIO()):
+                return func(ctx)
+        return run
+
+    return {
+        "load_gdp_data": lambda ctx: load_gdp_data(use_api=False, csv_path=csv_path),
+        "classify": lambda ctx: classifier.classify_series(
+            ctx["raw"]["region_name"], ctx["raw"]["region_code"]
+        ),
+        "analysis_index": lambda ctx: AnalysisIndex(ctx["df"]),
+        "analyze_worldbank_data": quiet(lambda ctx: analyze_worldbank_data(ctx["df"])),
+        "compute_global_yearly_average": lambda ctx: compute_global_yearly_average(ctx["df"]),
+        "summarize_global_trend": lambda ctx: summarize_global_trend(ctx["df"]),
+        "compute_region_vs_world": lambda ctx: compute_region_vs_world(ctx["df"], ctx["country"]),
+        "compute_rich_poor_gap": lambda ctx: compute_rich_poor_gap(ctx["df"]),
+        "plot_global_gdp_trend": lambda ctx: plot_global_gdp_trend(ctx["df"], plot_path),
+    }
+
+
+def measure(func: Callable, ctx: dict, repeat: int) -> tuple:
+    """
+    Time `func(ctx)` (best of `repeat`), then measure its peak traced memory.
+
+    Returns:
+        tuple: (result, seconds, peak_bytes)
+    """
+    seconds = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(ctx)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    # Separate run: tracemalloc slows Python-level code down
+    tracemalloc.start()
+    try:
+        func(ctx)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return result, seconds, peak_bytes
+
+
+def run_scale(n_rows: int, repeat: int = 3, workdir: Optional[str] = None) -> list:
+    """
+    Run every stage on one synthetic dataset of about `n_rows` rows.
+
+    Returns:
+        list[dict]: One record per stage (scale, rows, stage, seconds, peak_bytes).
+    """
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        raw = make_wb_frame(n_rows, missing_share=0.02)
+        csv_path = write_sdmx_csv(raw, os.path.join(tmp, "gdp.csv"))
+        stages = build_stages(csv_path, os.path.join(tmp, "trend.png"))
+
+        ctx = {"raw": raw}
+        records = []
+        for stage, func in stages.items():
+            result, seconds, peak_bytes = measure(func, ctx, repeat)
+            if stage == "load_gdp_data":
+                ctx["df"] = result
+                ctx["country"] = result["region_name"].iloc[0]
+            records.append({
+                "rows": int(n_rows),
+                "stage": stage,
+                "seconds": seconds,
+                "peak_bytes": int(peak_bytes),
+            })
+    return records
+
+
+def environment() -> dict:
+    """Versions that explain most performance changes between runs."""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "matplotlib": matplotlib.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results: list, baseline: list, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """
+    Compare two result lists stage by stage (matched on rows and stage).
+
+    Returns:
+        list[dict]: The regressions: rows, stage, baseline and current
+        seconds, and the relative change.
+    """
+    previous = {(r["rows"], r["stage"]): r for r in baseline}
+    regressions = []
+    for record in results:
+        old = previous.get((record["rows"], record["stage"]))
+        if old is None or old["seconds"] <= 0:
+            continue
+        change = record["seconds"] / old["seconds"] - 1
+        if change > threshold and record["seconds"] - old["seconds"] > MIN_REGRESSION_SECONDS:
+            regressions.append({
+                "rows": record["rows"],
+                "stage": record["stage"],
+                "baseline_seconds": old["seconds"],
+                "seconds": record["seconds"],
+                "change": change,
+            })
+    return regressions
+
+
+def print_table(results: list, baseline: Optional[list] = None) -> None:
+    previous = {(r["rows"], r["stage"]): r for r in baseline or []}
+    print(f"{'rows':>10} | {'stage':<30} | {'time (s)':>9} | {'peak MiB':>9} | {'vs base':>8}")
+    for r in results:
+        old = previous.get((r["rows"], r["stage"]))
+        delta = f"{r['seconds'] / old['seconds'] - 1:+.0%}" if old and old["seconds"] > 0 else ""
+        print(
+            f"{r['rows']:>10,} | {r['stage']:<30} | {r['seconds']:>9.4f} | "
+            f"{r['peak_bytes'] / 2**20:>9.1f} | {delta:>8}"
+        )
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scales", nargs="+", default=DEFAULT_SCALES,
+                        help="Dataset sizes, e.g. 10k 100k 1M 10M")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage (best is kept)")
+    parser.add_argument("--output", help="Results JSON path (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", help="Previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown flagged as a regression (default 0.20)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for scale in args.scales:
+        n_rows = parse_scale(scale)
+        print(f"Running {n_rows:,} rows...", file=sys.stderr)
+        results.extend(run_scale(n_rows, repeat=args.repeat))
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            baseline = json.load(file)["results"]
+
+    print_table(results, baseline)
+
+    output = args.output or os.path.join(DEFAULT_RESULTS_DIR, time.strftime("%Y%m%d-%H%M%S.json"))
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(
+            {"created_at": time.time(), "environment": environment(), "results": results},
+            file, indent=2,
+        )
+    print(f"\nResults saved to {output}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for r in regressions:
+            print(
+                f"REGRESSION {r['stage']} @ {r['rows']:,} rows: "
+                f"{r['baseline_seconds']:.4f}s -> {r['seconds']:.4f}s ({r['change']:+.0%})"
+            )
+        if regressions:
+            return 1
+        print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
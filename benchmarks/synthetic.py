@@ -0,0 +1,94 @@
+"""
+Synthetic World Bank-shaped datasets for offline benchmarks.
+
+Frames have the loader's long layout (region_code, region_name, year,
+one float column per indicator) and include the World Bank aggregate
+rows, so classification and filtering do real work.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.grouping import WB_AGGREGATES
+
+
+def make_wb_frame(
+    n_rows: int,
+    n_years: int = 65,
+    first_year: int = 1960,
+    indicators: tuple = ("gdp_per_capita",),
+    missing_share: float = 0.0,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Build a country x year frame with roughly `n_rows` rows.
+
+    Args:
+        n_rows (int): Target number of rows (countries are added until reached).
+        n_years (int): Number of consecutive years per country.
+        first_year (int): First year of the panel.
+        indicators (tuple): Names of the float columns to generate.
+        missing_share (float): Share of values replaced by NaN.
+        seed (int): Random seed, for reproducible runs.
+
+    Returns:
+        pd.DataFrame: The synthetic frame, aggregates included.
+    """
+    rng = np.random.default_rng(seed)
+
+    n_aggregates = len(WB_AGGREGATES)
+    n_countries = max(1, -(-n_rows // n_years) - n_aggregates)
+
+    codes = [f"C{i:05d}" for i in range(n_countries)] + list(WB_AGGREGATES)
+    names = [f"Country {i:05d}" for i in range(n_countries)]
+    names += [name for name, _ in WB_AGGREGATES.values()]
+
+    n_regions = len(codes)
+    region_idx = np.repeat(np.arange(n_regions), n_years)
+    years = np.tile(np.arange(first_year, first_year + n_years), n_regions)
+
+    df = pd.DataFrame(
+        {
+            "region_code": np.asarray(codes, dtype=object)[region_idx],
+            "region_name": np.asarray(names, dtype=object)[region_idx],
+            "year": years.astype("int64"),
+        }
+    )
+
+    # Log-normal levels with a per-country trend, like GDP per capita
+    base = rng.lognormal(mean=8.5, sigma=1.2, size=n_regions)[region_idx]
+    trend = (1 + rng.normal(0.02, 0.01, size=n_regions))[region_idx]
+    for k, column in enumerate(indicators):
+        noise = rng.lognormal(0.0, 0.05, size=len(df))
+        values = base * (1 + 0.1 * k) * trend ** (years - first_year) * noise
+        if missing_share:
+            values[rng.random(len(df)) < missing_share] = np.nan
+        df[column] = values
+
+    return df
+
+
+def write_sdmx_csv(
+    df: pd.DataFrame,
+    filepath: str,
+    value_col: str = "gdp_per_capita",
+    indicator: str = "NY.GDP.PCAP.CD",
+) -> str:
+    """
+    Save a synthetic frame in the World Bank SDMX CSV layout read by
+    load_gdp_per_capita_from_csv (REF_AREA, REF_AREA_LABEL, ...).
+
+    Returns:
+        str: `filepath`.
+    """
+    out = pd.DataFrame(
+        {
+            "INDICATOR": indicator,
+            "REF_AREA": df["region_code"],
+            "REF_AREA_LABEL": df["region_name"],
+            "TIME_PERIOD": df["year"],
+            "OBS_VALUE": df[value_col],
+        }
+    )
+    out.to_csv(filepath, index=False, lineterminator="\n")
+    return filepath
@@ -1,8 +1,12 @@
+from typing import Optional
+
 import numpy as np
 import pandas as pd
 
+from src.instrumentation import stage
+
 
-def analyze_worldbank_data(df: pd.DataFrame) -> None:
+def analyze_worldbank_data(df: pd.DataFrame, value_col: str = "gdp_per_capita") -> None:
     """
     Perform pandas and NumPy-based analysis on the World Bank dataset.
 
@@ -11,52 +15,102 @@ def analyze_worldbank_data(df: pd.DataFrame) -> None:
     - global standard deviation
     - most recent year in the dataset
     - top 5 regions by GDP per capita for that year
+    - population-weighted mean, median and inequality measures
+      (if the panel has a population column)
 
     Args:
-        df (pd.DataFrame): Cleaned DataFrame returned by the loader.
+        df (pd.DataFrame): Cleaned DataFrame (or multi-indicator panel)
+            returned by the loader.
+        value_col (str): Indicator column to analyze.
     """
-    # Drop missing values just in case
-    df = df.dropna(subset=["gdp_per_capita"])
+    # Drop missing values just in case (panels can be sparse per indicator)
+    with stage("analyze.dropna") as s:
+        df = df.dropna(subset=[value_col])
+        s.set_rows(len(df))
+
+    is_gdp = value_col == "gdp_per_capita"
+    label = "GDP per capita" if is_gdp else value_col
+    unit = " USD" if is_gdp else ""
 
     # Global stats with numpy
-    gdp_values = df["gdp_per_capita"].values
-    global_mean = np.mean(gdp_values)
-    global_std = np.std(gdp_values)
+    with stage("analyze.global_stats"):
+        gdp_values = df[value_col].values
+        global_mean = np.mean(gdp_values)
+        global_std = np.std(gdp_values)
 
-    print("\n=== WORLD BANK GDP: GLOBAL STATS ===")
-    print(f"Global mean GDP per capita: {global_mean:,.2f} USD")
-    print(f"Global std dev GDP per capita: {global_std:,.2f} USD")
+    print(f"\n=== WORLD BANK {'GDP' if is_gdp else value_col}: GLOBAL STATS ===")
+    print(f"Global mean {label}: {global_mean:,.2f}{unit}")
+    print(f"Global std dev {label}: {global_std:,.2f}{unit}")
 
-    # Most recent year in the dataset
-    latest_year = df["year"].max()
-    latest_df = df[df["year"] == latest_year]
+    with stage("analyze.top5_latest") as s:
+        # Most recent year in the dataset
+        latest_year = df["year"].max()
+        latest_df = df[df["year"] == latest_year]
 
-    # Top 5 regions in that year
-    top5 = latest_df.nlargest(5, "gdp_per_capita")[["region_name", "gdp_per_capita"]]
+        # Top 5 regions in that year
+        top5 = latest_df.nlargest(5, value_col)[["region_name", value_col]]
+        s.set_rows(len(latest_df))
 
-    print(f"\nTop 5 regions in {latest_year} by GDP per capita:")
+    print(f"\nTop 5 regions in {latest_year} by {label}:")
     for i in range(len(top5)):
         region = top5.iloc[i]["region_name"]
-        gdp = top5.iloc[i]["gdp_per_capita"]
-        print(f" - {region}: {gdp:,.2f} USD")
+        gdp = top5.iloc[i][value_col]
+        print(f" - {region}: {gdp:,.2f}{unit}")
+
+    # Population-weighted view, when the panel carries population
+    if "population" in df.columns and value_col != "population":
+        with stage("analyze.weighted_stats"):
+            weighted = compute_weighted_yearly_stats(df, value_col, "population")
+        if not weighted.empty:
+            latest = weighted.iloc[-1]
+            print(f"\nPopulation-weighted {label} in {weighted.index[-1]}:")
+            print(f" - Mean: {latest['weighted_mean']:,.2f}{unit} (unweighted: {latest['mean']:,.2f}{unit})")
+            print(f" - Median: {latest['weighted_median']:,.2f}{unit}")
+            print(f" - Gini: {latest['gini']:.3f} | Theil: {latest['theil']:.3f}")
+            print(f" - Richest 10% hold {latest['top_share']:.1%}, poorest 40% hold {latest['bottom_share']:.1%}")
 
 
 # ---------- New helper functions for Streamlit ----------
 
-def compute_global_yearly_average(df: pd.DataFrame) -> pd.Series:
-    """Return a Series with the global average GDP per capita for each year."""
-    return df.groupby("year")["gdp_per_capita"].mean().sort_index()
+def compute_global_yearly_average(
+    df: pd.DataFrame, value_col: str = "gdp_per_capita", weight_col: Optional[str] = None
+) -> pd.Series:
+    """
+    Return a Series with the global average GDP per capita for each year.
+
+    With `weight_col` (e.g. "population"), each country counts in
+    proportion to its weight, so the result is the world figure per head
+    rather than the average of country figures.
+
+    All helpers below also accept a prebuilt AnalysisIndex instead of the
+    DataFrame, in which case they run in O(years).
+    """
+    if isinstance(df, AnalysisIndex):
+        _check_index(df, value_col, weight_col)
+        return df.yearly_average(weighted=weight_col is not None)
+    if weight_col is None:
+        return df.groupby("year")[value_col].mean().dropna().sort_index()
 
+    valid = df[value_col].notna() & df[weight_col].notna() & (df[weight_col] > 0)
+    valid = df.loc[valid, ["year", value_col, weight_col]]
+    weighted = (valid[value_col] * valid[weight_col]).groupby(valid["year"]).sum()
+    total = valid.groupby("year")[weight_col].sum()
+    return (weighted / total).rename(value_col).sort_index()
 
-def summarize_global_trend(df: pd.DataFrame) -> dict:
+
+def summarize_global_trend(
+    df: pd.DataFrame, value_col: str = "gdp_per_capita", weight_col: Optional[str] = None
+) -> dict:
     """
-    Compute a simple summary of the global GDP per capita trend.
+    Compute a simple summary of the global GDP per capita trend
+    (population-weighted with weight_col="population").
 
     Returns:
         dict with keys:
-            first_year, last_year, first_value, last_value, growth_pct
+            first_year, last_year, first_value, last_value, growth_pct,
+            cagr_pct (compound annual growth between first and last year)
     """
-    yearly_avg = compute_global_yearly_average(df)
+    yearly_avg = compute_global_yearly_average(df, value_col, weight_col)
 
     first_year = int(yearly_avg.index.min())
     last_year = int(yearly_avg.index.max())
@@ -64,6 +118,11 @@ def summarize_global_trend(df: pd.DataFrame) -> dict:
     last_value = float(yearly_avg.loc[last_year])
 
     growth_pct = (last_value / first_value - 1) * 100
+    n_years = last_year - first_year
+    if n_years > 0 and first_value > 0 and last_value > 0:
+        cagr_pct = ((last_value / first_value) ** (1 / n_years) - 1) * 100
+    else:
+        cagr_pct = float("nan")
 
     return {
         "first_year": first_year,
@@ -71,27 +130,36 @@ def summarize_global_trend(df: pd.DataFrame) -> dict:
         "first_value": first_value,
         "last_value": last_value,
         "growth_pct": growth_pct,
+        "cagr_pct": cagr_pct,
     }
 
 
-def compute_region_vs_world(df: pd.DataFrame, region_name: str) -> pd.DataFrame:
+def compute_region_vs_world(
+    df: pd.DataFrame,
+    region_name: str,
+    value_col: str = "gdp_per_capita",
+    weight_col: Optional[str] = None,
+) -> pd.DataFrame:
     """
     Build a DataFrame with GDP per capita for a given region
-    and the global average for each year.
+    and the global average (weighted by `weight_col`, if given) for each year.
 
     Columns:
         year, region_gdp, world_gdp
     """
     # Global average
-    global_series = compute_global_yearly_average(df)
+    global_series = compute_global_yearly_average(df, value_col, weight_col)
 
     # Selected region
-    region_df = df[df["region_name"] == region_name]
-    region_series = (
-        region_df.groupby("year")["gdp_per_capita"]
-        .mean()
-        .reindex(global_series.index)
-    )
+    if isinstance(df, AnalysisIndex):
+        region_series = df.region_series(region_name).reindex(global_series.index)
+    else:
+        region_df = df[df["region_name"] == region_name]
+        region_series = (
+            region_df.groupby("year")[value_col]
+            .mean()
+            .reindex(global_series.index)
+        )
 
     combined = pd.DataFrame(
         {
@@ -104,7 +172,7 @@ def compute_region_vs_world(df: pd.DataFrame, region_name: str) -> pd.DataFrame:
     return combined
 
 
-def compute_rich_poor_gap(df: pd.DataFrame) -> pd.DataFrame:
+def compute_rich_poor_gap(df: pd.DataFrame, value_col: str = "gdp_per_capita") -> pd.DataFrame:
     """
     For each year, find the richest and poorest regions and compute the gap.
 
@@ -112,24 +180,317 @@ def compute_rich_poor_gap(df: pd.DataFrame) -> pd.DataFrame:
         year, richest_region, poorest_region,
         richest_gdp, poorest_gdp, gap
     """
+    if isinstance(df, AnalysisIndex):
+        _check_index(df, value_col)
+        return pd.DataFrame(
+            {
+                "year": df.years.astype(int),
+                "richest_region": df.argmax,
+                "poorest_region": df.argmin,
+                "richest_gdp": df.max,
+                "poorest_gdp": df.min,
+                "gap": df.max - df.min,
+            }
+        )
+
+    # Top-1 / bottom-1 per year, all years in one vectorized pass
+    gap_df = compute_top_bottom_per_year(df, k=1, value_col=value_col)
+    gap_df["gap"] = gap_df["richest_gdp"] - gap_df["poorest_gdp"]
+
+    return gap_df[
+        ["year", "richest_region", "poorest_region", "richest_gdp", "poorest_gdp", "gap"]
+    ]
+
+
+def compute_top_bottom_per_year(
+    df: pd.DataFrame, k: int = 5, value_col: str = "gdp_per_capita"
+) -> pd.DataFrame:
+    """
+    For each year, find the k richest and k poorest regions.
+
+    Values are averaged per (year, region) first, then sorted once by
+    (year, value); each year's segment of the sorted arrays gives its
+    bottom k (segment start) and top k (segment start of the descending
+    order). Ties resolve to the first region name, like idxmax/idxmin.
+
+    Returns a DataFrame with columns:
+        year, rank, richest_region, richest_gdp, poorest_region, poorest_gdp
+    (rank 1 = richest / poorest; years with fewer than k regions get NaN).
+    """
+    if isinstance(df, AnalysisIndex):
+        _check_index(df, value_col)
+        return _top_bottom_arrays(df.row_years, df.values, df.regions, k)
+
     # Group by year and region, take mean in case there are multiple entries
-    grouped = df.groupby(["year", "region_name"])["gdp_per_capita"].mean().reset_index()
+    grouped = df.groupby(["year", "region_name"], observed=True)[value_col].mean().dropna()
+
+    return _top_bottom_arrays(
+        grouped.index.get_level_values("year").to_numpy(),
+        grouped.to_numpy(dtype="float64"),
+        grouped.index.get_level_values("region_name").to_numpy(),
+        k,
+    )
 
-    records = []
-    for year, subset in grouped.groupby("year"):
-        richest_row = subset.loc[subset["gdp_per_capita"].idxmax()]
-        poorest_row = subset.loc[subset["gdp_per_capita"].idxmin()]
 
-        records.append(
-            {
-                "year": int(year),
-                "richest_region": richest_row["region_name"],
-                "poorest_region": poorest_row["region_name"],
-                "richest_gdp": float(richest_row["gdp_per_capita"]),
-                "poorest_gdp": float(poorest_row["gdp_per_capita"]),
-                "gap": float(richest_row["gdp_per_capita"] - poorest_row["gdp_per_capita"]),
-            }
+def _top_bottom_arrays(
+    years: np.ndarray, values: np.ndarray, regions: np.ndarray, k: int
+) -> pd.DataFrame:
+    """Sort-and-segment kernel behind compute_top_bottom_per_year."""
+    # Stable sorts keep the original (year, region) order among ties
+    ascending = np.lexsort((values, years))
+    descending = np.lexsort((-values, years))
+
+    unique_years, seg_starts, counts = np.unique(
+        years[ascending], return_index=True, return_counts=True
+    )
+    n_years = len(unique_years)
+
+    # Position of every sorted row inside its year segment
+    seg_ids = np.repeat(np.arange(n_years), counts)
+    positions = np.arange(len(values)) - seg_starts[seg_ids]
+    keep = positions < k
+    slots = seg_ids[keep] * k + positions[keep]
+
+    result = {
+        "year": np.repeat(unique_years.astype(int), k),
+        "rank": np.tile(np.arange(1, k + 1), n_years),
+    }
+    for side, order in (("richest", descending), ("poorest", ascending)):
+        side_regions = np.full(n_years * k, None, dtype=object)
+        side_values = np.full(n_years * k, np.nan)
+        side_regions[slots] = regions[order][keep]
+        side_values[slots] = values[order][keep]
+        result[f"{side}_region"] = side_regions
+        result[f"{side}_gdp"] = side_values
+
+    return pd.DataFrame(result)
+
+
+def compute_weighted_yearly_stats(
+    df: pd.DataFrame,
+    value_col: str = "gdp_per_capita",
+    weight_col: str = "population",
+    top_share: float = 0.10,
+    bottom_share: float = 0.40,
+) -> pd.DataFrame:
+    """
+    Population-weighted distribution statistics for every year, in one
+    sort-and-segment pass over all rows.
+
+    Each country is treated as `weight` people with income `value`, so
+    the measures describe between-country inequality per head.
+    Rows with a missing or non-positive value or weight are ignored.
+
+    Args:
+        df (pd.DataFrame): Panel with year, value_col and weight_col columns
+            (e.g. load_gdp_data(indicators=DEFAULT_INDICATORS)).
+        top_share (float): Population share of the "top" group (0.10 = richest 10%).
+        bottom_share (float): Population share of the "bottom" group.
+
+    Returns:
+        pd.DataFrame indexed by year with columns:
+            countries, total_weight, mean, weighted_mean, weighted_median,
+            gini, theil, top_share, bottom_share
+        (top_share / bottom_share: share of total income held by the
+        richest `top_share` / poorest `bottom_share` of the population)
+    """
+    values = df[value_col].to_numpy(dtype="float64")
+    weights = df[weight_col].to_numpy(dtype="float64")
+    years = df["year"].to_numpy()
+    valid = (values > 0) & (weights > 0)   # False for NaN as well
+    return _weighted_stats_arrays(years[valid], values[valid], weights[valid], top_share, bottom_share)
+
+
+def _weighted_stats_arrays(
+    years: np.ndarray,
+    values: np.ndarray,
+    weights: np.ndarray,
+    top_share: float,
+    bottom_share: float,
+) -> pd.DataFrame:
+    """Sort-and-segment kernel behind compute_weighted_yearly_stats."""
+    columns = ["countries", "total_weight", "mean", "weighted_mean", "weighted_median",
+               "gini", "theil", "top_share", "bottom_share"]
+    if len(values) == 0:
+        return pd.DataFrame(columns=columns, index=pd.Index([], name="year"))
+
+    # 1. Sort by (year, value): every year is a contiguous, ascending segment
+    order = np.lexsort((values, years))
+    years, values, weights = years[order], values[order], weights[order]
+    unique_years, seg_starts, counts = np.unique(years, return_index=True, return_counts=True)
+    seg_ids = np.repeat(np.arange(len(unique_years)), counts)
+
+    # 2. Per-year totals
+    income = values * weights
+    total_weight = np.add.reduceat(weights, seg_starts)
+    total_income = np.add.reduceat(income, seg_starts)
+    mean = np.add.reduceat(values, seg_starts) / counts
+    weighted_mean = total_income / total_weight
+
+    # 3. Lorenz curve points: cumulative population / income shares per year
+    cum_weight = np.cumsum(weights)
+    cum_income = np.cumsum(income)
+    weight_before = (cum_weight - weights)[seg_starts]   # cumulative total before each segment
+    income_before = (cum_income - income)[seg_starts]
+    pop_share = (cum_weight - weight_before[seg_ids]) / total_weight[seg_ids]
+    income_share = (cum_income - income_before[seg_ids]) / total_income[seg_ids]
+    prev_income_share = income_share - income / total_income[seg_ids]
+
+    # Gini = 1 - sum_i p_i (L_{i-1} + L_i)
+    p = weights / total_weight[seg_ids]
+    gini = 1 - np.add.reduceat(p * (prev_income_share + income_share), seg_starts)
+
+    # Theil T = sum_i p_i (x_i / mu) ln(x_i / mu)
+    ratio = values / weighted_mean[seg_ids]
+    theil = np.add.reduceat(p * ratio * np.log(ratio), seg_starts)
+
+    def lorenz_at(share: float) -> np.ndarray:
+        """Income share of the poorest `share` of the population, per year."""
+        # First row of each segment whose cumulative weight reaches the target
+        target = weight_before + share * total_weight
+        rows = np.searchsorted(cum_weight, target, side="left")
+        rows = np.minimum(rows, seg_starts + counts - 1)
+        prev_pop = pop_share[rows] - p[rows]
+        # Linear within the crossing country: slope = x_k / mu
+        return prev_income_share[rows] + (share - prev_pop) * ratio[rows]
+
+    # Weighted median: the value where cumulative weight reaches one half
+    median_rows = np.minimum(
+        np.searchsorted(cum_weight, weight_before + 0.5 * total_weight, side="left"),
+        seg_starts + counts - 1,
+    )
+
+    return pd.DataFrame(
+        {
+            "countries": counts,
+            "total_weight": total_weight,
+            "mean": mean,
+            "weighted_mean": weighted_mean,
+            "weighted_median": values[median_rows],
+            "gini": gini,
+            "theil": theil,
+            "top_share": 1 - lorenz_at(1 - top_share),
+            "bottom_share": lorenz_at(bottom_share),
+        },
+        index=pd.Index(unique_years.astype(int), name="year"),
+    )
+
+
+# ---------- Precomputed per-year index (built once per dataset) ----------
+
+class AnalysisIndex:
+    """
+    Per-year aggregates of one dataset, precomputed once so that the helper
+    functions above run in O(years) instead of re-grouping every row.
+
+    Values are first reduced to one mean per (region, year), as
+    compute_rich_poor_gap does, then sorted by region and year.
+
+    Attributes:
+        value_col (str): Indicator the index was built for.
+        years (np.ndarray): Sorted years present in the data.
+        sum, count, min, max (np.ndarray): Per-year statistics, aligned with `years`.
+        argmax, argmin (np.ndarray): Region name of the per-year max / min.
+        regions (np.ndarray): Region name of each row of the sorted data.
+        row_years, values (np.ndarray): Year and value of each row.
+        region_slices (dict): region_name -> slice of its rows (sorted by year).
+        weight_col (str | None): Weight column (e.g. "population"), if any.
+        weighted_sum, weight_total (np.ndarray | None): Per-year sum of
+            value * weight and of weights, for weighted averages.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        value_col: str = "gdp_per_capita",
+        weight_col: Optional[str] = None,
+    ):
+        self.value_col = value_col
+        self.weight_col = weight_col
+
+        # 1. One value per (region, year), sorted by region then year
+        columns = [value_col] if weight_col is None else [value_col, weight_col]
+        grouped_frame = (
+            df.groupby(["region_name", "year"], sort=True, observed=True)[columns]
+            .mean()
+            .dropna(subset=[value_col])
+        )
+        grouped = grouped_frame[value_col]
+        self.regions = grouped.index.get_level_values("region_name").to_numpy()
+        self.row_years = grouped.index.get_level_values("year").to_numpy()
+        self.values = grouped.to_numpy(dtype="float64")
+
+        # 2. Region -> contiguous row range
+        n = len(self.values)
+        starts = np.flatnonzero(np.r_[True, self.regions[1:] != self.regions[:-1]]) if n else np.array([], dtype=int)
+        stops = np.r_[starts[1:], n]
+        self.region_slices = {
+            self.regions[start]: slice(start, stop) for start, stop in zip(starts, stops)
+        }
+
+        # 3. Per-year statistics: sort by (year, value) and reduce each year segment
+        by_value = np.lexsort((self.values, self.row_years))
+        years_sorted = self.row_years[by_value]
+        values_sorted = self.values[by_value]
+
+        self.years, seg_starts, self.count = np.unique(
+            years_sorted, return_index=True, return_counts=True
         )
+        seg_ends = seg_starts + self.count - 1
 
-    gap_df = pd.DataFrame(records).sort_values("year")
-    return gap_df
+        self.sum = np.add.reduceat(values_sorted, seg_starts) if n else np.array([])
+        self.min = values_sorted[seg_starts]
+        self.max = values_sorted[seg_ends]
+        self.argmin = self.regions[by_value[seg_starts]]
+
+        # idxmax returns the first region among ties, so take the first
+        # occurrence of each year's maximum rather than the segment end
+        by_desc = np.lexsort((-self.values, self.row_years))
+        self.argmax = self.regions[by_desc[seg_starts]]
+
+        # 4. Optional weighted sums per year (rows without a weight left out)
+        self.weighted_sum = self.weight_total = None
+        if weight_col is not None:
+            weights = grouped_frame[weight_col].to_numpy(dtype="float64")
+            weights = np.where(weights > 0, weights, 0.0)   # NaN -> 0
+            year_pos = np.searchsorted(self.years, self.row_years)
+            self.weighted_sum = np.bincount(year_pos, self.values * weights, len(self.years))
+            self.weight_total = np.bincount(year_pos, weights, len(self.years))
+
+    def yearly_average(self, weighted: bool = False) -> pd.Series:
+        """Global average per year (same result as compute_global_yearly_average)."""
+        if weighted:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                average = self.weighted_sum / self.weight_total
+            keep = self.weight_total > 0
+            return pd.Series(
+                average[keep],
+                index=pd.Index(self.years[keep], name="year"),
+                name=self.value_col,
+            )
+        return pd.Series(
+            self.sum / self.count,
+            index=pd.Index(self.years, name="year"),
+            name=self.value_col,
+        )
+
+    def region_series(self, region_name: str) -> pd.Series:
+        """Values of one region, indexed by year (empty if unknown)."""
+        rows = self.region_slices.get(region_name, slice(0, 0))
+        return pd.Series(
+            self.values[rows],
+            index=pd.Index(self.row_years[rows], name="year"),
+            name=self.value_col,
+        )
+
+
+def _check_index(index: AnalysisIndex, value_col: str, weight_col: Optional[str] = None) -> None:
+    """Refuse to answer a query for another indicator than the index holds."""
+    if index.value_col != value_col:
+        raise ValueError(
+            f"AnalysisIndex was built for '{index.value_col}', not '{value_col}'."
+        )
+    if weight_col is not None and index.weight_col != weight_col:
+        raise ValueError(
+            f"AnalysisIndex was built with weight_col={index.weight_col!r}, not '{weight_col}'."
+        )
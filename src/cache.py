@@ -0,0 +1,334 @@
+"""
+Persistent on-disk cache for downloaded World Bank indicator data.
+
+Each entry holds the long (region_code, region_name, year, value) frame
+of one indicator over one year range, stored as an uncompressed Arrow IPC
+file so that reads are memory-mapped instead of parsed. A small JSON index
+keeps per-entry metadata:
+
+- fetched_at timestamp (TTL) and last_access (LRU eviction); a cache
+  hit only bumps the Arrow file's mtime (os.utime) instead of rewriting
+  the index, and eviction takes the later of the two as the access time
+- HTTP validators (ETag, Last-Modified) and the API's `lastupdated`
+  and `total` fields, used to revalidate stale entries cheaply
+
+Incremental refreshes append one line per downloaded year window to a
+manifest (manifest.jsonl), recording what was fetched when and why.
+
+Several processes may share one cache directory (e.g. the CLI's worker
+pool, or dashboard and publisher processes): every read-modify-write of
+the index holds an exclusive lock on `index.json.lock` (fcntl.flock), so
+no update is lost and the index always lists every stored file.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: the cache is then only safe within one process
+    fcntl = None
+
+# pyarrow is imported on first read/write, so that importing the cache
+# (e.g. for DEFAULT_CACHE_DIR) stays cheap
+from src.constants import PROJECT_ROOT
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Under the project root, so the CLI, the publisher and the dashboard
+# share one cache wherever they are started from
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, "data", "cache")
+DEFAULT_TTL_SECONDS = 24 * 60 * 60          # one day
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024       # 512 MB
+
+INDEX_FILENAME = "index.json"
+LOCK_FILENAME = "index.json.lock"
+MANIFEST_FILENAME = "manifest.jsonl"
+
+
+class IndicatorCache:
+    """
+    Size-bounded, TTL-aware cache of indicator frames keyed by
+    (indicator, start_year, end_year).
+
+    Attributes:
+        cache_dir (str): Directory holding the Arrow files and the index.
+        ttl_seconds (float): Age after which an entry must be revalidated.
+        max_bytes (int): Total size above which least-recently-used
+            entries are evicted.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+        self._lock_file = None
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # ----- keys and index -----
+
+    @staticmethod
+    def key(indicator: str, start_year: int, end_year: int) -> str:
+        """Return the entry key (also used as file stem) for a request."""
+        safe = re.sub(r"[^A-Za-z0-9._-]", "_", indicator)
+        return f"{safe}_{start_year}_{end_year}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.arrow")
+
+    def _index_path(self) -> str:
+        return os.path.join(self.cache_dir, INDEX_FILENAME)
+
+    def _read_index(self) -> dict:
+        try:
+            with open(self._index_path(), "r") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    @contextlib.contextmanager
+    def _index_lock(self):
+        """
+        Hold the index exclusively, across threads and processes, from
+        _read_index through _write_index. Re-entrant within a thread.
+        """
+        with self._lock:
+            if self._lock_depth == 0:
+                self._lock_file = open(os.path.join(self.cache_dir, LOCK_FILENAME), "a")
+                if fcntl is not None:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    if fcntl is not None:
+                        fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+                    self._lock_file.close()
+                    self._lock_file = None
+
+    def _write_index(self, index: dict) -> None:
+        # Write to a temporary file first so readers never see a partial index
+        tmp_path = f"{self._index_path()}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(index, file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self._index_path())
+
+    # ----- public API -----
+
+    def metadata(self, indicator: str, start_year: int, end_year: int) -> Optional[dict]:
+        """Return the stored metadata of an entry, or None if it is not cached."""
+        key = self.key(indicator, start_year, end_year)
+        with self._lock:
+            meta = self._read_index().get(key)
+        if meta is None or not os.path.exists(self._path(key)):
+            return None
+        return meta
+
+    def is_fresh(self, meta: Optional[dict]) -> bool:
+        """True if an entry was fetched or revalidated within the TTL."""
+        if meta is None:
+            return False
+        return time.time() - meta.get("fetched_at", 0) < self.ttl_seconds
+
+    def get(self, indicator: str, start_year: int, end_year: int) -> Optional[pd.DataFrame]:
+        """
+        Read a cached frame (memory-mapped), regardless of its age.
+
+        Returns:
+            pd.DataFrame | None: The cached frame, or None on a miss.
+        """
+        import pyarrow.feather as feather
+
+        key = self.key(indicator, start_year, end_year)
+        path = self._path(key)
+        try:
+            table = feather.read_table(path, memory_map=True)
+        except (FileNotFoundError, OSError):
+            return None
+
+        # LRU clock: the file's mtime, so a hit never rewrites the index
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return table.to_pandas()
+
+    def put(
+        self,
+        indicator: str,
+        start_year: int,
+        end_year: int,
+        df: pd.DataFrame,
+        validators: Optional[dict] = None,
+    ) -> None:
+        """
+        Store a frame and its validators, then enforce the size bound.
+
+        Args:
+            validators (dict): Optional etag / last_modified / lastupdated /
+                total values returned by the API for this request.
+        """
+        import pyarrow.feather as feather
+
+        key = self.key(indicator, start_year, end_year)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        feather.write_feather(df.reset_index(drop=True), tmp_path, compression="uncompressed")
+
+        # File and index entry change together, under the index lock
+        with self._index_lock():
+            os.replace(tmp_path, path)
+            now = time.time()
+            meta = {
+                "indicator": indicator,
+                "start_year": int(start_year),
+                "end_year": int(end_year),
+                "rows": int(len(df)),
+                "bytes": os.path.getsize(path),
+                "fetched_at": now,
+                "last_access": now,
+            }
+            for field in ("etag", "last_modified", "lastupdated", "total"):
+                meta[field] = (validators or {}).get(field)
+
+            index = self._read_index()
+            index[key] = meta
+            self._write_index(index)
+            self.evict()
+
+    def entries(self, indicator: str) -> list:
+        """Return the metadata of every cached entry of an indicator."""
+        with self._lock:
+            index = self._read_index()
+        return [
+            meta for key, meta in index.items()
+            if meta.get("indicator") == indicator and os.path.exists(self._path(key))
+        ]
+
+    def remove(self, indicator: str, start_year: int, end_year: int) -> None:
+        """Delete a single entry, if present."""
+        key = self.key(indicator, start_year, end_year)
+        with self._index_lock():
+            index = self._read_index()
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            if index.pop(key, None) is not None:
+                self._write_index(index)
+
+    def record_fetch(
+        self, indicator: str, start_year: int, end_year: int, rows: int, reason: str
+    ) -> None:
+        """Append one downloaded year window to the manifest."""
+        entry = {
+            "indicator": indicator,
+            "start_year": int(start_year),
+            "end_year": int(end_year),
+            "rows": int(rows),
+            "reason": reason,
+            "fetched_at": time.time(),
+        }
+        with self._lock:
+            with open(os.path.join(self.cache_dir, MANIFEST_FILENAME), "a") as file:
+                file.write(json.dumps(entry) + "\n")
+
+    def manifest(self, indicator: Optional[str] = None) -> list:
+        """Return the manifest entries, optionally for one indicator only."""
+        try:
+            with open(os.path.join(self.cache_dir, MANIFEST_FILENAME), "r") as file:
+                entries = [json.loads(line) for line in file if line.strip()]
+        except FileNotFoundError:
+            return []
+        if indicator is None:
+            return entries
+        return [entry for entry in entries if entry["indicator"] == indicator]
+
+    def touch(self, indicator: str, start_year: int, end_year: int) -> None:
+        """Mark an entry as revalidated: its TTL starts again from now."""
+        key = self.key(indicator, start_year, end_year)
+        with self._index_lock():
+            index = self._read_index()
+            if key in index:
+                index[key]["fetched_at"] = time.time()
+                self._write_index(index)
+
+    def fetched_at(self, indicators, start_year: int, end_year: int) -> float:
+        """
+        When the oldest of several entries was fetched or last revalidated,
+        i.e. the age of a panel built from them (0 if one is missing).
+        """
+        stamps = [
+            (self.metadata(indicator, start_year, end_year) or {}).get("fetched_at", 0)
+            for indicator in indicators
+        ]
+        return min(stamps, default=0)
+
+    def total_bytes(self) -> int:
+        """Return the total size of all cached entries."""
+        return sum(meta.get("bytes", 0) for meta in self._read_index().values())
+
+    def _last_access(self, key: str, meta: dict) -> float:
+        """Later of the stored last_access and the file's mtime (bumped on every hit)."""
+        try:
+            mtime = os.path.getmtime(self._path(key))
+        except OSError:
+            mtime = 0
+        return max(meta.get("last_access", 0), mtime)
+
+    def evict(self) -> list:
+        """
+        Remove least-recently-used entries until the cache fits in max_bytes.
+
+        Returns:
+            list[str]: Keys of the evicted entries.
+        """
+        evicted = []
+        with self._index_lock():
+            index = self._read_index()
+            total = sum(meta.get("bytes", 0) for meta in index.values())
+            by_access = sorted(index.items(), key=lambda item: self._last_access(*item))
+
+            for key, meta in by_access:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(self._path(key))
+                except FileNotFoundError:
+                    pass
+                total -= meta.get("bytes", 0)
+                del index[key]
+                evicted.append(key)
+
+            if evicted:
+                self._write_index(index)
+        return evicted
+
+    def clear(self) -> None:
+        """Delete every cached entry."""
+        with self._index_lock():
+            for key in self._read_index():
+                try:
+                    os.remove(self._path(key))
+                except FileNotFoundError:
+                    pass
+            self._write_index({})
@@ -0,0 +1,269 @@
+"""
+Headless command-line entry point for batch runs (e.g. from cron).
+
+Subcommands:
+
+    fetch     download indicators into the on-disk cache
+    analyze   global trend, rich/poor gap and growth summary per indicator
+    render    per-country / per-region charts and the global trend chart
+    export    cleaned country-level data as CSV or Parquet
+
+Every indicator is an independent job: jobs run in a process pool, so a
+run takes about as long as its slowest indicator. One JSON summary line
+per indicator is printed on stdout as soon as it finishes, followed by a
+run summary; progress messages go to stderr.
+
+Examples:
+    python -m src.cli fetch --start 1960 --end 2023
+    python -m src.cli analyze --indicators gdp_per_capita=NY.GDP.PCAP.CD SP.POP.TOTL
+    python -m src.cli render --out-dir reports/2024-06 --workers 4
+    python -m src.cli export --format parquet --fill-method linear
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional
+
+# Light imports only: the loader stack (pandas, requests, pyarrow) is
+# imported by the jobs, so --help and argument errors return at once and
+# the parent of the process pool stays small
+from src.cache import DEFAULT_CACHE_DIR
+from src.constants import DEFAULT_INDICATORS, WB_API_BASE
+
+
+COMMANDS = {
+    "fetch": "Download indicators into the on-disk cache",
+    "analyze": "Write a JSON analysis report per indicator",
+    "render": "Render per-country / per-region charts per indicator",
+    "export": "Export cleaned country-level data per indicator",
+}
+DEFAULT_OUT_DIR = "output"
+DEFAULT_START_YEAR = 2000
+DEFAULT_END_YEAR = 2020
+EXPORT_FORMATS = ("csv", "parquet")
+
+
+def parse_indicators(specs: Optional[list]) -> dict:
+    """
+    Turn ["name=CODE", "CODE", ...] into {column_name: code}.
+    A bare code gets a column name derived from it (SP.POP.TOTL -> sp_pop_totl).
+    """
+    if not specs:
+        return dict(DEFAULT_INDICATORS)
+    indicators = {}
+    for spec in specs:
+        name, sep, code = spec.partition("=")
+        if not sep:
+            name, code = re.sub(r"[^a-z0-9]+", "_", spec.lower()).strip("_"), spec
+        indicators[name] = code
+    return indicators
+
+
+def _clean(value):
+    """Make a summary JSON-safe: NumPy scalars to Python, NaN to null."""
+    import numpy as np
+
+    if isinstance(value, dict):
+        return {str(k): _clean(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_clean(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+# --- Per-indicator jobs (run in worker processes) ---
+
+def _load(name: str, code: str, options: dict):
+    from src.cache import IndicatorCache
+    from src.load_wb_data import load_gdp_data
+
+    if options["offline"]:
+        cache = IndicatorCache(options["cache_dir"], ttl_seconds=float("inf"))
+    else:
+        cache = IndicatorCache(options["cache_dir"])
+    return load_gdp_data(
+        use_api=True,
+        indicators={name: code},
+        start_year=options["start"],
+        end_year=options["end"],
+        cache=cache,
+        incremental=options["incremental"],
+        fill_method=options["fill_method"],
+        fill_limit=options["fill_limit"],
+        base_url=options["base_url"],
+    )
+
+
+def _fetch(name: str, df, options: dict) -> dict:
+    years = df["year"]
+    return {
+        "rows": len(df),
+        "countries": int(df["region_name"].nunique()),
+        "first_year": int(years.min()),
+        "last_year": int(years.max()),
+    }
+
+
+def _analyze(name: str, df, options: dict) -> dict:
+    from src.analysis import AnalysisIndex, compute_rich_poor_gap, summarize_global_trend
+    from src.growth import GrowthEngine
+
+    index = AnalysisIndex(df, name)
+    trend = summarize_global_trend(index, name)
+    gap = compute_rich_poor_gap(index, name).iloc[-1].to_dict()
+
+    # A CAGR needs at least two years
+    fastest = slowest = {}
+    if trend["last_year"] > trend["first_year"]:
+        growth = GrowthEngine(df, name)
+        window = growth.summary(trend["first_year"], trend["last_year"]).dropna(subset=["cagr_pct"])
+        fastest = window.nlargest(5, "cagr_pct")["cagr_pct"].round(3).to_dict()
+        slowest = window.nsmallest(5, "cagr_pct")["cagr_pct"].round(3).to_dict()
+
+    report = {"trend": trend, "latest_gap": gap, "fastest_cagr": fastest, "slowest_cagr": slowest}
+    path = os.path.join(options["out_dir"], "analysis", f"{name}.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(_clean(report), file, indent=2)
+
+    return {"output": path, **{k: trend[k] for k in ("last_year", "last_value", "cagr_pct")}}
+
+
+def _render(name: str, df, options: dict) -> dict:
+    from src.visualization import plot_global_gdp_trend, render_charts
+
+    out_dir = os.path.join(options["out_dir"], "charts", name)
+    label = name.replace("_", " ")
+    # Indicators already run in parallel: render each one in its own process
+    stats = render_charts(df, out_dir, value_col=name, max_workers=1)
+    plot_global_gdp_trend(
+        df, os.path.join(out_dir, "global_trend.png"), value_col=name,
+        title=f"Global Average {label.capitalize()} Over Time", ylabel=label.capitalize(),
+    )
+    return {"output": out_dir, **stats}
+
+
+def _export(name: str, df, options: dict) -> dict:
+    fmt = options["format"]
+    path = os.path.join(options["out_dir"], "export", f"{name}.{fmt}")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if fmt == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False, lineterminator="\n")
+    return {"output": path, "rows": len(df), "bytes": os.path.getsize(path)}
+
+
+JOBS = {"fetch": _fetch, "analyze": _analyze, "render": _render, "export": _export}
+
+
+def run_indicator(command: str, name: str, code: str, options: dict) -> dict:
+    """
+    Load one indicator and run one subcommand on it.
+
+    Returns:
+        dict: JSON-safe summary (status "ok" or "error").
+    """
+    start = time.perf_counter()
+    summary = {"command": command, "indicator": name, "code": code}
+    try:
+        # Keep stdout for the machine-readable summaries
+        with contextlib.redirect_stdout(sys.stderr):
+            df = _load(name, code, options)
+            if df is None or df.empty:
+                raise RuntimeError("no data loaded")
+            summary.update(JOBS[command](name, df, options))
+        summary["status"] = "ok"
+    except Exception as e:
+        summary.update(status="error", error=f"{type(e).__name__}: {e}")
+    summary["seconds"] = round(time.perf_counter() - start, 3)
+    return _clean(summary)
+
+
+# --- Command line ---
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli",
+        description="Batch World Bank indicator pipeline.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for command, help_text in COMMANDS.items():
+        sub = subparsers.add_parser(command, help=help_text)
+        sub.add_argument("--indicators", nargs="+", metavar="NAME=CODE",
+                         help="Indicators as name=CODE or CODE (default: GDP per capita, "
+                              "population, life expectancy)")
+        sub.add_argument("--start", type=int, default=DEFAULT_START_YEAR, help="First year")
+        sub.add_argument("--end", type=int, default=DEFAULT_END_YEAR, help="Last year")
+        sub.add_argument("--out-dir", default=DEFAULT_OUT_DIR, help="Output directory")
+        sub.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="On-disk API cache")
+        sub.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                         help="Indicators processed in parallel")
+        sub.add_argument("--offline", action="store_true",
+                         help="Serve cached data however old, without revalidating")
+        sub.add_argument("--no-incremental", dest="incremental", action="store_false",
+                         help="Re-download whole ranges instead of missing/revised years")
+        sub.add_argument("--fill-method", choices=("linear", "log_linear", "ffill"),
+                         help="Fill missing country-years (see src/gapfill.py)")
+        sub.add_argument("--fill-limit", type=int, help="Longest gap to fill")
+        sub.add_argument("--base-url", default=WB_API_BASE, help=argparse.SUPPRESS)
+        if command == "export":
+            sub.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    return parser
+
+
+def main(argv: Optional[list] = None) -> int:
+    args = build_parser().parse_args(argv)
+    indicators = parse_indicators(args.indicators)
+    options = {
+        key: getattr(args, key, None)
+        for key in ("start", "end", "out_dir", "cache_dir", "offline", "incremental",
+                    "fill_method", "fill_limit", "base_url", "format")
+    }
+
+    start = time.perf_counter()
+    summaries = []
+
+    def emit(summary: dict) -> None:
+        summaries.append(summary)
+        print(json.dumps(summary), flush=True)
+
+    workers = max(1, min(args.workers, len(indicators)))
+    if workers == 1:
+        for name, code in indicators.items():
+            emit(run_indicator(args.command, name, code, options))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(run_indicator, args.command, name, code, options)
+                for name, code in indicators.items()
+            ]
+            for future in as_completed(futures):
+                emit(future.result())
+
+    failed = [s["indicator"] for s in summaries if s["status"] != "ok"]
+    print(json.dumps({
+        "command": args.command,
+        "indicators": len(summaries),
+        "ok": len(summaries) - len(failed),
+        "failed": failed,
+        "workers": workers,
+        "wall_seconds": round(time.perf_counter() - start, 3),
+        "job_seconds": round(sum(s["seconds"] for s in summaries), 3),
+    }), flush=True)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,343 @@
+"""
+Cross-country and peer-group comparisons over a PanelMatrix.
+
+The panel is pivoted once into a dense countries x years matrix with a
+country -> row map (PanelMatrix.row_of); every comparison is then a few
+whole-matrix NumPy operations instead of a loop over countries:
+
+- one country against an arbitrary peer set (peer mean, median,
+  quartiles, gap and percentile per year), or the gap of many countries
+  to the same peer set at once
+- the gap of every country to the mean of its own income level or region
+  (leave-one-out, so a country is not compared with itself)
+- the k nearest peers of many countries by trajectory: the RMS distance
+  between log values over the years both countries are observed, for
+  all pairs at once with three matrix products
+- ranks of every country in every year, and rank movements between two
+  years, overall or within a peer set
+
+A ComparisonEngine caches its results like GrowthEngine, so keeping one
+engine per dataset version makes repeated comparisons free.
+"""
+
+import warnings
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.country_catalog import load_country_catalog
+from src.memo import ResultCache
+from src.panel import PanelMatrix
+
+
+GROUP_BY = ("income_level", "region")
+
+
+def rank_columns(values: np.ndarray) -> np.ndarray:
+    """
+    Rank every column of a matrix, highest value first (1 = highest).
+    Ties get consecutive ranks in row order; NaN cells get NaN.
+    """
+    missing = np.isnan(values)
+    order = np.argsort(np.where(missing, np.inf, -values), axis=0, kind="stable")
+    ranks = np.empty(values.shape)
+    positions = np.broadcast_to(np.arange(1, values.shape[0] + 1, dtype=np.float64)[:, None], values.shape)
+    np.put_along_axis(ranks, order, positions, axis=0)
+    ranks[missing] = np.nan
+    return ranks
+
+
+def trajectory_distances(
+    query: np.ndarray, candidates: np.ndarray
+) -> tuple:
+    """
+    RMS difference between every query row and every candidate row,
+    over the columns both have observed (NaN elsewhere).
+
+    Uses sum((a - b)^2) = sum(a^2) + sum(b^2) - 2 sum(a * b), each term
+    restricted to the common columns through the observation masks, so
+    all pairs come out of three matrix products.
+
+    Returns:
+        tuple: (distances, common column counts), both (len(query), len(candidates)).
+    """
+    query_mask = (~np.isnan(query)).astype(np.float64)
+    candidate_mask = (~np.isnan(candidates)).astype(np.float64)
+    a = np.where(query_mask > 0, query, 0.0)
+    b = np.where(candidate_mask > 0, candidates, 0.0)
+
+    squares = (a ** 2) @ candidate_mask.T + query_mask @ (b ** 2).T - 2 * (a @ b.T)
+    counts = query_mask @ candidate_mask.T
+    with np.errstate(invalid="ignore", divide="ignore"):
+        distances = np.sqrt(np.clip(squares, 0, None) / counts)
+    distances[counts == 0] = np.nan
+    return distances, counts
+
+
+class ComparisonEngine:
+    """
+    Peer comparisons for one indicator of one dataset version.
+
+    Args:
+        panel (PanelMatrix | pd.DataFrame): The pivoted panel, or a long
+            loader frame to pivot.
+        value_col (str): Indicator column, when a frame is passed.
+    """
+
+    def __init__(self, panel, value_col: str = "gdp_per_capita"):
+        if isinstance(panel, pd.DataFrame):
+            panel = PanelMatrix.from_frame(panel, value_col)
+        self.panel = panel
+        self._cache = ResultCache()
+
+    def _rows(self, names) -> np.ndarray:
+        """Row numbers of countries (KeyError for an unknown name)."""
+        try:
+            return np.array([self.panel.row_of[name] for name in names], dtype=np.int64)
+        except KeyError as e:
+            raise KeyError(f"Unknown country: {e.args[0]}") from None
+
+    def _columns(self, start_year: Optional[int], end_year: Optional[int]) -> slice:
+        start = 0 if start_year is None else self.panel.year_col(start_year)
+        end = len(self.panel.years) - 1 if end_year is None else self.panel.year_col(end_year)
+        return slice(start, end + 1)
+
+    # ----- peer groups -----
+
+    def groups(self, by: str = "income_level") -> np.ndarray:
+        """Income level or region of every row (None where unknown), from the country catalog."""
+        if by not in GROUP_BY:
+            raise ValueError(f"by must be one of {GROUP_BY}, got '{by}'.")
+
+        def compute():
+            catalog = load_country_catalog()
+            lookup = catalog.region_of if by == "region" else catalog.income_level_of
+            codes = self.panel.codes if self.panel.codes is not None else [None] * len(self.panel)
+            return np.array([lookup(code) if code else None for code in codes], dtype=object)
+        return self._cache.get(("groups", by), compute)
+
+    def peer_group(self, country: str, by: str = "income_level") -> list:
+        """The other countries of `country`'s income level or region."""
+        groups = self.groups(by)
+        own = groups[self._rows([country])[0]]
+        if own is None:
+            return []
+        return [name for name, group in zip(self.panel.names, groups) if group == own and name != country]
+
+    # ----- country vs peers -----
+
+    def versus_peers(self, country: str, peers: list) -> pd.DataFrame:
+        """
+        One country against a peer set, year by year.
+
+        Args:
+            country (str): The country to compare.
+            peers (list): Peer country names (`country` itself is ignored).
+
+        Returns:
+            pd.DataFrame indexed by year with columns:
+                value, peer_mean, peer_median, peer_p25, peer_p75, peers,
+                gap_pct (value vs peer mean), percentile (share of the
+                observed peers below the country, in %)
+        """
+        row = self.panel.values[self._rows([country])[0]]
+        peer_values = self.panel.values[self._rows([p for p in peers if p != country])]
+        observed = (~np.isnan(peer_values)).sum(axis=0)
+
+        with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+            # Years without any observed peer give NaN (and a warning) here
+            warnings.simplefilter("ignore", RuntimeWarning)
+            mean = np.nanmean(peer_values, axis=0) if len(peer_values) else np.full(len(row), np.nan)
+            p25, median, p75 = (
+                np.nanpercentile(peer_values, [25, 50, 75], axis=0)
+                if len(peer_values) else np.full((3, len(row)), np.nan)
+            )
+            gap = (row / mean - 1) * 100
+            percentile = (peer_values < row).sum(axis=0) / observed * 100
+        percentile[np.isnan(row) | (observed == 0)] = np.nan
+
+        return pd.DataFrame(
+            {
+                "value": row,
+                "peer_mean": mean,
+                "peer_median": median,
+                "peer_p25": p25,
+                "peer_p75": p75,
+                "peers": observed,
+                "gap_pct": gap,
+                "percentile": percentile,
+            },
+            index=pd.Index(self.panel.years, name="year"),
+        )
+
+    def gap_to_peers(self, countries: list, peers: list) -> pd.DataFrame:
+        """
+        Gap in % of many countries to the mean of one peer set, in one
+        broadcast (countries as rows, years as columns).
+        """
+        values = self.panel.values[self._rows(countries)]
+        peer_values = self.panel.values[self._rows(peers)]
+        with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+            warnings.simplefilter("ignore", RuntimeWarning)
+            mean = np.nanmean(peer_values, axis=0) if len(peer_values) else np.nan
+            gap = (values / mean - 1) * 100
+        return pd.DataFrame(
+            gap,
+            index=pd.Index(countries, name="region_name"),
+            columns=pd.Index(self.panel.years, name="year"),
+        )
+
+    def versus_group(self, by: str = "income_level") -> pd.DataFrame:
+        """
+        Gap in % of every country to the mean of the other countries of
+        its income level or region, for every year (leave-one-out group
+        means from one scatter-add per group).
+        """
+        def compute():
+            labels = pd.Series(self.groups(by), dtype=object)
+            known = labels.notna().to_numpy()
+            group_idx, group_names = pd.factorize(labels[known], sort=True)
+
+            values = self.panel.values
+            observed = ~np.isnan(values)
+            filled = np.where(observed, values, 0.0)
+
+            sums = np.zeros((len(group_names), values.shape[1]))
+            counts = np.zeros((len(group_names), values.shape[1]))
+            np.add.at(sums, group_idx, filled[known])
+            np.add.at(counts, group_idx, observed[known])
+
+            gap = np.full(values.shape, np.nan)
+            others_sum = sums[group_idx] - filled[known]
+            others_count = counts[group_idx] - observed[known]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                others_mean = np.where(others_count > 0, others_sum / others_count, np.nan)
+                gap[known] = (values[known] / others_mean - 1) * 100
+            return self.panel.wrap(gap)
+        return self._cache.get(("versus_group", by), compute)
+
+    # ----- nearest peers -----
+
+    def nearest_peers(
+        self,
+        countries: list,
+        k: int = 5,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+        shape_only: bool = False,
+        min_years: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        The k countries whose trajectories are closest to each of `countries`.
+
+        Distance is the RMS difference of log values over the years both
+        countries are observed in [start_year, end_year] (0.1 is roughly
+        a 10% gap on average).
+
+        Args:
+            countries (list): Countries to find peers for (one batch).
+            k (int): Peers per country.
+            start_year, end_year (int | None): Window (default: all years).
+            shape_only (bool): Compare growth paths only, by removing each
+                country's mean log level over the window first.
+            min_years (int | None): Fewest common years for a pair to be
+                compared (default: half the window, at least 2).
+
+        Returns:
+            pd.DataFrame with columns:
+                region_name, rank, peer, distance, common_years
+        """
+        columns = self._columns(start_year, end_year)
+        rows = self._rows(countries)
+        n_years = columns.stop - columns.start
+        min_years = max(2, n_years // 2) if min_years is None else min_years
+
+        def compute():
+            window = self.panel.values[:, columns]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                logs = np.where(window > 0, np.log(window), np.nan)
+            if shape_only:
+                observed = ~np.isnan(logs)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    row_means = np.where(observed, logs, 0.0).sum(axis=1) / observed.sum(axis=1)
+                logs = logs - row_means[:, None]
+            return logs
+        logs = self._cache.get(("trajectory_logs", columns.start, columns.stop, shape_only), compute)
+
+        distances, counts = trajectory_distances(logs[rows], logs)
+        distances[counts < min_years] = np.nan
+        distances[np.arange(len(rows)), rows] = np.nan
+
+        k = max(0, min(k, len(self.panel) - 1))
+        order = np.argsort(np.where(np.isnan(distances), np.inf, distances), axis=1, kind="stable")[:, :k]
+        picked = np.take_along_axis(distances, order, axis=1)
+        picked_counts = np.take_along_axis(counts, order, axis=1)
+
+        out = pd.DataFrame(
+            {
+                "region_name": np.repeat(np.asarray(countries, dtype=object), k),
+                "rank": np.tile(np.arange(1, k + 1), len(rows)),
+                "peer": self.panel.names[order.ravel()],
+                "distance": picked.ravel(),
+                "common_years": picked_counts.ravel().astype(np.int64),
+            }
+        )
+        return out[out["distance"].notna()].reset_index(drop=True)
+
+    # ----- ranks -----
+
+    def rank_matrix(self) -> pd.DataFrame:
+        """Rank of every country in every year (1 = highest value)."""
+        return self._cache.get(("ranks",), lambda: self.panel.wrap(rank_columns(self.panel.values)))
+
+    def rank_movements(
+        self,
+        start_year: int,
+        end_year: int,
+        countries: Optional[list] = None,
+        peers: Optional[list] = None,
+    ) -> pd.DataFrame:
+        """
+        Rank of countries in two years and how far they moved.
+
+        Args:
+            start_year, end_year (int): The two years compared.
+            countries (list | None): Countries to report (default: all).
+            peers (list | None): Rank within these countries (plus
+                `countries`) instead of among all countries.
+
+        Returns:
+            pd.DataFrame indexed by region_name with columns:
+                start_value, end_value, rank_start, rank_end,
+                rank_change (positive = moved up), ranked_start, ranked_end
+            (ranked_*: number of countries ranked in that year), sorted
+            by rank_end.
+        """
+        start, end = self.panel.year_col(start_year), self.panel.year_col(end_year)
+
+        if peers is None:
+            rows = np.arange(len(self.panel))
+            ranks = self.rank_matrix().to_numpy()[:, [start, end]]
+        else:
+            members = list(dict.fromkeys(list(peers) + list(countries or [])))
+            rows = self._rows(members)
+            ranks = rank_columns(self.panel.values[rows][:, [start, end]])
+
+        values = self.panel.values[rows][:, [start, end]]
+        ranked = (~np.isnan(values)).sum(axis=0)
+        out = pd.DataFrame(
+            {
+                "start_value": values[:, 0],
+                "end_value": values[:, 1],
+                "rank_start": ranks[:, 0],
+                "rank_end": ranks[:, 1],
+                "rank_change": ranks[:, 0] - ranks[:, 1],
+                "ranked_start": ranked[0],
+                "ranked_end": ranked[1],
+            },
+            index=pd.Index(self.panel.names[rows], name="region_name"),
+        )
+        if countries is not None:
+            out = out.loc[list(countries)]
+        return out.sort_values("rank_end", na_position="last")
@@ -0,0 +1,26 @@
+"""
+Shared World Bank settings, importable without pandas.
+
+Entry points (src/main.py, src/cli.py, app.py) need these to build their
+options before any data is loaded; keeping them here means parsing the
+command line or drawing the first dashboard frame does not pay for the
+loader stack's imports. src/load_wb_data.py re-exports every name.
+"""
+
+import os
+
+# Repository root: default data paths are resolved against it rather than
+# the working directory, so every entry point uses the same files
+PROJECT_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+GDP_INDICATOR = "NY.GDP.PCAP.CD"
+POPULATION_INDICATOR = "SP.POP.TOTL"
+LIFE_EXPECTANCY_INDICATOR = "SP.DYN.LE00.IN"
+
+# Default multi-indicator panel: column name -> World Bank indicator code
+DEFAULT_INDICATORS = {
+    "gdp_per_capita": GDP_INDICATOR,
+    "population": POPULATION_INDICATOR,
+    "life_expectancy": LIFE_EXPECTANCY_INDICATOR,
+}
+WB_API_BASE = "https://api.worldbank.org/v2"
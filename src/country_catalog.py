@@ -0,0 +1,169 @@
+"""
+World Bank country/region catalog.
+
+Built from the `/v2/country` metadata (aggregate flag, region, income
+level) and indexed by ISO3 code, so that aggregate detection and
+country -> region / income rollups are O(1) dictionary lookups with no
+extra API calls.
+
+The catalog is read from a locally cached download when one exists
+(see load_wb_data.fetch_country_catalog), otherwise from the snapshot
+bundled in data/, so it always works offline.
+"""
+
+import os
+from functools import lru_cache
+from typing import Optional
+
+import pandas as pd
+
+from src.cache import DEFAULT_CACHE_DIR
+from src.constants import PROJECT_ROOT
+
+
+# Resolved against the project root, not the working directory, so the
+# catalog is found wherever the process is started from
+BUNDLED_CATALOG_PATH = os.path.join(PROJECT_ROOT, "data", "wb_country_metadata.csv")
+CATALOG_CACHE_PATH = os.path.join(DEFAULT_CACHE_DIR, "country_metadata.csv")
+
+CATALOG_COLUMNS = [
+    "id", "iso2", "name", "region_id", "region", "income_id", "income_level", "aggregate",
+]
+
+
+class CountryCatalog:
+    """
+    Country and aggregate metadata indexed by ISO3 code.
+
+    Attributes:
+        frame (pd.DataFrame): One row per code, indexed by `id`.
+        aggregate_codes (frozenset): Codes flagged as aggregates.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        frame = frame.loc[:, CATALOG_COLUMNS].copy()
+        frame["aggregate"] = frame["aggregate"].astype(bool)
+        self.frame = frame.drop_duplicates("id").set_index("id")
+
+        # Plain dicts give O(1) lookups without pandas indexing overhead
+        self._region = self.frame["region"].to_dict()
+        self._income = self.frame["income_level"].to_dict()
+        self.aggregate_codes = frozenset(self.frame.index[self.frame["aggregate"]])
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._region
+
+    # ----- construction -----
+
+    @classmethod
+    def from_csv(cls, filepath: str) -> "CountryCatalog":
+        """Load a catalog saved with to_csv (or the bundled snapshot)."""
+        # keep_default_na=False: the API uses "NA" as the aggregates' region id
+        frame = pd.read_csv(filepath, dtype=str, keep_default_na=False)
+        frame["aggregate"] = frame["aggregate"] == "1"
+        return cls(frame)
+
+    @classmethod
+    def from_api_records(cls, records: list) -> "CountryCatalog":
+        """Build a catalog from raw `/v2/country` API records."""
+        rows = []
+        for record in records:
+            region = record.get("region") or {}
+            income = record.get("incomeLevel") or {}
+            rows.append({
+                "id": record.get("id"),
+                "iso2": record.get("iso2Code", ""),
+                "name": record.get("name", ""),
+                "region_id": region.get("id", ""),
+                "region": region.get("value", ""),
+                "income_id": income.get("id", ""),
+                "income_level": income.get("value", ""),
+                # Aggregates are listed under the pseudo-region "Aggregates"
+                "aggregate": region.get("value") == "Aggregates",
+            })
+        return cls(pd.DataFrame(rows, columns=CATALOG_COLUMNS))
+
+    def to_csv(self, filepath: str) -> None:
+        """Save the catalog in the same flat format as the bundled snapshot."""
+        out = self.frame.reset_index()
+        out["aggregate"] = out["aggregate"].astype(int)
+        out.to_csv(filepath, index=False)
+
+    # ----- lookups -----
+
+    def is_aggregate(self, code: str) -> bool:
+        """True if `code` is a World Bank aggregate (region, income group, ...)."""
+        return code in self.aggregate_codes
+
+    def region_of(self, code: str) -> Optional[str]:
+        """Return the region name of a country code, or None if unknown."""
+        return self._region.get(code)
+
+    def income_level_of(self, code: str) -> Optional[str]:
+        """Return the income level of a country code, or None if unknown."""
+        return self._income.get(code)
+
+    def aggregates(self) -> pd.DataFrame:
+        """Rows of the aggregates only (regions, income groups, World, ...)."""
+        return self.frame[self.frame["aggregate"]]
+
+    def region_codes(self) -> frozenset:
+        """Region ids that some economy belongs to, e.g. "SSF"."""
+        return frozenset(self.frame.loc[~self.frame["aggregate"], "region_id"]) - {""}
+
+    def income_codes(self) -> frozenset:
+        """Income level ids that some economy belongs to, e.g. "LMC"."""
+        return frozenset(self.frame.loc[~self.frame["aggregate"], "income_id"]) - {""}
+
+    def aggregate_mask(self, codes: pd.Series) -> pd.Series:
+        """Vectorized is_aggregate over a Series of codes."""
+        return codes.isin(self.aggregate_codes)
+
+    def annotate(self, df: pd.DataFrame, code_col: str = "region_code") -> pd.DataFrame:
+        """Return a copy of `df` with `region` and `income_level` columns added."""
+        out = df.copy()
+        out["region"] = out[code_col].map(self._region)
+        out["income_level"] = out[code_col].map(self._income)
+        return out
+
+    def rollup(
+        self,
+        df: pd.DataFrame,
+        by: str = "region",
+        value_col: str = "gdp_per_capita",
+        code_col: str = "region_code",
+    ) -> pd.DataFrame:
+        """
+        Average a country-level frame per year and catalog group.
+
+        Args:
+            by (str): "region" or "income_level".
+
+        Returns:
+            pd.DataFrame: year x group table of mean values.
+        """
+        lookup = self._region if by == "region" else self._income
+        groups = df[code_col].map(lookup)
+        return (
+            df.groupby(["year", groups.rename(by)], observed=True)[value_col]
+            .mean()
+            .unstack(by)
+            .sort_index()
+        )
+
+
+@lru_cache(maxsize=1)
+def load_country_catalog() -> CountryCatalog:
+    """
+    Load the catalog once per process: the cached API download if present,
+    otherwise the bundled offline snapshot.
+
+    Raises:
+        FileNotFoundError: if neither file exists.
+    """
+    if os.path.exists(CATALOG_CACHE_PATH):
+        return CountryCatalog.from_csv(CATALOG_CACHE_PATH)
+    return CountryCatalog.from_csv(BUNDLED_CATALOG_PATH)
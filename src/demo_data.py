@@ -4,99 +4,245 @@ using only base Python (no pandas).
 
 This module is separate from the main World Bank analysis to keep
 the project structure clean and modular.
+
+The file is streamed with csv.reader (one row in memory at a time,
+quoted fields such as "Korea, Rep." handled correctly) and every field is
+parsed exactly once, into typed `array` columns (DemoColumns). Analysis
+then works on those cached numbers instead of re-parsing strings.
 """
 
+import csv
+from array import array
+from typing import Iterator, Optional
+
+
+DEMO_COLUMNS = ("country", "year", "gdp_per_capita", "life_expectancy")
+
+
+class DemoCountry:
+    """
+    One row of the demo dataset, with typed fields.
+
+    Attributes:
+        country (str)
+        year (int)
+        gdp_per_capita (float)
+        life_expectancy (float)
+    """
+
+    # No per-instance __dict__: rows stay small when created in bulk
+    __slots__ = DEMO_COLUMNS
 
-def load_demo_data(filepath):
+    def __init__(self, country: str, year: int, gdp_per_capita: float, life_expectancy: float):
+        self.country = country
+        self.year = year
+        self.gdp_per_capita = gdp_per_capita
+        self.life_expectancy = life_expectancy
+
+    def __getitem__(self, key: str):
+        # Dictionary-style access, as with the rows load_demo_data used to return
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __repr__(self):
+        return (f"DemoCountry(country='{self.country}', year={self.year}, "
+                f"gdp_per_capita={self.gdp_per_capita}, life_expectancy={self.life_expectancy})")
+
+
+class DemoColumns:
     """
-    Load a small CSV file using basic Python methods (no pandas).
+    The demo dataset as typed columns: one Python list of names and
+    compact `array` buffers for the numbers (4-8 bytes per value instead
+    of one Python object each).
+
+    Iterating yields DemoCountry records, built on demand.
+
+    Attributes:
+        country (list[str])
+        year (array[int])
+        gdp_per_capita (array[float])
+        life_expectancy (array[float])
+        skipped (int): Malformed rows ignored while loading.
+    """
+
+    __slots__ = DEMO_COLUMNS + ("skipped",)
+
+    def __init__(self):
+        self.country = []
+        self.year = array("i")
+        self.gdp_per_capita = array("d")
+        self.life_expectancy = array("d")
+        self.skipped = 0
+
+    def append(self, record: DemoCountry) -> None:
+        self.country.append(record.country)
+        self.year.append(record.year)
+        self.gdp_per_capita.append(record.gdp_per_capita)
+        self.life_expectancy.append(record.life_expectancy)
+
+    def __len__(self) -> int:
+        return len(self.country)
+
+    def __getitem__(self, i: int) -> DemoCountry:
+        return DemoCountry(self.country[i], self.year[i], self.gdp_per_capita[i], self.life_expectancy[i])
+
+    def __iter__(self) -> Iterator[DemoCountry]:
+        for i in range(len(self.country)):
+            yield self[i]
+
+
+def _iter_rows(filepath: str, skipped: Optional[list] = None) -> Iterator[tuple]:
+    """Stream (country, year, gdp, life) tuples, each field parsed once."""
+    with open(filepath, "r", newline="", encoding="utf-8") as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header is None:
+            return
+        positions = [header.index(column) for column in DEMO_COLUMNS]
+        i_country, i_year, i_gdp, i_life = positions
+        width = max(positions) + 1
+
+        for row in reader:
+            # Blank lines (csv.reader yields [] or empty fields) are not data rows
+            if not any(field.strip() for field in row):
+                continue
+            try:
+                if len(row) < width:
+                    raise ValueError("missing fields")
+                yield row[i_country], int(row[i_year]), float(row[i_gdp]), float(row[i_life])
+            except ValueError:
+                if skipped is not None:
+                    skipped[0] += 1
+
+
+def iter_demo_records(filepath: str, skipped: Optional[list] = None) -> Iterator[DemoCountry]:
+    """
+    Stream the demo CSV row by row (constant memory, whatever the file size).
+
+    Columns are located by header name, so their order does not matter.
+    Blank lines are ignored; rows with missing or non-numeric fields are
+    skipped (and counted).
 
     Args:
         filepath (str): Path to the CSV file.
+        skipped (list): Optional one-element counter of skipped rows.
 
-    Returns:
-        list[dict]: A list of dictionaries, one per country.
+    Yields:
+        DemoCountry: One typed record per valid row.
     """
-    countries = []  # store all our rows as dictionaries
+    for fields in _iter_rows(filepath, skipped):
+        yield DemoCountry(*fields)
 
-    try:
-        # open the file in read mode
-        with open(filepath, "r") as file:
-            lines = file.readlines()
 
-            # first line = column names
-            header = lines[0].strip().split(",")
+def load_demo_data(filepath: str) -> DemoColumns:
+    """
+    Load the demo CSV using basic Python (no pandas).
 
-            # for each line after the header
-            for line in lines[1:]:
-                values = line.strip().split(",")
+    Args:
+        filepath (str): Path to the CSV file.
 
-                # build a dictionary: column_name → value
-                row_dict = {header[i]: values[i] for i in range(len(header))}
-                countries.append(row_dict)
+    Returns:
+        DemoColumns: Typed columns (iterates as DemoCountry records);
+        empty if the file cannot be read.
+    """
+    data = DemoColumns()
+    skipped = [0]
 
+    # Bound methods: no attribute lookups in the per-row loop
+    add_country, add_year = data.country.append, data.year.append
+    add_gdp, add_life = data.gdp_per_capita.append, data.life_expectancy.append
+    try:
+        for country, year, gdp, life in _iter_rows(filepath, skipped):
+            add_country(country)
+            add_year(year)
+            add_gdp(gdp)
+            add_life(life)
     except FileNotFoundError:
         print("Error: file not found.")
+    except ValueError as e:
+        # header.index(): a required column is missing
+        print(f"Error: unexpected CSV header ({e}).")
 
-    return countries
+    data.skipped = skipped[0]
+    if data.skipped:
+        print(f"Warning: skipped {data.skipped:,} malformed rows.")
+    return data
 
 
-def analyze_demo_data(countries):
+def summarize_demo_data(countries) -> Optional[dict]:
     """
-    Perform simple analysis on the demo dataset using pure Python.
-
-    Computes:
-    - average GDP per capita
-    - the country with the highest life expectancy
-    - list of countries with above-average GDP per capita
+    Compute the demo statistics in a single pass over the rows, plus one
+    pass over the cached GDP column for the above-average list.
 
     Args:
-        countries (list[dict]): Dataset loaded by load_demo_data().
+        countries (DemoColumns | iterable of DemoCountry): The dataset.
+
+    Returns:
+        dict | None: average_gdp, max_life, max_country, above_average
+        (list of names); None if there are no rows.
     """
-    if not countries:
-        print("No data to analyze.")
-        return
+    if isinstance(countries, DemoColumns):
+        names, gdp_column, life_column = countries.country, countries.gdp_per_capita, countries.life_expectancy
+    else:
+        names, gdp_column, life_column = [], array("d"), array("d")
+        for record in countries:
+            names.append(record.country)
+            gdp_column.append(record.gdp_per_capita)
+            life_column.append(record.life_expectancy)
 
-    # --- average GDP per capita ---
-    total_gdp = 0
-    count = 0
+    count = len(gdp_column)
+    if count == 0:
+        return None
 
-    for country in countries:
-        # values from CSV are strings -> convert to int
-        gdp_str = country["gdp_per_capita"]
-        gdp_value = int(gdp_str)
+    # --- single pass: GDP total and max life expectancy ---
+    total_gdp = 0.0
+    max_life = None
+    max_index = 0
+    for i, (gdp_value, life_value) in enumerate(zip(gdp_column, life_column)):
         total_gdp += gdp_value
-        count += 1
+        if (max_life is None) or (life_value > max_life):
+            max_life = life_value
+            max_index = i
 
     average_gdp = total_gdp / count
 
-    # --- country with max life expectancy ---
-    max_life = None
-    max_country = None
+    # --- above average: only the numeric column is scanned again ---
+    above_average = [names[i] for i, gdp_value in enumerate(gdp_column) if gdp_value > average_gdp]
 
-    for country in countries:
-        life_str = country["life_expectancy"]
-        life_value = float(life_str)
+    return {
+        "average_gdp": average_gdp,
+        "max_life": max_life,
+        "max_country": names[max_index],
+        "above_average": above_average,
+    }
 
-        if (max_life is None) or (life_value > max_life):
-            max_life = life_value
-            max_country = country["country"]
 
-    # --- countries with GDP per capita above average ---
-    above_average_countries = []
-    for country in countries:
-        gdp_value = int(country["gdp_per_capita"])
-        if gdp_value > average_gdp:
-            above_average_countries.append(country["country"])
+def analyze_demo_data(countries):
+    """
+    Perform simple analysis on the demo dataset using pure Python.
+
+    Computes:
+    - average GDP per capita
+    - the country with the highest life expectancy
+    - list of countries with above-average GDP per capita
+
+    Args:
+        countries (DemoColumns): Dataset loaded by load_demo_data().
+    """
+    summary = summarize_demo_data(countries)
+    if summary is None:
+        print("No data to analyze.")
+        return
 
     # ---- printing results ----
     print("\n=== ANALYSIS RESULTS (DEMO DATA) ===")
-    print(f"Average GDP per capita: {average_gdp:,.2f} USD")
-    print(f"Highest life expectancy: {max_life} years ({max_country})")
+    print(f"Average GDP per capita: {summary['average_gdp']:,.2f} USD")
+    print(f"Highest life expectancy: {summary['max_life']} years ({summary['max_country']})")
 
     print("\nCountries with GDP per capita ABOVE the average:")
-    if above_average_countries:
-        for name in above_average_countries:
+    if summary["above_average"]:
+        for name in summary["above_average"]:
             print(f" - {name}")
     else:
         print(" (none)")
@@ -104,6 +250,11 @@ def analyze_demo_data(countries):
     print("========================\n")
 
 
+def _format_number(value: float) -> str:
+    """Shortest exact form of a parsed value (1402112000.0 -> "1402112000")."""
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
 def print_countries(countries):
     """
     Print a readable summary of all countries in the dataset.
@@ -112,8 +263,7 @@ def print_countries(countries):
     print(f"(Total: {len(countries)} countries)\n")
 
     for row in countries:
-        country = row["country"]
-        year = row["year"]
-        gdp = row["gdp_per_capita"]
-        life = row["life_expectancy"]
-        print(f" - {country} ({year}) | GDP per capita: {gdp} | Life expectancy: {life}")
+        print(
+            f" - {row.country} ({row.year}) | GDP per capita: {_format_number(row.gdp_per_capita)} "
+            f"| Life expectancy: {_format_number(row.life_expectancy)}"
+        )
@@ -0,0 +1,214 @@
+"""
+Gap-filling for sparse country series.
+
+Works on the whole country x year matrix (PanelMatrix) at once: for every
+cell, the previous and next observed year of its country are found with
+running maximum/minimum accumulations, so filling is a few whole-matrix
+NumPy operations instead of a per-country loop.
+
+Methods:
+
+- "linear": straight line between the observations around a gap
+- "log_linear": straight line in logs (constant growth rate), for
+  positive series such as GDP per capita or population
+- "ffill": carry the last observation forward
+
+Gaps are only filled inside a country's observed range; leading and
+trailing years stay missing. `limit` caps the gap length (interpolation)
+or the number of years carried forward (ffill).
+
+A balanced panel keeps only the countries observed (after filling) in
+every year of a window, so per-year averages compare the same countries.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.panel import PanelMatrix
+
+
+FILL_METHODS = ("linear", "log_linear", "ffill")
+
+
+def _neighbour_columns(observed: np.ndarray) -> tuple:
+    """Column of the previous / next observation of every cell (-1 / n if none)."""
+    n_cols = observed.shape[1]
+    cols = np.arange(n_cols)
+    prev_col = np.maximum.accumulate(np.where(observed, cols, -1), axis=1)
+    next_col = np.minimum.accumulate(np.where(observed, cols, n_cols)[:, ::-1], axis=1)[:, ::-1]
+    return prev_col, next_col
+
+
+def fill_matrix(
+    values: np.ndarray, method: str = "linear", limit: Optional[int] = None
+) -> np.ndarray:
+    """
+    Fill the gaps of a (countries x years) matrix.
+
+    Args:
+        values (np.ndarray): float matrix with NaN for missing years.
+        method (str): "linear", "log_linear" or "ffill".
+        limit (int | None): Longest gap (in years) to interpolate, or most
+            years to carry forward with ffill. None fills every gap.
+
+    Returns:
+        np.ndarray: A filled copy; observed cells are unchanged.
+    """
+    if method not in FILL_METHODS:
+        raise ValueError(f"method must be one of {FILL_METHODS}, got '{method}'.")
+
+    values = np.asarray(values, dtype=np.float64)
+    observed = ~np.isnan(values)
+    prev_col, next_col = _neighbour_columns(observed)
+    rows = np.arange(values.shape[0])[:, None]
+    n_cols = values.shape[1]
+    cols = np.arange(n_cols)
+
+    has_prev = prev_col >= 0
+    prev_values = values[rows, np.maximum(prev_col, 0)]
+
+    if method == "ffill":
+        fill = has_prev & ~observed
+        if limit is not None:
+            fill &= cols - prev_col <= limit
+        return np.where(fill, prev_values, values)
+
+    has_next = next_col < n_cols
+    fill = has_prev & has_next & ~observed
+    if limit is not None:
+        fill &= next_col - prev_col - 1 <= limit
+
+    next_values = values[rows, np.minimum(next_col, n_cols - 1)]
+    if method == "log_linear":
+        # Only between two positive observations
+        fill &= (prev_values > 0) & (next_values > 0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            prev_values, next_values = np.log(prev_values), np.log(next_values)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        step = (cols - prev_col) / (next_col - prev_col)
+        interpolated = prev_values + (next_values - prev_values) * step
+    if method == "log_linear":
+        interpolated = np.exp(interpolated)
+
+    return np.where(fill, interpolated, values)
+
+
+def balanced_mask(values: np.ndarray, years: np.ndarray, window: Optional[tuple] = None) -> np.ndarray:
+    """
+    Rows observed in every year of `window` = (start_year, end_year)
+    (default: the full year range).
+    """
+    if window is None:
+        in_window = np.ones(len(years), dtype=bool)
+    else:
+        in_window = (years >= window[0]) & (years <= window[1])
+    return ~np.isnan(values[:, in_window]).any(axis=1)
+
+
+def coverage_report(before: np.ndarray, after: np.ndarray, years: np.ndarray) -> pd.DataFrame:
+    """
+    Per-year coverage of a panel before and after filling.
+
+    Returns:
+        pd.DataFrame indexed by year with columns:
+            countries, observed, filled, missing, observed_pct, coverage_pct
+    """
+    n_countries = before.shape[0]
+    observed = (~np.isnan(before)).sum(axis=0)
+    covered = (~np.isnan(after)).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        observed_pct = observed / n_countries * 100
+        coverage_pct = covered / n_countries * 100
+    return pd.DataFrame(
+        {
+            "countries": n_countries,
+            "observed": observed,
+            "filled": covered - observed,
+            "missing": n_countries - covered,
+            "observed_pct": observed_pct,
+            "coverage_pct": coverage_pct,
+        },
+        index=pd.Index(years, name="year"),
+    )
+
+
+def fill_panel_frame(
+    df: pd.DataFrame,
+    value_cols: Optional[list] = None,
+    method: Optional[str] = "linear",
+    limit: Optional[int] = None,
+    balanced: bool = False,
+    balanced_window: Optional[tuple] = None,
+) -> tuple:
+    """
+    Gap-fill a long loader frame, one indicator matrix at a time.
+
+    Args:
+        df (pd.DataFrame): Country-level frame (region_code, region_name,
+            year and one column per indicator).
+        value_cols (list | None): Indicator columns to fill (default: every
+            float column).
+        method (str | None): See fill_matrix; None only applies `balanced`.
+        limit (int | None): See fill_matrix.
+        balanced (bool): Blank out, per indicator, the countries that are
+            not covered in every year of `balanced_window`.
+        balanced_window (tuple | None): (start_year, end_year); default
+            is the full year range.
+
+    Returns:
+        tuple: (filled frame on the full country x year grid, without rows
+        where every indicator is missing, with an `imputed` flag column;
+        coverage report with an `indicator` column, see coverage_report)
+    """
+    if value_cols is None:
+        value_cols = list(df.select_dtypes(include="floating").columns)
+    if df.empty or not value_cols:
+        return df.copy(), pd.DataFrame()
+
+    # One grid for every indicator: all countries x the full year range
+    names = np.sort(df["region_name"].astype(object).unique())
+    first_year, last_year = int(df["year"].min()), int(df["year"].max())
+    years = np.arange(first_year, last_year + 1, dtype=np.int64)
+    row_of = pd.Index(names)
+
+    grid = {}
+    imputed = np.zeros((len(names), len(years)), dtype=bool)
+    reports = []
+    for column in value_cols:
+        panel = PanelMatrix.from_frame(df, column)
+        before = np.full((len(names), len(years)), np.nan)
+        if len(panel):
+            rows = row_of.get_indexer(panel.names)
+            start = int(panel.years[0]) - first_year
+            before[rows, start:start + len(panel.years)] = panel.values
+
+        after = fill_matrix(before, method, limit) if method else before.copy()
+        if balanced:
+            after[~balanced_mask(after, years, balanced_window)] = np.nan
+
+        grid[column] = after
+        imputed |= np.isnan(before) & ~np.isnan(after)
+        reports.append(coverage_report(before, after, years).assign(indicator=column))
+
+    out = pd.DataFrame(
+        {
+            "region_name": np.repeat(names, len(years)),
+            "year": np.tile(years, len(names)),
+        }
+    )
+    for column, values in grid.items():
+        out[column] = values.ravel()
+    out["imputed"] = imputed.ravel()
+
+    if "region_code" in df:
+        code_of = dict(zip(df["region_name"].astype(object), df["region_code"].astype(object)))
+        out.insert(0, "region_code", out["region_name"].map(code_of))
+    if "group_type" in df:
+        out["group_type"] = "country"
+
+    keep = out[value_cols].notna().any(axis=1)
+    coverage = pd.concat(reports).reset_index().set_index(["indicator", "year"])
+    return out[keep].reset_index(drop=True), coverage
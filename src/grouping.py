@@ -1,10 +1,86 @@
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from typing import Optional
+
+from src.country_catalog import CountryCatalog, load_country_catalog
+
+
+# World Bank aggregate codes (ISO3-style) -> (aggregate name, group type).
+# Keying on codes catches aggregates whose names are missing from the
+# hand-maintained name sets below (e.g. "OECD members", "Small states").
+# With a country catalog, regions and income levels take their type from
+# the catalog instead; this table only types the other aggregates (World,
+# lending groups, demographic dividends, ...) and is the offline fallback.
+WB_AGGREGATES = {
+    "AFE": ("Africa Eastern and Southern", "geographic"),
+    "AFW": ("Africa Western and Central", "geographic"),
+    "ARB": ("Arab World", "geographic"),
+    "CEB": ("Central Europe and the Baltics", "geographic"),
+    "CSS": ("Caribbean small states", "geographic"),
+    "EAP": ("East Asia & Pacific (excluding high income)", "geographic"),
+    "EAS": ("East Asia & Pacific", "geographic"),
+    "ECA": ("Europe & Central Asia (excluding high income)", "geographic"),
+    "ECS": ("Europe & Central Asia", "geographic"),
+    "EMU": ("Euro area", "geographic"),
+    "EUU": ("European Union", "geographic"),
+    "FCS": ("Fragile and conflict affected situations", "geographic"),
+    "LAC": ("Latin America & Caribbean (excluding high income)", "geographic"),
+    "LCN": ("Latin America & Caribbean", "geographic"),
+    "LDC": ("Least developed countries: UN classification", "geographic"),
+    "MEA": ("Middle East & North Africa", "geographic"),
+    "MNA": ("Middle East & North Africa (excluding high income)", "geographic"),
+    "NAC": ("North America", "geographic"),
+    "OSS": ("Other small states", "geographic"),
+    "PSS": ("Pacific island small states", "geographic"),
+    "SAS": ("South Asia", "geographic"),
+    "SSA": ("Sub-Saharan Africa (excluding high income)", "geographic"),
+    "SSF": ("Sub-Saharan Africa", "geographic"),
+    "SST": ("Small states", "geographic"),
+    "TEA": ("East Asia & Pacific (IDA & IBRD countries)", "geographic"),
+    "TEC": ("Europe & Central Asia (IDA & IBRD countries)", "geographic"),
+    "TLA": ("Latin America & the Caribbean (IDA & IBRD countries)", "geographic"),
+    "TMN": ("Middle East & North Africa (IDA & IBRD countries)", "geographic"),
+    "TSA": ("South Asia (IDA & IBRD)", "geographic"),
+    "TSS": ("Sub-Saharan Africa (IDA & IBRD countries)", "geographic"),
+    "WLD": ("World", "geographic"),
+    "HIC": ("High income", "income_group"),
+    "UMC": ("Upper middle income", "income_group"),
+    "MIC": ("Middle income", "income_group"),
+    "LMC": ("Lower middle income", "income_group"),
+    "LMY": ("Low & middle income", "income_group"),
+    "LIC": ("Low income", "income_group"),
+    "INX": ("Not classified", "income_group"),
+    "OED": ("OECD members", "income_group"),
+    "HPC": ("Heavily indebted poor countries (HIPC)", "income_group"),
+    "IBD": ("IBRD only", "income_group"),
+    "IBT": ("IDA & IBRD total", "income_group"),
+    "IDA": ("IDA total", "income_group"),
+    "IDB": ("IDA blend", "income_group"),
+    "IDX": ("IDA only", "income_group"),
+    "EAR": ("Early-demographic dividend", "demographic_group"),
+    "LTE": ("Late-demographic dividend", "demographic_group"),
+    "PRE": ("Pre-demographic dividend", "demographic_group"),
+    "PST": ("Post-demographic dividend", "demographic_group"),
+}
+
+# Frozen code -> group type lookup used by the vectorized path
+AGGREGATE_CODES = {code: group for code, (_, group) in WB_AGGREGATES.items()}
+
+# Group types in a fixed order, so they can be stored as int8 category codes.
+# "aggregate": flagged as an aggregate by the catalog, of no known kind.
+GROUP_TYPES = ["geographic", "income_group", "demographic_group", "aggregate", "other"]
+GROUP_CODES = {group: code for code, group in enumerate(GROUP_TYPES)}
+OTHER_CODE = GROUP_CODES["other"]
+
+
 class GroupClassifier:
     """
     Classify a region_name into one of several categories used in the project.
     ...
     """
 
-    def __init__(self):
+    def __init__(self, catalog: Optional[CountryCatalog] = None):
         # Predefined group sets
         self.geographic_regions = {
             # --- CRITICAL ADDITIONS ---
@@ -46,12 +122,143 @@ class GroupClassifier:
             "Post-demographic dividend",
         }
 
+        # Precomputed name -> group type lookup for the vectorized path
+        # (a name in several sets is geographic, so that set goes last)
+        self.name_lookup = {}
+        for names, group in (
+            (self.demographic_groups, "demographic_group"),
+            (self.income_groups, "income_group"),
+            (self.geographic_regions, "geographic"),
+        ):
+            self.name_lookup.update(dict.fromkeys(names, group))
+
+        # Code -> group type lookup; a World Bank catalog types every
+        # aggregate it flags (see catalog_group_types) and its names
+        # override the hand-maintained sets above
+        self.code_lookup = dict(AGGREGATE_CODES)
+        if catalog is not None:
+            by_code = catalog_group_types(catalog)
+            self.code_lookup.update(by_code)
+            names = catalog.aggregates()["name"]
+            self.name_lookup.update(
+                {name: by_code[code] for code, name in names.items() if name}
+            )
+        self.aggregate_codes = frozenset(self.code_lookup)
+        self.aggregate_names = frozenset(self.name_lookup)
+
     def classify(self, name: str) -> str:
         """Return the group type based on the region name."""
-        if name in self.geographic_regions:
-            return "geographic"
-        if name in self.income_groups:
-            return "income_group"
-        if name in self.demographic_groups:
-            return "demographic_group"
-        return "other"  # this becomes 'country' after filtering
+        return self.name_lookup.get(name, "other")  # 'other' becomes 'country' after filtering
+
+    def classify_series(
+        self, names: pd.Series, codes: Optional[pd.Series] = None
+    ) -> pd.Series:
+        """
+        Classify a whole Series of region names at once.
+
+        Only aggregates need a lookup, and they are a small share of the
+        rows: one hash-based `isin` against the (small) set of known
+        aggregate names or codes finds them, and just those rows are
+        factorized and mapped to int8 group codes; every other row stays
+        'other'. Categorical input is mapped through its categories
+        directly. When ISO3 `codes` are given they take precedence, with
+        the name lookup as a fallback for rows without a known aggregate
+        code.
+
+        On 1M synthetic object rows this is about 5x faster than
+        `names.apply(classify)` for names alone, but only 1.2-1.6x with
+        codes as well (two lookups per row); categorical input is 4-8x
+        faster (`python -m benchmarks.bench_classify`).
+
+        Returns:
+            pd.Series: Categorical group types aligned with `names`.
+        """
+        group = _lookup_group(names, self.name_lookup, self.aggregate_names)
+        if codes is not None:
+            by_code = _lookup_group(codes, self.code_lookup, self.aggregate_codes)
+            group = np.where(by_code != OTHER_CODE, by_code, group)
+        return pd.Series(
+            pd.Categorical.from_codes(group, categories=GROUP_TYPES),
+            index=names.index,
+            name="group_type",
+        )
+
+    def aggregate_mask(
+        self, names: pd.Series, codes: Optional[pd.Series] = None
+    ) -> pd.Series:
+        """
+        Return a boolean mask of the aggregate rows (anything not 'other').
+
+        Cheaper than classify_series when only filtering is needed:
+        a single hash-based `isin` against a frozen set per column (1.5-2x
+        faster than the per-row apply on object names and codes, 6-10x on
+        categorical ones).
+        """
+        mask = names.isin(self.aggregate_names)
+        if codes is not None:
+            mask |= codes.isin(self.aggregate_codes)
+        return mask
+
+
+def catalog_group_types(catalog: CountryCatalog) -> dict:
+    """
+    Derive the group type of every aggregate flagged by the catalog.
+
+    An aggregate whose code is the region of some economy is
+    "geographic", one whose code is an income level is "income_group".
+    The catalog's metadata says nothing more about the others, which keep
+    their WB_AGGREGATES type, or "aggregate" if they are not listed there.
+
+    Returns:
+        dict: aggregate code -> group type.
+    """
+    regions, incomes = catalog.region_codes(), catalog.income_codes()
+    types = {}
+    for code in catalog.aggregate_codes:
+        if code in regions:
+            types[code] = "geographic"
+        elif code in incomes:
+            types[code] = "income_group"
+        else:
+            types[code] = AGGREGATE_CODES.get(code, "aggregate")
+    return types
+
+
+def _lookup_group(values: pd.Series, lookup: dict, keys: frozenset) -> np.ndarray:
+    """
+    int8 group codes of `values`: rows whose value is in `keys` are mapped
+    through `lookup`, all others are 'other'. Object columns are not
+    factorized as a whole (a hash table of every distinct country costs
+    about as much as the per-row lookups it replaces).
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return _map_unique(values, lookup)
+    group = np.full(len(values), OTHER_CODE, dtype=np.int8)
+    hits = values.isin(keys).to_numpy()
+    if hits.any():
+        group[hits] = _map_unique(values[hits], lookup)
+    return group
+
+
+def _map_unique(values: pd.Series, lookup: dict) -> np.ndarray:
+    """Map a Series through `lookup` to int8 group codes, visiting each unique value once."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    mapped = np.array(
+        [GROUP_CODES[lookup.get(value, "other")] for value in uniques], dtype=np.int8
+    )
+    return mapped.take(codes)
+
+
+@lru_cache(maxsize=1)
+def get_default_classifier() -> GroupClassifier:
+    """
+    Return a shared GroupClassifier backed by the World Bank country catalog,
+    instead of rebuilding it on every load. Without a catalog file, the
+    hardcoded aggregate codes and names are used.
+    """
+    try:
+        catalog = load_country_catalog()
+    except FileNotFoundError as e:
+        print(f"Country catalog not found ({e.filename}); using the built-in aggregate list.")
+        catalog = None
+    return GroupClassifier(catalog)
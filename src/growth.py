@@ -0,0 +1,215 @@
+"""
+Growth-rate analytics over a PanelMatrix (countries x years).
+
+Every measure is computed for all countries at once with whole-matrix
+NumPy operations:
+
+- year-over-year growth (%)
+- CAGR between any two years, or over a trailing window for every year
+- rolling means and rolling volatility (std. dev. of YoY growth)
+- percentile rank of every country within each year
+
+A GrowthEngine caches each result by its arguments, so keeping one engine
+per dataset version (e.g. with st.cache_resource) makes repeated
+dashboard queries free.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.country_catalog import load_country_catalog
+from src.memo import ResultCache
+from src.panel import PanelMatrix
+
+
+def yoy_growth(values: np.ndarray) -> np.ndarray:
+    """Year-over-year growth in % (first year and gaps are NaN)."""
+    out = np.full(values.shape, np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out[:, 1:] = (values[:, 1:] / values[:, :-1] - 1) * 100
+    out[~np.isfinite(out)] = np.nan
+    return out
+
+
+def cagr(start_values: np.ndarray, end_values: np.ndarray, n_years) -> np.ndarray:
+    """
+    Compound annual growth rate in %, NaN for missing or non-positive values.
+    `n_years` must be positive (see _check_years).
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratio = end_values / start_values
+        out = (np.power(ratio, 1.0 / n_years) - 1) * 100
+    out[~((start_values > 0) & (end_values > 0))] = np.nan
+    return out
+
+
+def _check_years(start_year: int, end_year: int) -> None:
+    """A CAGR needs end_year > start_year (equal years divide by zero, reversed ones invert the rate)."""
+    if end_year <= start_year:
+        raise ValueError(f"end_year must be after start_year, got {start_year}-{end_year}.")
+
+
+def _window_sums(values: np.ndarray, window: int) -> tuple:
+    """
+    Trailing-window sums, sums of squares and observation counts, for every
+    column at once (NaNs are skipped), using cumulative sums.
+    """
+    n_rows, n_cols = values.shape
+    observed = ~np.isnan(values)
+    filled = np.where(observed, values, 0.0)
+
+    def cumulative(x: np.ndarray) -> np.ndarray:
+        out = np.zeros((n_rows, n_cols + 1))
+        np.cumsum(x, axis=1, out=out[:, 1:])
+        return out
+
+    hi = np.arange(1, n_cols + 1)
+    lo = np.maximum(hi - window, 0)
+    csum, csq, ccount = cumulative(filled), cumulative(filled ** 2), cumulative(observed)
+    return (csum[:, hi] - csum[:, lo], csq[:, hi] - csq[:, lo], ccount[:, hi] - ccount[:, lo])
+
+
+def rolling_mean(values: np.ndarray, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """Trailing `window`-year mean, NaN with fewer than `min_periods` values."""
+    min_periods = window if min_periods is None else min_periods
+    sums, _, counts = _window_sums(values, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts >= max(min_periods, 1), sums / counts, np.nan)
+
+
+def rolling_std(values: np.ndarray, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """Trailing `window`-year sample standard deviation (ddof=1)."""
+    min_periods = window if min_periods is None else min_periods
+    sums, squares, counts = _window_sums(values, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        variance = (squares - sums ** 2 / counts) / (counts - 1)
+    return np.where(counts >= max(min_periods, 2), np.sqrt(np.clip(variance, 0, None)), np.nan)
+
+
+class GrowthEngine:
+    """
+    Vectorized growth analytics for one indicator of one dataset version.
+
+    Args:
+        panel (PanelMatrix | pd.DataFrame): The pivoted panel, or a long
+            loader frame to pivot.
+        value_col (str): Indicator column, when a frame is passed.
+    """
+
+    def __init__(self, panel, value_col: str = "gdp_per_capita"):
+        if isinstance(panel, pd.DataFrame):
+            panel = PanelMatrix.from_frame(panel, value_col)
+        self.panel = panel
+        self._cache = ResultCache()
+
+    # ----- matrices (countries x years) -----
+
+    def yoy_growth(self) -> pd.DataFrame:
+        """Year-over-year growth in % for every country and year."""
+        return self._cache.get(("yoy",), lambda: self.panel.wrap(yoy_growth(self.panel.values)))
+
+    def rolling_cagr(self, window: int) -> pd.DataFrame:
+        """CAGR in % over the `window` years ending in each year."""
+        def compute():
+            values = self.panel.values
+            out = np.full(values.shape, np.nan)
+            if 0 < window < values.shape[1]:
+                out[:, window:] = cagr(values[:, :-window], values[:, window:], window)
+            return self.panel.wrap(out)
+        return self._cache.get(("rolling_cagr", window), compute)
+
+    def rolling_mean(self, window: int, min_periods: Optional[int] = None) -> pd.DataFrame:
+        """Trailing `window`-year mean of the indicator."""
+        return self._cache.get(
+            ("rolling_mean", window, min_periods),
+            lambda: self.panel.wrap(rolling_mean(self.panel.values, window, min_periods)),
+        )
+
+    def rolling_volatility(self, window: int, min_periods: Optional[int] = None) -> pd.DataFrame:
+        """Trailing `window`-year standard deviation of YoY growth (percentage points)."""
+        return self._cache.get(
+            ("rolling_volatility", window, min_periods),
+            lambda: self.panel.wrap(
+                rolling_std(self.yoy_growth().to_numpy(), window, min_periods)
+            ),
+        )
+
+    def percentile_ranks(self) -> pd.DataFrame:
+        """Percentile rank (0-100] of every country within each year."""
+        return self._cache.get(
+            ("percentile_ranks",),
+            lambda: self.panel.to_frame().rank(axis=0, pct=True) * 100,
+        )
+
+    # ----- per-country vectors -----
+
+    def cagr(self, start_year: int, end_year: int) -> pd.Series:
+        """
+        CAGR in % between two years, for every country.
+
+        Raises:
+            ValueError: if end_year is not after start_year.
+        """
+        _check_years(start_year, end_year)
+
+        def compute():
+            values = self.panel.values
+            start, end = self.panel.year_col(start_year), self.panel.year_col(end_year)
+            return pd.Series(
+                cagr(values[:, start], values[:, end], end_year - start_year),
+                index=pd.Index(self.panel.names, name="region_name"),
+                name="cagr_pct",
+            )
+        return self._cache.get(("cagr", start_year, end_year), compute)
+
+    def summary(self, start_year: int, end_year: int, window: int = 5) -> pd.DataFrame:
+        """
+        One row per country over [start_year, end_year].
+
+        Returns:
+            pd.DataFrame with columns:
+                start_value, end_value, growth_pct, cagr_pct, yoy_pct,
+                volatility, percentile
+            (yoy_pct, volatility and percentile are taken in end_year;
+            volatility uses a `window`-year trailing window)
+
+        Raises:
+            ValueError: if end_year is not after start_year.
+        """
+        _check_years(start_year, end_year)
+
+        def compute():
+            values = self.panel.values
+            start, end = self.panel.year_col(start_year), self.panel.year_col(end_year)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                growth = (values[:, end] / values[:, start] - 1) * 100
+            return pd.DataFrame(
+                {
+                    "start_value": values[:, start],
+                    "end_value": values[:, end],
+                    "growth_pct": growth,
+                    "cagr_pct": self.cagr(start_year, end_year).to_numpy(),
+                    "yoy_pct": self.yoy_growth().to_numpy()[:, end],
+                    "volatility": self.rolling_volatility(window, min_periods=2).to_numpy()[:, end],
+                    "percentile": self.percentile_ranks().to_numpy()[:, end],
+                },
+                index=pd.Index(self.panel.names, name="region_name"),
+            )
+        return self._cache.get(("summary", start_year, end_year, window), compute)
+
+    # ----- aggregates -----
+
+    def rollup(self, by: str = "region", include_world: bool = True) -> "GrowthEngine":
+        """
+        Engine over group averages: World Bank region or income level rows
+        (from the country catalog) plus a "World" row.
+        """
+        def compute():
+            catalog = load_country_catalog()
+            lookup = catalog.region_of if by == "region" else catalog.income_level_of
+            codes = self.panel.codes if self.panel.codes is not None else [None] * len(self.panel)
+            groups = np.array([lookup(code) if code else None for code in codes], dtype=object)
+            return GrowthEngine(self.panel.rollup(groups, include_world))
+        return self._cache.get(("rollup", by, include_world), compute)
@@ -0,0 +1,316 @@
+"""
+Stage-level timing and memory instrumentation for the pipeline.
+
+Wrap a stage in `with stage("name") as s:` (and optionally call
+`s.set_rows(n)`). When tracing is enabled, every stage records:
+
+- wall time and CPU time (process time)
+- the number of rows it produced (if set)
+- its memory: the peak of traced Python/NumPy allocations above the
+  stage's start (tracemalloc mode), or how much the process RSS grew over
+  the stage (rss mode, no overhead; memory freed before the stage ends is
+  not seen, so this is a lower bound of the stage's peak)
+
+Stages nest; each record names its parent stage. Records are appended to
+a JSON-lines log as they finish and/or written as a Prometheus text file
+by flush().
+
+Tracing is off by default: stage() then returns a shared no-op context,
+so instrumented code pays one function call per stage. Enable it with
+configure(), or with environment variables:
+
+    WEALTH_TRACE=1                      turn tracing on
+    WEALTH_TRACE_MEMORY=rss             "rss" (default), "tracemalloc" or "off"
+    WEALTH_TRACE_LOG=trace.jsonl        JSON-lines log (default: stderr)
+    WEALTH_TRACE_PROM=metrics.prom      Prometheus text file
+
+A malformed value disables tracing with a warning rather than failing the
+import of every instrumented module.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import warnings
+from typing import NamedTuple, Optional
+
+try:
+    import resource
+except ImportError:     # Windows: no getrusage, rss mode without /proc reports 0
+    resource = None
+
+
+MEMORY_MODES = ("rss", "tracemalloc", "off")
+METRIC_PREFIX = "wealth_stage"
+
+
+class StageRecord(NamedTuple):
+    """Measurements of one finished stage."""
+    stage: str
+    parent: Optional[str]
+    started_at: float
+    wall_seconds: float
+    cpu_seconds: float
+    rows: Optional[int]
+    peak_bytes: int
+    memory_mode: str
+
+
+class _NullStage:
+    """Shared context used while tracing is disabled."""
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+    def set_rows(self, rows) -> None:
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+def _peak_rss_bytes() -> int:
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+
+
+def _rss_bytes() -> int:
+    """
+    Current RSS of the process. Without /proc (macOS), falls back to the
+    lifetime peak, so a stage then reports how much it raised that peak.
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return _peak_rss_bytes()
+
+
+class _Stage:
+    """Context for one traced stage (see Tracer.stage)."""
+
+    def __init__(self, tracer: "Tracer", name: str, rows: Optional[int]):
+        self.tracer = tracer
+        self.name = name
+        self.rows = rows
+        self.parent: Optional["_Stage"] = None
+        self._child_peak = 0
+
+    def set_rows(self, rows) -> None:
+        """Record how many rows this stage produced."""
+        self.rows = None if rows is None else int(rows)
+
+    def __enter__(self) -> "_Stage":
+        stack = self.tracer._stack()
+        self.parent = stack[-1] if stack else None
+        stack.append(self)
+
+        if self.tracer.memory == "tracemalloc":
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.tracer._started_tracemalloc = True
+            self._mem_start, peak = tracemalloc.get_traced_memory()
+            if self.parent is not None:
+                # Keep the parent's peak so far before resetting it for this stage
+                self.parent._child_peak = max(self.parent._child_peak, peak)
+            tracemalloc.reset_peak()
+        elif self.tracer.memory == "rss":
+            self._rss_start = _rss_bytes()
+
+        self._started_at = time.time()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+
+        if self.tracer.memory == "tracemalloc":
+            peak_abs = max(tracemalloc.get_traced_memory()[1], self._child_peak)
+            peak_bytes = max(0, peak_abs - self._mem_start)
+            if self.parent is not None:
+                self.parent._child_peak = max(self.parent._child_peak, peak_abs)
+            tracemalloc.reset_peak()
+        elif self.tracer.memory == "rss":
+            peak_bytes = max(0, _rss_bytes() - self._rss_start)
+        else:
+            peak_bytes = 0
+
+        self.tracer._stack().pop()
+        self.tracer._record(StageRecord(
+            stage=self.name,
+            parent=self.parent.name if self.parent is not None else None,
+            started_at=self._started_at,
+            wall_seconds=wall,
+            cpu_seconds=cpu,
+            rows=self.rows,
+            peak_bytes=int(peak_bytes),
+            memory_mode=self.tracer.memory,
+        ))
+
+        if not self.tracer._stack() and self.tracer._started_tracemalloc:
+            tracemalloc.stop()
+            self.tracer._started_tracemalloc = False
+        return None
+
+
+class Tracer:
+    """
+    Collects StageRecords and writes them out.
+
+    Attributes:
+        enabled (bool): Record stages at all.
+        memory (str): "rss", "tracemalloc" or "off".
+        log_path (str | None): JSON-lines file ("-" for stderr, None for no log).
+        prom_path (str | None): Prometheus text file written by flush().
+        records (list[StageRecord]): Stages finished so far.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        memory: str = "rss",
+        log_path: Optional[str] = None,
+        prom_path: Optional[str] = None,
+    ):
+        self.records = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+        self.configure(enabled, memory, log_path, prom_path)
+
+    def configure(
+        self,
+        enabled: bool = True,
+        memory: str = "rss",
+        log_path: Optional[str] = None,
+        prom_path: Optional[str] = None,
+    ) -> "Tracer":
+        """Change the tracer settings (records collected so far are kept)."""
+        if memory not in MEMORY_MODES:
+            raise ValueError(f"memory must be one of {MEMORY_MODES}, got {memory!r}")
+        self.enabled = enabled
+        self.memory = memory
+        self.log_path = log_path
+        self.prom_path = prom_path
+        return self
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def stage(self, name: str, rows: Optional[int] = None):
+        """Context manager measuring one stage (no-op while disabled)."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, rows)
+
+    def _record(self, record: StageRecord) -> None:
+        with self._lock:
+            self.records.append(record)
+            if self.log_path:
+                line = json.dumps(record._asdict())
+                if self.log_path == "-":
+                    print(line, file=sys.stderr)
+                else:
+                    with open(self.log_path, "a") as file:
+                        file.write(line + "\n")
+
+    def to_prometheus(self) -> str:
+        """
+        Render the latest record of every stage in the Prometheus text format.
+        """
+        latest = {}
+        for record in self.records:
+            latest[(record.stage, record.parent)] = record
+
+        metrics = [
+            ("wall_seconds", "gauge", "Wall-clock duration of the stage"),
+            ("cpu_seconds", "gauge", "CPU time of the stage"),
+            ("rows", "gauge", "Rows produced by the stage"),
+            ("peak_bytes", "gauge", "Memory of the stage (tracemalloc peak or RSS growth)"),
+        ]
+        lines = []
+        for field, kind, help_text in metrics:
+            name = f"{METRIC_PREFIX}_{field}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (stage_name, parent), record in latest.items():
+                value = getattr(record, field)
+                if value is None:
+                    continue
+                labels = f'stage="{stage_name}",parent="{parent or ""}"'
+                lines.append(f"{name}{{{labels}}} {value}")
+        return "\n".join(lines) + "\n"
+
+    def flush(self) -> None:
+        """Write the Prometheus file (if configured), atomically."""
+        if not (self.enabled and self.prom_path):
+            return
+        tmp_path = f"{self.prom_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as file:
+            file.write(self.to_prometheus())
+        os.replace(tmp_path, self.prom_path)
+
+    def reset(self) -> None:
+        """Forget the records collected so far."""
+        with self._lock:
+            self.records = []
+
+
+def tracer_from_env(environ=os.environ) -> Tracer:
+    """
+    Build a Tracer from the WEALTH_TRACE* environment variables.
+
+    An invalid setting returns a disabled Tracer and emits a warning instead
+    of raising, since this runs when the module is imported.
+    """
+    enabled = environ.get("WEALTH_TRACE", "").lower() in ("1", "true", "yes", "on")
+    prom_path = environ.get("WEALTH_TRACE_PROM") or None
+    try:
+        return Tracer(
+            enabled=enabled,
+            memory=environ.get("WEALTH_TRACE_MEMORY", "rss").lower(),
+            # Without an explicit destination, a JSON log on stderr
+            log_path=environ.get("WEALTH_TRACE_LOG") or (None if prom_path else "-"),
+            prom_path=prom_path,
+        )
+    except ValueError as e:
+        warnings.warn(f"Tracing disabled, invalid WEALTH_TRACE_MEMORY: {e}", RuntimeWarning, stacklevel=2)
+        return Tracer()
+
+
+# Process-wide tracer used by the pipeline modules
+TRACER = tracer_from_env()
+
+
+def stage(name: str, rows: Optional[int] = None):
+    """Measure one stage with the process-wide tracer (see Tracer.stage)."""
+    return TRACER.stage(name, rows)
+
+
+def configure(
+    enabled: bool = True,
+    memory: str = "rss",
+    log_path: Optional[str] = None,
+    prom_path: Optional[str] = None,
+) -> Tracer:
+    """Enable/configure the process-wide tracer."""
+    return TRACER.configure(enabled, memory, log_path, prom_path)
+
+
+def flush() -> None:
+    """Write the process-wide tracer's Prometheus file, if configured."""
+    TRACER.flush()
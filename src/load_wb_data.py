@@ -1,18 +1,76 @@
-import requests
+from __future__ import annotations
+
+import os
+import time
 import pandas as pd
-from typing import Optional
-from src.grouping import GroupClassifier # CRITICAL: This is used for filtering
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterator, Optional
+from src.grouping import get_default_classifier # CRITICAL: This is used for filtering
+from src.cache import IndicatorCache
+from src.instrumentation import stage
+from src.gapfill import fill_panel_frame
+from src.country_catalog import CountryCatalog, CATALOG_CACHE_PATH, load_country_catalog
+from src.constants import (
+    DEFAULT_INDICATORS,
+    GDP_INDICATOR,
+    LIFE_EXPECTANCY_INDICATOR,
+    POPULATION_INDICATOR,
+    WB_API_BASE,
+)
+
+# requests and pyarrow.parquet are imported where they are used: reading
+# the cache or the CSV export never pays for them
+if TYPE_CHECKING:
+    import requests
 
 
 # --- CONSTANT ---
-GDP_INDICATOR = "NY.GDP.PCAP.CD"
+# Indicator codes, DEFAULT_INDICATORS and WB_API_BASE live in src/constants.py
+
+# Paging / retry defaults for the World Bank API
+DEFAULT_PER_PAGE = 1000
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+
+# Most recent cached years re-downloaded when the World Bank publishes a release
+DEFAULT_REVISION_WINDOW = 3
+
+# HTTP status codes worth retrying (rate limiting and transient server errors)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
 
 
 # --- 1. CSV LOADING (Kept for robust fallback) ---
-def load_gdp_per_capita_from_csv(filepath: str) -> pd.DataFrame:
+
+# SDMX column -> loader column, and the dtypes used when streaming
+CSV_COLUMNS = {
+    "REF_AREA": "region_code",
+    "REF_AREA_LABEL": "region_name",
+    "TIME_PERIOD": "year",
+    "OBS_VALUE": "gdp_per_capita",
+}
+CSV_DTYPES = {"REF_AREA": "category", "REF_AREA_LABEL": "category", "INDICATOR": "category"}
+DEFAULT_CSV_CHUNKSIZE = 500_000
+DEFAULT_CSV_PATH = "data/worldbank_gdp_per_capita.csv"
+
+
+def load_gdp_per_capita_from_csv(filepath: str, chunksize: Optional[int] = None) -> pd.DataFrame:
     """
     Load GDP per capita data from the World Bank SDMX-style CSV.
+
+    With `chunksize`, the file is streamed (see iter_gdp_csv_chunks) so only
+    one chunk of raw rows is in memory at a time; region columns come back
+    as categoricals.
     """
+    if chunksize:
+        chunks = list(iter_gdp_csv_chunks(filepath, chunksize=chunksize, drop_aggregates=False))
+        if not chunks:
+            return pd.DataFrame(columns=list(CSV_COLUMNS.values()))
+        # Per-chunk categories differ, so concat falls back to object: re-encode once
+        df = pd.concat(chunks, ignore_index=True)
+        for column in ("region_code", "region_name"):
+            df[column] = df[column].astype("category")
+        return df
 
     # 1. Read the CSV file
     df = pd.read_csv(filepath)
@@ -42,40 +100,584 @@ def load_gdp_per_capita_from_csv(filepath: str) -> pd.DataFrame:
     return df[["region_code", "region_name", "year", "gdp_per_capita"]].copy() # Added .copy()
 
 
+def iter_gdp_csv_chunks(
+    filepath: str,
+    chunksize: int = DEFAULT_CSV_CHUNKSIZE,
+    indicator: Optional[str] = None,
+    drop_aggregates: bool = True,
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a (possibly multi-GB) SDMX CSV export in cleaned chunks.
+
+    Only the needed columns are parsed (`usecols`), region columns are read
+    directly as categoricals, and every chunk is filtered, type-coerced and
+    (optionally) stripped of aggregates before the next one is read, so peak
+    memory depends on `chunksize`, not on the file size.
+
+    Args:
+        filepath (str): Path to the SDMX CSV file.
+        chunksize (int): Raw rows parsed per chunk.
+        indicator (str): For bulk exports holding several indicators, keep
+            only rows whose INDICATOR column equals this code.
+        drop_aggregates (bool): Remove aggregate regions from every chunk.
+
+    Yields:
+        pd.DataFrame: region_code, region_name, year, gdp_per_capita.
+    """
+    usecols = list(CSV_COLUMNS) + (["INDICATOR"] if indicator else [])
+    reader = pd.read_csv(
+        filepath,
+        usecols=usecols,
+        dtype={col: dtype for col, dtype in CSV_DTYPES.items() if col in usecols},
+        chunksize=chunksize,
+    )
+    classifier = get_default_classifier()
+
+    with reader:
+        for chunk in reader:
+            if indicator:
+                chunk = chunk[chunk["INDICATOR"] == indicator]
+
+            chunk = chunk.rename(columns=CSV_COLUMNS)
+            year = pd.to_numeric(chunk["year"], errors="coerce")
+            value = pd.to_numeric(chunk["gdp_per_capita"], errors="coerce")
+            keep = year.notna() & value.notna()
+            if drop_aggregates:
+                keep &= ~classifier.aggregate_mask(chunk["region_name"], chunk["region_code"])
+
+            if not keep.any():
+                continue
+
+            yield pd.DataFrame(
+                {
+                    "region_code": chunk["region_code"][keep].cat.remove_unused_categories(),
+                    "region_name": chunk["region_name"][keep].cat.remove_unused_categories(),
+                    "year": year[keep].astype("int64"),
+                    "gdp_per_capita": value[keep].astype("float64"),
+                }
+            )
+
+
+def stream_csv_to_parquet(
+    filepath: str,
+    out_path: str,
+    chunksize: int = DEFAULT_CSV_CHUNKSIZE,
+    indicator: Optional[str] = None,
+) -> int:
+    """
+    Convert an SDMX CSV export into a country-level Parquet file chunk by chunk.
+
+    Each cleaned chunk (see iter_gdp_csv_chunks) is appended as a row group,
+    with region columns dictionary-encoded, so the whole file is never held
+    in memory.
+
+    Returns:
+        int: Number of rows written.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            ("region_code", pa.dictionary(pa.int32(), pa.string())),
+            ("region_name", pa.dictionary(pa.int32(), pa.string())),
+            ("year", pa.int64()),
+            ("gdp_per_capita", pa.float64()),
+        ]
+    )
+
+    rows = 0
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    with pq.ParquetWriter(tmp_path, schema) as writer:
+        for chunk in iter_gdp_csv_chunks(filepath, chunksize=chunksize, indicator=indicator):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            rows += len(chunk)
+
+    os.replace(tmp_path, out_path)
+    return rows
+
+
 # --- 2. API FETCHING (Uses requests - C3) ---
+def create_session(pool_size: int = DEFAULT_MAX_WORKERS) -> requests.Session:
+    """
+    Create a requests Session whose connection pool is large enough
+    for `pool_size` concurrent page downloads.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _get_page(
+    session: requests.Session,
+    url: str,
+    params: dict,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+) -> list:
+    """
+    GET one page of a World Bank API response, retrying transient failures
+    with exponential backoff (backoff, 2*backoff, 4*backoff, ...).
+
+    Raises:
+        requests.exceptions.RequestException: if every attempt failed.
+    """
+    import requests
+
+    attempt = 0
+    while True:
+        try:
+            response = session.get(url, params=params, timeout=30)
+            if response.status_code not in RETRY_STATUS_CODES:
+                # Other client errors (e.g. 404) are not worth retrying
+                response.raise_for_status()
+                return response.json()
+            error = requests.exceptions.HTTPError(
+                f"{response.status_code} error for url: {response.url}", response=response
+            )
+        except requests.exceptions.HTTPError:
+            raise
+        except requests.exceptions.RequestException as e:
+            error = e
+
+        if attempt >= retries:
+            raise error
+        time.sleep(backoff * (2 ** attempt))
+        attempt += 1
+
+
+def fetch_all_pages(
+    url: str,
+    params: dict,
+    per_page: int = DEFAULT_PER_PAGE,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+    session: Optional[requests.Session] = None,
+) -> Optional[list]:
+    """
+    Download every page of a paginated World Bank API endpoint.
+
+    The first page is fetched on its own to read the paging metadata
+    (`data[0]["pages"]`); all remaining pages are then requested
+    concurrently over a pooled session.
+
+    Returns:
+        list[dict] | None: Records of all pages, in page order,
+        or None if the request failed.
+    """
+    import requests
+
+    params = {**params, "format": "json", "per_page": per_page}
+
+    own_session = session is None
+    if own_session:
+        session = create_session(max_workers)
+
+    try:
+        # 1. First page: records + paging metadata
+        first = _get_page(session, url, {**params, "page": 1}, retries, backoff)
+        if not isinstance(first, list) or len(first) < 2 or first[1] is None:
+            print("API returned no data or an unexpected format.")
+            return None
+
+        pages = int(first[0].get("pages", 1) or 1)
+        records = list(first[1])
+
+        # 2. Remaining pages, fetched concurrently
+        if pages > 1:
+            def fetch(page: int) -> list:
+                payload = _get_page(session, url, {**params, "page": page}, retries, backoff)
+                if len(payload) < 2 or payload[1] is None:
+                    return []
+                return payload[1]
+
+            with ThreadPoolExecutor(max_workers=min(max_workers, pages - 1)) as pool:
+                for page_records in pool.map(fetch, range(2, pages + 1)):
+                    records.extend(page_records)
+
+        expected = first[0].get("total")
+        if expected is not None and len(records) != int(expected):
+            print(f"Warning: expected {expected} records, received {len(records)}.")
+
+        return records
+
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching data from World Bank API: {e}")
+        return None
+    finally:
+        if own_session:
+            session.close()
+
+
+def fetch_indicator_records(
+    indicator: str,
+    start_year: int,
+    end_year: int,
+    base_url: str = WB_API_BASE,
+    per_page: int = DEFAULT_PER_PAGE,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+    session: Optional[requests.Session] = None,
+) -> Optional[list]:
+    """
+    Download every page of an indicator from the World Bank API.
+
+    Args:
+        indicator (str): World Bank indicator code, e.g. "NY.GDP.PCAP.CD".
+        start_year (int): First year of the range (inclusive).
+        end_year (int): Last year of the range (inclusive).
+        base_url (str): API root, overridable to point at a local stand-in server.
+        per_page (int): Number of records requested per page.
+        max_workers (int): Number of pages downloaded in parallel.
+        retries (int): Retries per page on transient errors.
+        backoff (float): Base delay in seconds between retries.
+        session (requests.Session): Optional shared session.
+
+    Returns:
+        list[dict] | None: Raw records of all pages, in page order,
+        or None if the request failed.
+    """
+    return fetch_all_pages(
+        f"{base_url}/country/all/indicator/{indicator}",
+        {"date": f"{start_year}:{end_year}"},
+        per_page=per_page, max_workers=max_workers,
+        retries=retries, backoff=backoff, session=session,
+    )
+
+
+def fetch_country_catalog(
+    base_url: str = WB_API_BASE,
+    cache_path: Optional[str] = CATALOG_CACHE_PATH,
+) -> Optional[CountryCatalog]:
+    """
+    Download the `/v2/country` metadata (all economies and aggregates)
+    and save it locally, so later loads use it instead of the bundled snapshot.
+
+    Returns:
+        CountryCatalog | None: The fresh catalog, or None if the download failed.
+    """
+    records = fetch_all_pages(f"{base_url}/country", {})
+    if not records:
+        return None
+
+    catalog = CountryCatalog.from_api_records(records)
+    if cache_path:
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        catalog.to_csv(cache_path)
+
+        # Make the shared catalog and classifier pick up the new download
+        load_country_catalog.cache_clear()
+        get_default_classifier.cache_clear()
+
+    return catalog
+
+
+def probe_indicator(
+    indicator: str,
+    start_year: int,
+    end_year: int,
+    base_url: str = WB_API_BASE,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+    session: Optional[requests.Session] = None,
+) -> Optional[dict]:
+    """
+    Issue a cheap conditional request (a single one-record page) to find out
+    whether an indicator changed since it was last downloaded.
+
+    Returns:
+        dict | None: not_modified flag plus the etag, last_modified,
+        lastupdated and total values of the response, or None on failure.
+    """
+    import requests
+
+    url = f"{base_url}/country/all/indicator/{indicator}"
+    params = {"date": f"{start_year}:{end_year}", "format": "json", "per_page": 1, "page": 1}
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    try:
+        response = (session or requests).get(url, params=params, headers=headers, timeout=30)
+        if response.status_code == 304:
+            return {"not_modified": True, "etag": etag, "last_modified": last_modified}
+        response.raise_for_status()
+        data = response.json()
+    except requests.exceptions.RequestException:
+        return None
+
+    meta = data[0] if isinstance(data, list) and data else {}
+    return {
+        "not_modified": False,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "lastupdated": meta.get("lastupdated"),
+        "total": meta.get("total"),
+    }
+
+
+def fetch_indicator_frame(
+    indicator: str,
+    value_col: str,
+    start_year: int,
+    end_year: int,
+    base_url: str = WB_API_BASE,
+    cache: Optional[IndicatorCache] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    session: Optional[requests.Session] = None,
+    incremental: bool = False,
+) -> Optional[pd.DataFrame]:
+    """
+    Return one indicator as a long DataFrame (region_code, region_name,
+    year, `value_col`), going through the on-disk cache when one is given.
+    With `incremental=True`, see refresh_indicator_frame.
+
+    Cache policy:
+    - fresh entry (within TTL): served from disk, no network access
+    - stale entry: revalidated with a conditional request; if the API
+      reports no change, the entry is served and its TTL renewed
+    - miss or changed data: full download, then stored in the cache
+    - download failure with a stale entry available: the stale entry is served
+    """
+    if incremental and cache is not None:
+        return refresh_indicator_frame(
+            indicator, value_col, start_year, end_year, cache,
+            base_url=base_url, max_workers=max_workers, session=session,
+        )
+
+    validators = None
+    if cache is not None:
+        meta = cache.metadata(indicator, start_year, end_year)
+        if meta is not None:
+            unchanged = cache.is_fresh(meta)
+            if not unchanged:
+                validators = probe_indicator(
+                    indicator, start_year, end_year, base_url=base_url,
+                    etag=meta.get("etag"), last_modified=meta.get("last_modified"),
+                    session=session,
+                )
+                unchanged = validators is not None and (
+                    validators["not_modified"]
+                    or (
+                        validators["lastupdated"] is not None
+                        and validators["lastupdated"] == meta.get("lastupdated")
+                        and validators["total"] == meta.get("total")
+                    )
+                )
+                if unchanged:
+                    cache.touch(indicator, start_year, end_year)
+
+            if unchanged:
+                cached = cache.get(indicator, start_year, end_year)
+                if cached is not None:
+                    return cached.rename(columns={"value": value_col})
+        else:
+            validators = probe_indicator(
+                indicator, start_year, end_year, base_url=base_url, session=session
+            )
+
+    records = fetch_indicator_records(
+        indicator, start_year, end_year,
+        base_url=base_url, max_workers=max_workers, session=session,
+    )
+    if records is None:
+        if cache is not None:
+            stale = cache.get(indicator, start_year, end_year)
+            if stale is not None:
+                print(f"Using stale cached data for {indicator}.")
+                return stale.rename(columns={"value": value_col})
+        return None
+
+    df = _records_to_frame(records, value_col)
+    if cache is not None:
+        cache.put(
+            indicator, start_year, end_year,
+            df.rename(columns={value_col: "value"}), validators=validators,
+        )
+    return df
+
+
+def _year_windows(years) -> list:
+    """Group a collection of years into contiguous (start, end) windows."""
+    windows = []
+    for year in sorted(set(years)):
+        if windows and year == windows[-1][1] + 1:
+            windows[-1][1] = year
+        else:
+            windows.append([year, year])
+    return [tuple(window) for window in windows]
+
+
+def refresh_indicator_frame(
+    indicator: str,
+    value_col: str,
+    start_year: int,
+    end_year: int,
+    cache: IndicatorCache,
+    base_url: str = WB_API_BASE,
+    revision_window: int = DEFAULT_REVISION_WINDOW,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    session: Optional[requests.Session] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Incrementally refresh one indicator against its cached snapshot.
+
+    Only two kinds of year windows are downloaded:
+    - years of the requested range that the snapshot does not cover
+    - the last `revision_window` cached years, when the API reports a new
+      release (`lastupdated` changed), since revisions concentrate there
+
+    The downloaded windows replace the matching years of the snapshot,
+    which is stored back under the union of both year ranges; every
+    window is recorded in the cache manifest. Only a snapshot that
+    overlaps or touches the request is extended, so the union never
+    spans years that were not downloaded; otherwise the request is
+    fetched in full and cached as an entry of its own.
+
+    Returns:
+        pd.DataFrame | None: The refreshed frame restricted to the
+        requested range, or None if nothing could be loaded.
+    """
+    # 1. Pick the cached snapshot that overlaps the request the most,
+    # among those overlapping or adjacent to it
+    requested = set(range(start_year, end_year + 1))
+    snapshots = [
+        m for m in cache.entries(indicator)
+        if m["start_year"] <= end_year + 1 and m["end_year"] >= start_year - 1
+    ]
+    meta = max(
+        snapshots,
+        key=lambda m: len(requested & set(range(m["start_year"], m["end_year"] + 1))),
+        default=None,
+    )
+    if meta is None:
+        df = fetch_indicator_frame(
+            indicator, value_col, start_year, end_year, base_url=base_url,
+            cache=cache, max_workers=max_workers, session=session,
+        )
+        if df is not None:
+            cache.record_fetch(indicator, start_year, end_year, len(df), "full")
+        return df
+
+    cached_years = set(range(meta["start_year"], meta["end_year"] + 1))
+    missing = requested - cached_years
+
+    # 2. Within the TTL, a snapshot covering the request needs no network access
+    windows = []
+    validators = None
+    if missing or not cache.is_fresh(meta):
+        validators = probe_indicator(
+            indicator, start_year, end_year, base_url=base_url, session=session
+        )
+        windows += [(window, "missing") for window in _year_windows(missing)]
+        revised = (
+            validators is not None
+            and validators.get("lastupdated") != meta.get("lastupdated")
+        )
+        if revised:
+            overlap = sorted(requested & cached_years)[-revision_window:]
+            windows += [(window, "revision") for window in _year_windows(overlap)]
+
+    snapshot = cache.get(indicator, meta["start_year"], meta["end_year"])
+    if snapshot is None:
+        return None
+
+    # 3. Download the windows concurrently
+    def fetch(item) -> tuple:
+        (first, last), reason = item
+        records = fetch_indicator_records(
+            indicator, first, last, base_url=base_url, max_workers=max_workers, session=session
+        )
+        return first, last, reason, records
+
+    fetched = []
+    if windows:
+        with ThreadPoolExecutor(max_workers=len(windows)) as pool:
+            fetched = [item for item in pool.map(fetch, windows) if item[3] is not None]
+
+    # 4. Merge in place: fetched years replace the snapshot's rows
+    union_start = min(start_year, meta["start_year"])
+    union_end = max(end_year, meta["end_year"])
+    if fetched:
+        replaced = set()
+        parts = []
+        for first, last, reason, records in fetched:
+            frame = _records_to_frame(records, "value")
+            replaced.update(range(first, last + 1))
+            parts.append(frame)
+            cache.record_fetch(indicator, first, last, len(frame), reason)
+
+        snapshot = pd.concat(
+            [snapshot[~snapshot["year"].isin(replaced)]] + parts, ignore_index=True
+        ).sort_values(["region_code", "year"], ignore_index=True)
+
+        failed = len(fetched) < len(windows)
+        if failed:
+            # Keep the old snapshot's range so missing years are retried next time
+            union_start, union_end = meta["start_year"], meta["end_year"]
+            for first, last, _, _ in fetched:
+                union_start, union_end = min(union_start, first), max(union_end, last)
+        cache.put(
+            indicator, union_start, union_end, snapshot,
+            validators={"lastupdated": (validators or meta).get("lastupdated")},
+        )
+        if (union_start, union_end) != (meta["start_year"], meta["end_year"]):
+            cache.remove(indicator, meta["start_year"], meta["end_year"])
+    elif not windows and validators is not None:
+        # Revalidated, nothing changed
+        cache.touch(indicator, meta["start_year"], meta["end_year"])
+
+    in_range = snapshot["year"].between(start_year, end_year)
+    return snapshot[in_range].rename(columns={"value": value_col}).reset_index(drop=True)
+
+
 def fetch_gdp_per_capita_from_api(
-    start_year: int, 
+    start_year: int,
     end_year: int,
-    indicator: str = GDP_INDICATOR
+    indicator: str = GDP_INDICATOR,
+    base_url: str = WB_API_BASE,
+    cache: Optional[IndicatorCache] = None,
+    incremental: bool = False,
 ) -> Optional[pd.DataFrame]:
     """
     Fetch GDP per capita data (NY.GDP.PCAP.CD) from the World Bank API
     for all regions over a specified time range.
-    """
-    url = (
-        f"http://api.worldbank.org/v2/country/all/indicator/{indicator}"
-        f"?date={start_year}:{end_year}&format=json&per_page=10000"
-    )
 
+    All result pages are downloaded (see fetch_indicator_records),
+    so large year ranges are no longer truncated to the first page.
+    """
     print(f"Fetching data from World Bank API for {indicator}...")
-    
-    # 2. Make the GET request and handle errors
-    try:
-        response = requests.get(url)
-        response.raise_for_status() 
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching data from World Bank API: {e}")
+
+    # 1. Download all pages (or read them from the cache)
+    df = fetch_indicator_frame(
+        indicator, "gdp_per_capita", start_year, end_year,
+        base_url=base_url, cache=cache, incremental=incremental,
+    )
+    if df is None:
         return None
 
-    # 3. Process the JSON response (skip metadata)
-    data = response.json()
-    if len(data) < 2 or data[1] is None:
-        print("API returned no data or an unexpected format.")
+    # 2. Final check on the flattened frame
+    if df.empty:
+        print("API returned no observations for the requested range.")
         return None
 
-    records = data[1]
+    return df
+
 
-    # 4. Flatten the JSON structure and process records
+def _records_to_frame(records: list, value_col: str) -> pd.DataFrame:
+    """
+    Flatten raw World Bank API records into a long DataFrame with columns
+    region_code, region_name, year and `value_col`, dropping missing values.
+    """
     processed_records = []
     for record in records:
         if record is not None and record.get("value") is not None:
@@ -83,47 +685,273 @@ def fetch_gdp_per_capita_from_api(
                 "region_code": record.get("countryiso3code"),
                 "region_name": record["country"]["value"],
                 "year": int(record["date"]),
-                "gdp_per_capita": record["value"] 
+                value_col: record["value"]
             })
 
-    # 5. Convert to DataFrame and final initial cleanup
+    columns = ["region_code", "region_name", "year", value_col]
+    if not processed_records:
+        return pd.DataFrame(columns=columns)
+
     df = pd.DataFrame(processed_records)
-    df["gdp_per_capita"] = pd.to_numeric(df["gdp_per_capita"], errors="coerce")
-    df = df.dropna(subset=["gdp_per_capita"]) 
-    
-    return df[['region_code', 'region_name', 'year', 'gdp_per_capita']].copy() # Added .copy()
+    df[value_col] = pd.to_numeric(df[value_col], errors="coerce").astype("float64")
+    df = df.dropna(subset=[value_col])
 
+    return df[columns].copy()
 
-# --- 3. UNIFIED LOADING & FILTERING (Final function for analysis) ---
-def load_gdp_data(use_api: bool = True) -> Optional[pd.DataFrame]:
+
+def _normalize_indicators(indicators) -> dict:
+    """
+    Accept either a {column_name: indicator_code} mapping or a list of
+    indicator codes (used as column names) and return a mapping.
+    """
+    if isinstance(indicators, dict):
+        return dict(indicators)
+    return {code: code for code in indicators}
+
+
+def fetch_indicator_panel(
+    indicators,
+    start_year: int,
+    end_year: int,
+    base_url: str = WB_API_BASE,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    cache: Optional[IndicatorCache] = None,
+    incremental: bool = False,
+) -> Optional[pd.DataFrame]:
+    """
+    Fetch several indicators in parallel and merge them into one wide
+    country x year panel.
+
+    All indicators are downloaded concurrently over one pooled session.
+    The per-indicator series are then aligned on
+    (region_code, region_name, year) in a single outer join.
+
+    Args:
+        indicators (dict | list): {column_name: indicator_code}, or a list
+            of indicator codes to be used as column names.
+        start_year (int): First year of the range (inclusive).
+        end_year (int): Last year of the range (inclusive).
+        base_url (str): API root.
+        max_workers (int): Page downloads in flight per indicator.
+        cache (IndicatorCache): Optional on-disk cache, consulted per indicator.
+        incremental (bool): Only download years missing from, or revised
+            since, the cached snapshots (requires `cache`).
+
+    Returns:
+        pd.DataFrame | None: Columns region_code, region_name, year and one
+        float64 column per indicator (NaN where an indicator is missing).
+    """
+    indicators = _normalize_indicators(indicators)
+    if not indicators:
+        return None
+
+    print(f"Fetching {len(indicators)} indicators from World Bank API...")
+
+    # 1. Download every indicator concurrently over a shared connection pool
+    session = create_session(max_workers * len(indicators))
+    try:
+        def fetch(item) -> tuple:
+            column, code = item
+            frame = fetch_indicator_frame(
+                code, column, start_year, end_year, base_url=base_url,
+                cache=cache, max_workers=max_workers, session=session,
+                incremental=incremental,
+            )
+            return column, frame
+
+        with ThreadPoolExecutor(max_workers=len(indicators)) as pool:
+            results = list(pool.map(fetch, indicators.items()))
+    finally:
+        session.close()
+
+    # 2. One long frame per indicator, indexed on the panel keys
+    keys = ["region_code", "region_name", "year"]
+    series = []
+    for column, frame in results:
+        if frame is None:
+            print(f"Skipping {indicators[column]}: download failed.")
+            continue
+        series.append(frame.set_index(keys)[column])
+
+    if not series:
+        return None
+
+    # 3. Single join pass: align all indicators at once
+    panel = pd.concat(series, axis=1, join="outer").reset_index()
+    panel["year"] = panel["year"].astype("int64")
+
+    # Keep the requested column order, even for indicators that failed
+    for column in indicators:
+        if column not in panel.columns:
+            panel[column] = pd.Series(dtype="float64")
+
+    return panel[keys + list(indicators)]
+
+
+# --- 3. COMPACT SCHEMA ---
+FLOAT_DTYPES = ("float32", "float64")
+
+# Counts (not ratios) stay float64: float32 holds integers exactly only up
+# to 2**24 (~16.8M), so populations would be rounded
+COUNT_COLUMNS = ("population",)
+
+
+def compact_frame(
+    df: pd.DataFrame,
+    float_dtype: str = "float64",
+    drop_group_type: bool = False,
+) -> pd.DataFrame:
+    """
+    Convert a loaded frame to a memory-optimized schema:
+
+    - region_code, region_name (and group_type): categorical codes
+    - year: int16
+    - indicator columns: float32 or float64 (`float_dtype`), except the
+      COUNT_COLUMNS (population), which always stay float64
+    - group_type: dropped entirely if `drop_group_type` (it is constant
+      "country" after filtering)
+    """
+    if float_dtype not in FLOAT_DTYPES:
+        raise ValueError(f"float_dtype must be one of {FLOAT_DTYPES}, got '{float_dtype}'.")
+
+    out = df.drop(columns=["group_type"]) if drop_group_type and "group_type" in df else df.copy()
+
+    for column in ("region_code", "region_name", "group_type"):
+        if column in out:
+            out[column] = out[column].astype("category").cat.remove_unused_categories()
+    if "year" in out:
+        out["year"] = out["year"].astype("int16")
+
+    for column in out.select_dtypes(include="floating").columns:
+        out[column] = out[column].astype("float64" if column in COUNT_COLUMNS else float_dtype)
+
+    return out
+
+
+def memory_footprint(df: pd.DataFrame) -> dict:
+    """
+    Report the in-memory size of a frame (object strings counted deeply).
+
+    Returns:
+        dict with keys:
+            total_bytes, per_column (column -> bytes)
+    """
+    usage = df.memory_usage(deep=True, index=True)
+    return {
+        "total_bytes": int(usage.sum()),
+        "per_column": {str(col): int(size) for col, size in usage.items()},
+    }
+
+
+# --- 4. UNIFIED LOADING & FILTERING (Final function for analysis) ---
+def load_gdp_data(
+    use_api: bool = True,
+    indicators=None,
+    start_year: int = 2000,
+    end_year: int = 2020,
+    cache: Optional[IndicatorCache] = None,
+    incremental: bool = False,
+    compact: bool = True,
+    float_dtype: str = "float64",
+    drop_group_type: bool = False,
+    csv_path: str = DEFAULT_CSV_PATH,
+    fill_method: Optional[str] = None,
+    fill_limit: Optional[int] = None,
+    balanced: bool = False,
+    balanced_window: Optional[tuple] = None,
+    base_url: str = WB_API_BASE,
+    return_coverage: bool = False,
+):
     """
     Loads and cleans World Bank GDP data, either from API or local CSV.
     Filters out aggregate regions using the GroupClassifier.
+
+    Args:
+        use_api (bool): Fetch from the World Bank API (True) or the local CSV.
+        indicators (dict | list): Optional indicators to load as one wide
+            panel, e.g. DEFAULT_INDICATORS. Only supported with the API.
+        start_year (int): First year requested from the API.
+        end_year (int): Last year requested from the API.
+        cache (IndicatorCache): Optional persistent cache for API downloads.
+        incremental (bool): Refresh the cache incrementally, fetching only
+            missing or revised year windows.
+        compact (bool): Return the memory-optimized schema (see compact_frame).
+        float_dtype (str): "float32" or "float64" for indicator columns
+            (population always stays float64, see compact_frame).
+        drop_group_type (bool): Drop the constant group_type column.
+        csv_path (str): Local SDMX-style CSV used when use_api is False.
+        fill_method (str): Fill missing country-years ("linear",
+            "log_linear" or "ffill", see src/gapfill.py). Filled rows are
+            flagged in an `imputed` column (see `return_coverage`).
+        fill_limit (int): Longest gap to interpolate / years to carry forward.
+        balanced (bool): Keep, per indicator, only the countries covered in
+            every year of `balanced_window` (default: all loaded years).
+        base_url (str): API root (e.g. a FakeWorldBankServer for offline runs).
+        return_coverage (bool): Also return the per-year coverage report of
+            the gap-filling step (None when nothing was filled).
+
+    Returns:
+        pd.DataFrame | None: The cleaned frame, or None if loading failed.
+        With `return_coverage`, a (frame, coverage) tuple instead.
     """
-    
+    coverage = None
+
     # 1. DATA SOURCE: Select API or CSV
-    if use_api:
-        df = fetch_gdp_per_capita_from_api(start_year=2000, end_year=2020)
-    else:
-        df = load_gdp_per_capita_from_csv("data/worldbank_gdp_per_capita.csv")
-    
+    with stage("load.source") as s:
+        if use_api and indicators:
+            df = fetch_indicator_panel(
+                indicators, start_year=start_year, end_year=end_year,
+                base_url=base_url, cache=cache, incremental=incremental,
+            )
+        elif use_api:
+            df = fetch_gdp_per_capita_from_api(
+                start_year=start_year, end_year=end_year, base_url=base_url,
+                cache=cache, incremental=incremental,
+            )
+        else:
+            if indicators:
+                print("Note: the local CSV only contains GDP per capita; ignoring indicators.")
+            df = load_gdp_per_capita_from_csv(csv_path, chunksize=DEFAULT_CSV_CHUNKSIZE)
+        s.set_rows(None if df is None else len(df))
+
     if df is None or df.empty:
         print("Data loading failed.")
-        return None
+        return (None, None) if return_coverage else None
 
     # --- CRITICAL FILTERING STEPS (Uses src/grouping.py) ---
-    
-    # 2. Classify: Use the GroupClassifier to identify aggregates
-    classifier = GroupClassifier()
-    df["group_type"] = df["region_name"].apply(classifier.classify) 
-
-    # 3. Filter: Keep only the individual countries (tagged as 'other' by the classifier)
-    # FIX: Added .copy() for safety/no-warning guarantee
-    df = df[df["group_type"] == "other"].copy() 
-
-    # 4. Rename: Change the 'other' tag to 'country' for clarity
-    df["group_type"] = "country"
-    
+
+    # 2. Classify: Use the shared GroupClassifier to flag aggregates in one
+    #    vectorized pass (ISO3 codes first, region names as a fallback)
+    with stage("load.classify", rows=len(df)):
+        classifier = get_default_classifier()
+        is_aggregate = classifier.aggregate_mask(df["region_name"], df["region_code"])
+
+    with stage("load.filter") as s:
+        # 3. Filter: Keep only the individual countries (tagged as 'other' by the classifier)
+        # FIX: Added .copy() for safety/no-warning guarantee
+        df = df[~is_aggregate].copy()
+
+        # 4. Rename: Change the 'other' tag to 'country' for clarity
+        df["group_type"] = "country"
+        s.set_rows(len(df))
+
     # -------------------------------
 
-    return df
\ No newline at end of file
+    # 5. Optional gap-filling on the country x year grid
+    if fill_method or balanced:
+        with stage("load.fill_gaps") as s:
+            value_cols = [col for col in df.columns if col not in ("region_code", "region_name", "year", "group_type")]
+            df, coverage = fill_panel_frame(
+                df, value_cols, method=fill_method, limit=fill_limit,
+                balanced=balanced, balanced_window=balanced_window,
+            )
+            s.set_rows(len(df))
+
+    # 6. Compact schema: categoricals, int16 years, selectable float width
+    if compact:
+        with stage("load.compact", rows=len(df)):
+            df = compact_frame(df, float_dtype=float_dtype, drop_group_type=drop_group_type)
+
+    # The report is returned separately: a DataFrame in df.attrs would be
+    # deep-copied into every derived frame and breaks pd.concat
+    return (df, coverage) if return_coverage else df
@@ -1,18 +1,32 @@
-import pandas as pd
-from src.load_wb_data import load_gdp_data # CRITICAL: Import the unified loader
+# Only the pure-Python demo and the tracer are imported at startup: pandas,
+# requests and matplotlib load with the World Bank pipeline that uses them
 from src.demo_data import load_demo_data, analyze_demo_data, print_countries
-from src.analysis import analyze_worldbank_data
-from src.visualization import plot_global_gdp_trend
-from src.models import GDPRegion
+from src.instrumentation import stage, flush as flush_trace
+
+# Fixed seed so the OOP demo prints the same rows on every run
+SAMPLE_SEED = 42
 
 def show_worldbank_analysis():
     """
     Load the World Bank GDP per capita dataset using the unified loader
     (API/filtering) and execute the full analysis pipeline.
     """
-    
+    # Deferred imports, timed as their own stage
+    with stage("import_pipeline"):
+        from src.load_wb_data import load_gdp_data, memory_footprint, DEFAULT_INDICATORS # CRITICAL: Import the unified loader
+        from src.cache import IndicatorCache
+        from src.analysis import analyze_worldbank_data
+        from src.visualization import plot_global_gdp_trend
+        from src.models import GDPRegionTable
+
     # 1. Load data using the unified, filtered function (API is default)
-    df = load_gdp_data(use_api=True) # Use the correct, filtered function
+    # Downloads are cached on disk, so repeated runs only fetch new or revised years
+    # Population comes along so that global figures can be population-weighted
+    with stage("load_gdp_data") as s:
+        df = load_gdp_data(
+            use_api=True, indicators=DEFAULT_INDICATORS, cache=IndicatorCache(), incremental=True
+        ) # Use the correct, filtered function
+        s.set_rows(None if df is None else len(df))
 
     if df is None or df.empty:
         print("\nFATAL ERROR: World Bank data could not be loaded or is empty.")
@@ -20,32 +34,32 @@ def show_worldbank_analysis():
 
     print("\n\n=== WORLD BANK DATASET LOADED ===")
     print(f"Number of clean country-year observations: {len(df):,}")
-    print(f"Columns: {list(df.columns)}\n")
+    print(f"Columns: {list(df.columns)}")
+    print(f"Memory footprint: {memory_footprint(df)['total_bytes'] / 1024:,.1f} KiB\n")
 
     # 2. Run the main analysis (prints stats to terminal)
-    analyze_worldbank_data(df)
+    with stage("analyze_worldbank_data", rows=len(df)):
+        analyze_worldbank_data(df)
 
     # 3. Create and save a plot (Visualization C6)
-    plot_global_gdp_trend(df)
+    with stage("plot_global_gdp_trend", rows=len(df)):
+        plot_global_gdp_trend(df)
 
     # --- 4. OOP Demo: Build and inspect GDPRegion objects ---
-    # Sample a few rows for the demonstration
-    sample_rows = df.sample(5)
+    with stage("oop_demo", rows=len(df)):
+        # Wrap the whole frame once (zero-copy), then classify every row at once
+        table = GDPRegionTable.from_frame(df)
+        high_income = table.is_high_income()
+        print(f"\nHigh-income observations: {high_income.sum():,} of {len(table):,}")
 
-    regions = [
-        GDPRegion(
-            region_code=row.region_code,
-            region_name=row.region_name,
-            year=int(row.year),
-            gdp_per_capita=float(row.gdp_per_capita),
-        )
-        for row in sample_rows.itertuples(index=False)
-    ]
+        # Sample a few rows for the demonstration
+        sample_rows = df.sample(5, random_state=SAMPLE_SEED)
+        regions = GDPRegionTable.from_frame(sample_rows)
 
-    print("\n=== Example GDPRegion objects (OOP Demo) ===")
-    for r in regions:
-        # Uses __repr__ and is_high_income() methods
-        print(f"{r} | high income: {r.is_high_income()}")
+        print("\n=== Example GDPRegion objects (OOP Demo) ===")
+        for r in regions:
+            # Rows come back as GDPRegion objects (uses __repr__ and is_high_income())
+            print(f"{r} | high income: {r.is_high_income()}")
 
 
 def main():
@@ -72,7 +86,10 @@ def main():
         analyze_demo_data(data)
 
     # 2. Run the World Bank analysis pipeline (C3, C4, C5, C6)
-    show_worldbank_analysis()
+    #    Set WEALTH_TRACE=1 to log per-stage timings (see src/instrumentation.py)
+    with stage("show_worldbank_analysis"):
+        show_worldbank_analysis()
+    flush_trace()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,221 @@
+"""
+Memoization of analysis results keyed by a dataset version token.
+
+st.cache_data hashes every argument on every call, which for a
+DataFrame means hashing the whole frame before a (cheap) cached result
+can be returned. Here the caller passes a version token instead, e.g.
+the `Snapshot.version` of the loaded data, which changes whenever the
+data does. The data argument itself is never hashed: a result is keyed
+by (version, function, remaining arguments) only.
+
+Entries are kept in least-recently-used order and the oldest is evicted
+once `maxsize` is reached, so results of superseded versions age out on
+their own. Hit, miss and eviction counts are kept per function.
+
+Usage:
+
+    memo = VersionedMemo(maxsize=256)
+    summary = memo.call(summarize_global_trend, snapshot.version, index, "gdp_per_capita")
+    memo.stats().hit_rate
+
+Cached results are shared by every caller and must not be modified in
+place.
+"""
+
+import functools
+import threading
+from collections import Counter, OrderedDict
+from typing import Callable, NamedTuple, Optional
+
+
+DEFAULT_MAXSIZE = 256
+
+
+class MemoStats(NamedTuple):
+    """Counters of a VersionedMemo (or of one of its functions)."""
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+
+class ResultCache:
+    """
+    Unbounded, thread-safe results by key, for objects built once per
+    dataset version (GrowthEngine, ComparisonEngine): the whole cache is
+    dropped with its owner, so no eviction is needed.
+
+    As with VersionedMemo, two threads missing on the same key at once
+    may both compute it; the results are identical and the second one is
+    kept.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key, compute: Callable):
+        """Return the result stored under `key`, calling compute() on a miss."""
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+        result = compute()
+        with self._lock:
+            self._entries[key] = result
+        return result
+
+
+def _freeze(value):
+    """Hashable form of an argument (lists, dicts and sets included)."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    return value
+
+
+def _name(func: Callable) -> str:
+    return getattr(func, "__qualname__", repr(func))
+
+
+class VersionedMemo:
+    """
+    Bounded LRU cache of function results, keyed by a dataset version.
+
+    Thread-safe (Streamlit runs each session in its own thread). Two
+    threads missing on the same key at once may both compute it; the
+    results are identical and the second one is kept.
+
+    Args:
+        maxsize (int): Most entries kept before the least recently used
+            one is evicted.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, got {maxsize}.")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = Counter()
+        self._misses = Counter()
+        self._evictions = Counter()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def call(self, func: Callable, version, data, *args, **kwargs):
+        """
+        Return func(data, *args, **kwargs), computed once per version.
+
+        Args:
+            func (Callable): Function taking the dataset as first argument.
+            version (hashable): Token identifying the dataset, e.g.
+                Snapshot.version; it must change whenever `data` does.
+            data: The dataset (DataFrame, AnalysisIndex, ...), not hashed.
+            *args, **kwargs: Remaining arguments, part of the key.
+
+        Returns:
+            The (possibly cached) result.
+        """
+        key = (version, func, _freeze(args), _freeze(kwargs))
+        try:
+            hash(key)
+        except TypeError as e:
+            raise TypeError(f"Unhashable argument for {_name(func)}: {e}") from None
+
+        name = _name(func)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits[name] += 1
+                return self._entries[key]
+            self._misses[name] += 1
+
+        result = func(data, *args, **kwargs)
+
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                evicted, _ = self._entries.popitem(last=False)
+                self._evictions[_name(evicted[1])] += 1
+        return result
+
+    def wrap(self, func: Callable) -> Callable:
+        """
+        A memoized version of `func`, called as wrapped(version, data, *args, **kwargs).
+        """
+        @functools.wraps(func)
+        def wrapped(version, data, *args, **kwargs):
+            return self.call(func, version, data, *args, **kwargs)
+        return wrapped
+
+    def invalidate(self, version=None) -> int:
+        """
+        Drop the entries of one version (or every entry if None).
+        Counters are kept.
+
+        Returns:
+            int: Number of entries dropped.
+        """
+        with self._lock:
+            if version is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                return dropped
+            stale = [key for key in self._entries if key[0] == version]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits.clear()
+            self._misses.clear()
+            self._evictions.clear()
+
+    def stats(self, func: Optional[Callable] = None) -> MemoStats:
+        """
+        Hit / miss / eviction counts, for one function or overall.
+
+        Returns:
+            MemoStats: size counts the entries of `func` only, if given.
+        """
+        with self._lock:
+            if func is None:
+                return MemoStats(
+                    sum(self._hits.values()), sum(self._misses.values()),
+                    sum(self._evictions.values()), len(self._entries), self.maxsize,
+                )
+            name = _name(func)
+            size = sum(1 for key in self._entries if key[1] is func)
+            return MemoStats(
+                self._hits[name], self._misses[name], self._evictions[name], size, self.maxsize
+            )
+
+    def stats_by_function(self) -> dict:
+        """{function name: MemoStats} for every function called so far."""
+        with self._lock:
+            names = set(self._hits) | set(self._misses)
+            sizes = Counter(_name(key[1]) for key in self._entries)
+            return {
+                name: MemoStats(
+                    self._hits[name], self._misses[name], self._evictions[name],
+                    sizes[name], self.maxsize,
+                )
+                for name in sorted(names)
+            }
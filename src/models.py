@@ -1,3 +1,7 @@
+import numpy as np
+import pandas as pd
+
+
 class GDPRegion:
     """
     A simple class representing a region's GDP per capita entry.
@@ -9,6 +13,9 @@ class GDPRegion:
         gdp_per_capita (float)
     """
 
+    # No per-instance __dict__: instances stay small when created in bulk
+    __slots__ = ("region_code", "region_name", "year", "gdp_per_capita")
+
     def __init__(self, region_code: str, region_name: str, year: int, gdp_per_capita: float):
         self.region_code = region_code
         self.region_name = region_name
@@ -31,3 +38,103 @@ class GDPRegion:
         return (f"GDPRegion(region='{self.region_name}', "
                 f"year={self.year}, "
                 f"gdp_per_capita={self.gdp_per_capita})")
+
+
+class GDPRegionTable:
+    """
+    A struct-of-arrays collection of GDPRegion entries.
+
+    Each attribute is one column buffer (NumPy array, or pandas Categorical
+    for region labels) instead of one Python object per row, so bulk
+    operations such as is_high_income() run vectorized. Individual rows
+    are materialized as GDPRegion objects only when accessed.
+
+    Attributes:
+        region_code (np.ndarray | pd.Categorical)
+        region_name (np.ndarray | pd.Categorical)
+        year (np.ndarray)
+        gdp_per_capita (np.ndarray)
+    """
+
+    __slots__ = ("region_code", "region_name", "year", "gdp_per_capita")
+
+    def __init__(self, region_code, region_name, year, gdp_per_capita):
+        self.region_code = region_code
+        self.region_name = region_name
+        self.year = np.asarray(year)
+        self.gdp_per_capita = np.asarray(gdp_per_capita)
+
+        n = len(self.gdp_per_capita)
+        if not (len(region_code) == len(region_name) == len(self.year) == n):
+            raise ValueError("All GDPRegionTable columns must have the same length.")
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, value_col: str = "gdp_per_capita") -> "GDPRegionTable":
+        """
+        Build a table over the loader's DataFrame without copying its buffers.
+
+        Numeric columns are wrapped as NumPy views; categorical region
+        columns keep their codes + categories (no string materialization).
+        """
+        return cls(
+            region_code=_column_buffer(df["region_code"]),
+            region_name=_column_buffer(df["region_name"]),
+            year=df["year"].to_numpy(copy=False),
+            gdp_per_capita=df[value_col].to_numpy(copy=False),
+        )
+
+    def __len__(self) -> int:
+        return len(self.gdp_per_capita)
+
+    def __getitem__(self, key):
+        """
+        Integer -> GDPRegion row; slice, index array or boolean mask ->
+        a GDPRegionTable over the selected rows.
+        """
+        if isinstance(key, (int, np.integer)):
+            return GDPRegion(
+                region_code=self.region_code[key],
+                region_name=self.region_name[key],
+                year=int(self.year[key]),
+                gdp_per_capita=float(self.gdp_per_capita[key]),
+            )
+        return GDPRegionTable(
+            self.region_code[key],
+            self.region_name[key],
+            self.year[key],
+            self.gdp_per_capita[key],
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def is_high_income(self, threshold: float = 40000) -> np.ndarray:
+        """
+        Vectorized GDPRegion.is_high_income over every row.
+
+        Returns:
+            np.ndarray: Boolean mask, True where GDP per capita >= threshold.
+        """
+        return self.gdp_per_capita >= threshold
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the table as a DataFrame with the loader's column names."""
+        return pd.DataFrame(
+            {
+                "region_code": self.region_code,
+                "region_name": self.region_name,
+                "year": self.year,
+                "gdp_per_capita": self.gdp_per_capita,
+            }
+        )
+
+    def __repr__(self):
+        return f"GDPRegionTable(rows={len(self)})"
+
+
+def _column_buffer(series: pd.Series):
+    """Return the column's backing array without copying it."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.array
+    return series.to_numpy(copy=False)
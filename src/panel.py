@@ -0,0 +1,144 @@
+"""
+Dense country x year matrix of one indicator.
+
+The long loader frame (one row per country-year) is pivoted once into a
+float64 NumPy matrix with one row per country and one column per year of
+the full year range (missing observations are NaN). Analytics that need
+every country at once (growth rates, rolling windows, percentile ranks,
+peer comparisons) then run as whole-matrix NumPy operations instead of
+per-country groupby loops.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+class PanelMatrix:
+    """
+    One indicator as a (countries x years) matrix.
+
+    Values are first reduced to one mean per (region, year), as
+    AnalysisIndex does.
+
+    Attributes:
+        value_col (str): Indicator the matrix holds.
+        names (np.ndarray): Row labels (country names, sorted).
+        codes (np.ndarray | None): ISO3 code of each row, if the frame has
+            a region_code column.
+        years (np.ndarray): Column labels: every year from the first to the
+            last observed one.
+        values (np.ndarray): float64 matrix of shape (len(names), len(years)).
+        row_of (dict): Row label -> row number.
+    """
+
+    def __init__(
+        self,
+        names: np.ndarray,
+        years: np.ndarray,
+        values: np.ndarray,
+        value_col: str = "gdp_per_capita",
+        codes: Optional[np.ndarray] = None,
+    ):
+        self.names = np.asarray(names, dtype=object)
+        self.years = np.asarray(years, dtype=np.int64)
+        self.values = np.asarray(values, dtype=np.float64)
+        self.value_col = value_col
+        self.codes = None if codes is None else np.asarray(codes, dtype=object)
+        self.row_of = {name: i for i, name in enumerate(self.names)}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, value_col: str = "gdp_per_capita") -> "PanelMatrix":
+        """Pivot a long loader frame (region_name, year, value_col) in one scatter."""
+        grouped = (
+            df.groupby(["region_name", "year"], sort=True, observed=True)[value_col]
+            .mean()
+            .dropna()
+        )
+        if grouped.empty:
+            return cls(np.array([], dtype=object), np.array([], dtype=np.int64),
+                       np.empty((0, 0)), value_col)
+
+        name_idx, names = pd.factorize(grouped.index.get_level_values("region_name"), sort=True)
+        row_years = grouped.index.get_level_values("year").to_numpy(dtype=np.int64)
+        first_year = int(row_years.min())
+        years = np.arange(first_year, int(row_years.max()) + 1, dtype=np.int64)
+
+        values = np.full((len(names), len(years)), np.nan)
+        values[name_idx, row_years - first_year] = grouped.to_numpy(dtype=np.float64)
+
+        codes = None
+        if "region_code" in df:
+            code_of = dict(zip(df["region_name"].astype(object), df["region_code"].astype(object)))
+            codes = np.array([code_of.get(name) for name in names], dtype=object)
+
+        return cls(np.asarray(names, dtype=object), years, values, value_col, codes)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def shape(self) -> tuple:
+        return self.values.shape
+
+    def year_col(self, year: int) -> int:
+        """Column number of a year (IndexError if outside the range)."""
+        col = int(year) - int(self.years[0]) if len(self.years) else -1
+        if not 0 <= col < len(self.years):
+            raise IndexError(f"Year {year} is outside {self.years[0]}-{self.years[-1]}.")
+        return col
+
+    def row(self, name: str) -> pd.Series:
+        """Values of one country, indexed by year (NaN where missing)."""
+        return pd.Series(
+            self.values[self.row_of[name]],
+            index=pd.Index(self.years, name="year"),
+            name=self.value_col,
+        )
+
+    def wrap(self, values: np.ndarray) -> pd.DataFrame:
+        """Label a matrix of the same shape: countries as rows, years as columns."""
+        return pd.DataFrame(
+            values,
+            index=pd.Index(self.names, name="region_name"),
+            columns=pd.Index(self.years, name="year"),
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """The matrix as a labelled DataFrame."""
+        return self.wrap(self.values)
+
+    def rollup(self, groups: np.ndarray, include_world: bool = True) -> "PanelMatrix":
+        """
+        Average the rows per group (e.g. World Bank region or income level).
+
+        Args:
+            groups (np.ndarray): Group label of every row (None/NaN rows are
+                left out of every group but still count for "World").
+            include_world (bool): Add a "World" row averaging every country.
+
+        Returns:
+            PanelMatrix: One row per group, same years.
+        """
+        labels = pd.Series(groups, dtype=object)
+        known = labels.notna().to_numpy()
+        group_idx, group_names = pd.factorize(labels[known], sort=True)
+
+        observed = ~np.isnan(self.values)
+        filled = np.where(observed, self.values, 0.0)
+
+        sums = np.zeros((len(group_names), len(self.years)))
+        counts = np.zeros((len(group_names), len(self.years)))
+        np.add.at(sums, group_idx, filled[known])
+        np.add.at(counts, group_idx, observed[known])
+
+        names = list(group_names)
+        if include_world:
+            sums = np.vstack([sums, filled.sum(axis=0)])
+            counts = np.vstack([counts, observed.sum(axis=0)])
+            names.append("World")
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(counts > 0, sums / counts, np.nan)
+        return PanelMatrix(np.asarray(names, dtype=object), self.years, means, self.value_col)
@@ -0,0 +1,118 @@
+"""
+Lazy, read-only query layer over a loaded panel for the dashboard.
+
+The panel is sorted once by (region_name, year) when the query object is
+built (unless it already is, e.g. a shared panel mapped from disk, which
+is then used as-is instead of being copied); afterwards every lookup is a
+positional slice of that sorted frame:
+
+- country(name): O(1) dictionary lookup of the country's row range
+- page(n): only the rows of the visible table page
+
+so widget interactions never copy or rescan the whole dataset.
+"""
+
+import math
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+SORT_KEYS = ["region_name", "year"]
+
+
+def _sort_codes(series: pd.Series) -> np.ndarray:
+    """Values in the order sort_values uses (category order for categoricals)."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy()
+    return series.to_numpy()
+
+
+def is_sorted(df: pd.DataFrame, keys: list = SORT_KEYS) -> bool:
+    """True if `df` is already in the order of df.sort_values(keys), checked in one pass."""
+    if len(df) < 2:
+        return True
+    in_order = np.ones(len(df) - 1, dtype=bool)   # rows i, i+1 ordered on the keys so far
+    tied = np.ones(len(df) - 1, dtype=bool)       # rows i, i+1 equal on the keys so far
+    for key in keys:
+        values = _sort_codes(df[key])
+        previous, current = values[:-1], values[1:]
+        in_order &= ~tied | (previous <= current)
+        tied &= previous == current
+        if not in_order.all():
+            return False
+    return True
+
+
+def sort_panel(df: pd.DataFrame, keys: list = SORT_KEYS) -> pd.DataFrame:
+    """
+    Return `df` sorted by `keys` with a fresh RangeIndex. A frame that is
+    already sorted is not copied: the result shares its column buffers.
+    """
+    if not is_sorted(df, keys):
+        return df.sort_values(keys, ignore_index=True)
+    out = df.copy(deep=False)
+    out.index = pd.RangeIndex(len(out))
+    return out
+
+
+class PanelQuery:
+    """
+    Country index and paginated views over a country-level panel.
+
+    Args:
+        df (pd.DataFrame): Frame returned by the loader.
+        group_type (str): Keep only rows of this group_type (if the column
+            exists and holds other values too).
+
+    Attributes:
+        frame (pd.DataFrame): The filtered frame, sorted by region and year.
+        countries (list[str]): Sorted country names.
+    """
+
+    def __init__(self, df: pd.DataFrame, group_type: Optional[str] = "country"):
+        if group_type and "group_type" in df and (df["group_type"] != group_type).any():
+            df = df[df["group_type"] == group_type]
+
+        # One sort, done once per dataset version (none for a sorted frame)
+        self.frame = sort_panel(df)
+
+        # Boundaries from the category codes, so no object array of the
+        # names is materialized; names are read at the run starts only
+        codes = _sort_codes(self.frame["region_name"])
+        n = len(codes)
+        if n:
+            starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        else:
+            starts = np.array([], dtype=int)
+        stops = np.r_[starts[1:], n].astype(int)
+        names = self.frame["region_name"].iloc[starts].to_numpy()
+
+        self._slices = {
+            name: (int(start), int(stop)) for name, start, stop in zip(names, starts, stops)
+        }
+        self.countries = list(self._slices)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def country(self, name: str, columns: Optional[list] = None) -> pd.DataFrame:
+        """Rows of one country, sorted by year (empty if unknown)."""
+        start, stop = self._slices.get(name, (0, 0))
+        view = self.frame.iloc[start:stop]
+        return view if columns is None else view.loc[:, columns]
+
+    def n_pages(self, page_size: int) -> int:
+        """Number of pages of `page_size` rows (at least 1)."""
+        return max(1, math.ceil(len(self.frame) / page_size))
+
+    def page(self, page_no: int, page_size: int = 50, columns: Optional[list] = None) -> pd.DataFrame:
+        """
+        Rows of one table page (1-based `page_no`, clamped to the valid range).
+        Only these rows are materialized.
+        """
+        page_no = min(max(1, page_no), self.n_pages(page_size))
+        start = (page_no - 1) * page_size
+        view = self.frame.iloc[start:start + page_size]
+        return view if columns is None else view.loc[:, columns]
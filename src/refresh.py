@@ -0,0 +1,133 @@
+"""
+Serve-stale-while-revalidate loading for long-running processes
+(e.g. the Streamlit dashboard).
+
+Readers always get the last good snapshot immediately; when it is older
+than `max_age_seconds`, one background thread reloads the data and swaps
+the snapshot in atomically. A single-flight lock guarantees at most one
+refresh per process, however many sessions ask at the same time.
+"""
+
+import threading
+import time
+from typing import Callable, NamedTuple, Optional
+
+import pandas as pd
+
+
+class Snapshot(NamedTuple):
+    """An immutable loaded dataset plus when it was loaded."""
+    data: pd.DataFrame
+    loaded_at: float
+    version: int
+
+
+class BackgroundRefresher:
+    """
+    Hold the current Snapshot of a dataset and refresh it in the background.
+
+    Args:
+        loader: Function returning a fresh DataFrame (or None on failure).
+            Called from the background thread.
+        max_age_seconds: Age after which a read triggers a refresh.
+        initial_loader: Optional cheaper function used for the very first
+            load (e.g. reading the last on-disk snapshot without network
+            access). Defaults to `loader`.
+        initial_loaded_at: Optional function returning when the data of
+            `initial_loader` was actually fetched (e.g. the cache entries'
+            fetched_at), so an old on-disk snapshot is refreshed right
+            away. Without it, data from a separate `initial_loader` counts
+            as loaded at time 0 (stale).
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Optional[pd.DataFrame]],
+        max_age_seconds: float = 60 * 60,
+        initial_loader: Optional[Callable[[], Optional[pd.DataFrame]]] = None,
+        initial_loaded_at: Optional[Callable[[], float]] = None,
+    ):
+        self.loader = loader
+        self.initial_loader = initial_loader or loader
+        self.max_age_seconds = max_age_seconds
+        if initial_loaded_at is None:
+            initial_loaded_at = time.time if initial_loader is None else (lambda: 0.0)
+        self.initial_loaded_at = initial_loaded_at
+
+        self._snapshot: Optional[Snapshot] = None
+        self._swap_lock = threading.Lock()      # guards _snapshot
+        self._init_lock = threading.Lock()      # first load happens once
+        self._flight_lock = threading.Lock()    # single-flight refresh
+        self._thread: Optional[threading.Thread] = None
+
+    # ----- reading -----
+
+    def get(self) -> Optional[Snapshot]:
+        """
+        Return the current snapshot without waiting for the network.
+
+        Only the very first call of the process blocks (on initial_loader);
+        afterwards a stale snapshot is returned as-is and a background
+        refresh is started.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._init_lock:
+                if self._snapshot is None:
+                    self._swap(self.initial_loader(), self.initial_loaded_at())
+            snapshot = self._snapshot
+            if snapshot is None:
+                return None
+
+        if self.is_stale(snapshot):
+            self.refresh_async()
+        return snapshot
+
+    def is_stale(self, snapshot: Optional[Snapshot] = None) -> bool:
+        """True if the (current) snapshot is older than max_age_seconds."""
+        snapshot = snapshot or self._snapshot
+        return snapshot is None or time.time() - snapshot.loaded_at > self.max_age_seconds
+
+    @property
+    def refreshing(self) -> bool:
+        """True while a background refresh is running."""
+        return self._flight_lock.locked()
+
+    # ----- refreshing -----
+
+    def refresh_async(self) -> bool:
+        """
+        Start a background refresh unless one is already running.
+
+        Returns:
+            bool: True if this call started a refresh.
+        """
+        if not self._flight_lock.acquire(blocking=False):
+            return False
+
+        self._thread = threading.Thread(target=self._refresh, name="data-refresh", daemon=True)
+        self._thread.start()
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until the running refresh (if any) has finished."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _refresh(self) -> None:
+        try:
+            self._swap(self.loader())
+        except Exception as e:
+            # Keep serving the last good snapshot
+            print(f"Background refresh failed: {e}")
+        finally:
+            self._flight_lock.release()
+
+    def _swap(self, data: Optional[pd.DataFrame], loaded_at: Optional[float] = None) -> None:
+        """Replace the snapshot with `data` (loaded now by default), unless the load failed."""
+        if data is None or data.empty:
+            return
+        loaded_at = time.time() if loaded_at is None else loaded_at
+        with self._swap_lock:
+            version = self._snapshot.version + 1 if self._snapshot else 1
+            self._snapshot = Snapshot(data=data, loaded_at=loaded_at, version=version)
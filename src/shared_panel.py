@@ -0,0 +1,265 @@
+"""
+One loaded panel, shared by every process on the machine.
+
+Instead of each Streamlit server process or batch worker loading (and
+holding) its own copy of the cleaned `load_gdp_data` frame, one loader
+process publishes it as an uncompressed Arrow IPC file, and readers map
+that file into memory:
+
+- numeric columns and categorical codes are read zero-copy from the
+  mapping, so every process shares the same physical pages (the OS page
+  cache) instead of owning a private copy; only boolean columns (such as
+  `imputed`) are converted per process
+- every publish writes a new `panel-<version>.arrow` file, then replaces
+  the `current.json` pointer atomically (os.replace); readers poll the
+  pointer and switch to the new version in one assignment, while frames
+  of the previous version stay valid for as long as they are referenced
+- the last `keep` versions are kept on disk, older ones are removed
+- the panel is written sorted by (region_name, year), the order the
+  dashboard's PanelQuery needs, so readers never re-sort (and copy) it
+
+There must be a single publisher per directory. Run one with:
+
+    python -m src.shared_panel --dir data/shared --interval 3600
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from src.query import SORT_KEYS, sort_panel
+from src.refresh import Snapshot
+
+
+DEFAULT_SHARED_DIR = "data/shared"
+POINTER_FILENAME = "current.json"
+DEFAULT_KEEP_VERSIONS = 2
+DEFAULT_POLL_SECONDS = 1.0
+DEFAULT_PUBLISH_INTERVAL = 60 * 60
+
+PANEL_FILE_RE = re.compile(r"^panel-(\d+)\.arrow$")
+
+
+def _panel_filename(version: int) -> str:
+    return f"panel-{version:06d}.arrow"
+
+
+def _to_arrow(df: pd.DataFrame) -> pa.Table:
+    """
+    Convert a loader frame to an Arrow table that maps back zero-copy:
+    strings become dictionary columns, and NaN stays a float value
+    rather than a null (nulls would force a copy on every read).
+    """
+    columns = {}
+    for name in df.columns:
+        series = df[name]
+        if series.dtype == object:
+            series = series.astype("category")
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            columns[name] = pa.DictionaryArray.from_arrays(
+                pa.array(codes, mask=codes < 0),
+                pa.array(series.cat.categories.to_numpy(dtype=object)),
+            )
+        elif isinstance(series.dtype, np.dtype):
+            columns[name] = pa.array(series.to_numpy(), from_pandas=False)
+        else:
+            # Pandas extension dtypes (e.g. nullable Int64)
+            columns[name] = pa.array(series, from_pandas=True)
+    return pa.table(columns)
+
+
+def read_pointer(directory: str = DEFAULT_SHARED_DIR) -> Optional[dict]:
+    """The current version's metadata, or None if nothing was published yet."""
+    try:
+        with open(os.path.join(directory, POINTER_FILENAME)) as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+class PanelPublisher:
+    """
+    Publish new versions of a panel into a shared directory.
+
+    Attributes:
+        directory (str): Directory holding the panel files and the pointer.
+        keep (int): Number of most recent versions kept on disk.
+    """
+
+    def __init__(self, directory: str = DEFAULT_SHARED_DIR, keep: int = DEFAULT_KEEP_VERSIONS):
+        self.directory = directory
+        self.keep = max(1, keep)
+        os.makedirs(directory, exist_ok=True)
+
+    def publish(self, df: pd.DataFrame) -> int:
+        """
+        Write `df` (sorted by region and year) as the next version and
+        switch the pointer to it.
+
+        Returns:
+            int: The published version.
+        """
+        current = read_pointer(self.directory)
+        version = current["version"] + 1 if current else 1
+        filename = _panel_filename(version)
+        path = os.path.join(self.directory, filename)
+
+        # Sorted once here rather than in every reader; one record batch,
+        # so every column is one contiguous buffer
+        if all(key in df for key in SORT_KEYS):
+            df = sort_panel(df)
+        table = _to_arrow(df.reset_index(drop=True))
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        feather.write_feather(table, tmp_path, compression="uncompressed", chunksize=max(len(df), 1))
+        os.replace(tmp_path, path)
+
+        pointer = {
+            "version": version,
+            "file": filename,
+            "published_at": time.time(),
+            "rows": len(df),
+            "columns": list(map(str, df.columns)),
+            "bytes": os.path.getsize(path),
+        }
+        pointer_path = os.path.join(self.directory, POINTER_FILENAME)
+        tmp_pointer = f"{pointer_path}.{os.getpid()}.tmp"
+        with open(tmp_pointer, "w") as file:
+            json.dump(pointer, file)
+        os.replace(tmp_pointer, pointer_path)
+
+        self._remove_old_versions(version)
+        return version
+
+    def _remove_old_versions(self, version: int) -> None:
+        for filename in os.listdir(self.directory):
+            match = PANEL_FILE_RE.match(filename)
+            if match and int(match.group(1)) <= version - self.keep:
+                try:
+                    # Processes that still map the file keep their pages (POSIX)
+                    os.remove(os.path.join(self.directory, filename))
+                except OSError:
+                    # Still mapped on Windows: retried on the next publish
+                    pass
+
+
+class SharedPanelReader:
+    """
+    Attach to the latest published panel and follow new versions.
+
+    get() has the same contract as BackgroundRefresher.get(), so a reader
+    can replace the refresher in the dashboard: it returns a Snapshot whose
+    version changes whenever a new panel is published. The frame is backed
+    by the read-only mapping and must not be modified in place.
+
+    Args:
+        directory (str): Directory the publisher writes to.
+        poll_seconds (float): Minimum time between two reads of the pointer.
+    """
+
+    def __init__(self, directory: str = DEFAULT_SHARED_DIR, poll_seconds: float = DEFAULT_POLL_SECONDS):
+        self.directory = directory
+        self.poll_seconds = poll_seconds
+        self._snapshot: Optional[Snapshot] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        """Version currently attached (0 if none)."""
+        return self._snapshot.version if self._snapshot else 0
+
+    def get(self) -> Optional[Snapshot]:
+        """
+        Return the current snapshot, switching to a newer published version
+        if the pointer has changed (checked at most every poll_seconds).
+
+        Returns:
+            Snapshot | None: None if nothing has been published yet.
+        """
+        if time.monotonic() - self._checked_at >= self.poll_seconds:
+            self.check()
+        return self._snapshot
+
+    def check(self) -> bool:
+        """
+        Read the pointer now and attach to a newer version if there is one.
+
+        Returns:
+            bool: True if the reader switched to a new version.
+        """
+        with self._lock:
+            self._checked_at = time.monotonic()
+            # A version can be removed between reading the pointer and
+            # opening its file if the publisher is fast: read it again
+            for _ in range(3):
+                pointer = read_pointer(self.directory)
+                if pointer is None or pointer["version"] == self.version:
+                    return False
+                try:
+                    table = feather.read_table(
+                        os.path.join(self.directory, pointer["file"]), memory_map=True
+                    )
+                except (FileNotFoundError, OSError):
+                    continue
+
+                data = table.to_pandas(split_blocks=True, self_destruct=False)
+                self._snapshot = Snapshot(
+                    data=data, loaded_at=pointer["published_at"], version=pointer["version"]
+                )
+                return True
+            return False
+
+
+# --- Publisher process ---
+
+def load_and_publish(publisher: PanelPublisher, offline: bool = False) -> Optional[int]:
+    """Load the default multi-indicator panel and publish it (None on failure)."""
+    from src.cache import IndicatorCache
+    from src.load_wb_data import DEFAULT_INDICATORS, load_gdp_data
+
+    cache = IndicatorCache(ttl_seconds=float("inf")) if offline else IndicatorCache()
+    df = load_gdp_data(use_api=True, indicators=DEFAULT_INDICATORS, cache=cache, compact=True)
+    if df is None or df.empty:
+        print("Nothing to publish: the panel could not be loaded.")
+        return None
+    version = publisher.publish(df)
+    print(f"Published version {version}: {len(df):,} rows to {publisher.directory}")
+    return version
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.shared_panel",
+        description="Load the World Bank panel and publish it for SharedPanelReader processes.",
+    )
+    parser.add_argument("--dir", default=DEFAULT_SHARED_DIR, help="Shared panel directory")
+    parser.add_argument("--interval", type=float, default=DEFAULT_PUBLISH_INTERVAL,
+                        help="Seconds between two publishes")
+    parser.add_argument("--once", action="store_true", help="Publish once and exit (e.g. from cron)")
+    parser.add_argument("--offline", action="store_true",
+                        help="Publish the on-disk cache however old, without revalidating")
+    parser.add_argument("--keep", type=int, default=DEFAULT_KEEP_VERSIONS,
+                        help="Versions kept on disk")
+    args = parser.parse_args(argv)
+
+    publisher = PanelPublisher(args.dir, keep=args.keep)
+    while True:
+        version = load_and_publish(publisher, offline=args.offline)
+        if args.once:
+            return 0 if version else 1
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,39 +1,333 @@
 """
 Visualization functions for the Wealth of Nations project.
 
-This module contains all plotting logic.
+This module contains all plotting logic. Figures are drawn with the
+non-interactive Agg canvas and never registered with pyplot, so repeated
+calls do not accumulate open figures. matplotlib itself is imported on
+the first figure (see _agg_figure): importing this module, e.g. for
+build_chart_jobs or chart_hash, does not load it and never selects a
+GUI backend.
+
+Batch rendering (render_charts):
+
+- one chart per country and per World Bank region, each against the
+  world average
+- charts are split across a process pool; every worker builds a single
+  figure and only updates its line data and labels per chart
+- a manifest in the output directory maps each PNG to the hash of the
+  data it was drawn from, so unchanged charts are skipped
+- file names are slugs of the country/region names; names that slug to
+  the same file get their code appended, so no chart overwrites another
 """
 
-import matplotlib.pyplot as plt
+import hashlib
+import json
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
 import pandas as pd
 
+from src.analysis import AnalysisIndex, compute_global_yearly_average
+from src.country_catalog import load_country_catalog
+from src.query import PanelQuery
+
+
+DEFAULT_TREND_PATH = "data/global_gdp_trend.png"
+DEFAULT_CHART_DIR = "data/charts"
+MANIFEST_FILENAME = "render_manifest.json"
+
+# Bump when the chart layout changes, so every cached PNG is redrawn
+CHART_STYLE_VERSION = "1"
+CHART_FIGSIZE = (8, 4)
+CHART_DPI = 100
+
+
+def _agg_figure(figsize: tuple = CHART_FIGSIZE, dpi: Optional[int] = None):
+    """A Figure bound to a headless Agg canvas: no pyplot state, freed with the object."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
 
-def plot_global_gdp_trend(df: pd.DataFrame) -> None:
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def plot_global_gdp_trend(
+    df: pd.DataFrame,
+    output_path: str = DEFAULT_TREND_PATH,
+    value_col: str = "gdp_per_capita",
+    title: Optional[str] = None,
+    ylabel: Optional[str] = None,
+) -> str:
     """
     Plot the global average GDP per capita over time
-    and save the figure to the 'data/' directory.
+    and save the figure to `output_path`.
 
     Args:
         df (pd.DataFrame): Cleaned GDP per capita DataFrame,
-            with at least 'year' and 'gdp_per_capita' columns.
+            with at least 'year' and `value_col` columns
+            (or a prebuilt AnalysisIndex).
+        output_path (str): Where to write the PNG.
+        value_col (str): Indicator column to plot.
+        title, ylabel (str): Labels for indicators other than GDP per capita.
+
+    Returns:
+        str: The path of the saved figure.
     """
     # Compute global average per year
-    yearly_avg = df.groupby("year")["gdp_per_capita"].mean()
+    yearly_avg = compute_global_yearly_average(df, value_col)
 
-# Use Object-Oriented Interface (Creation of fig and ax)
-    fig, ax = plt.subplots(figsize=(8, 4))
+    fig = _agg_figure()
+    ax = fig.add_subplot()
 
     ax.set_xticks(yearly_avg.index)
-    plt.xticks(rotation=45)
-    
-    # Plotting is done on the ax object
+    ax.tick_params(axis="x", labelrotation=45)
+
     ax.plot(yearly_avg.index, yearly_avg.values)
-    ax.set_title("Global Average GDP per Capita Over Time")
+    ax.set_title(title or "Global Average GDP per Capita Over Time")
     ax.set_xlabel("Year")
-    ax.set_ylabel("GDP per capita (USD)")
-    
-    plt.tight_layout()
+    ax.set_ylabel(ylabel or "GDP per capita (USD)")
+
+    fig.tight_layout()
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    fig.savefig(output_path)
+    return output_path
+
+
+# --- Batch rendering ---
+
+class ChartRenderer:
+    """
+    One reusable figure for line charts of a series against a reference.
+
+    The figure, axes, lines and legend are created once; render() only
+    swaps the line data, title and limits before saving.
+    """
+
+    def __init__(self, ylabel: str, reference_label: str = "World average"):
+        from matplotlib.ticker import MaxNLocator
+
+        self.fig = _agg_figure(dpi=CHART_DPI)
+        self.ax = self.fig.add_subplot()
+
+        (self.line,) = self.ax.plot([], [], linewidth=2)
+        (self.reference,) = self.ax.plot([], [], linestyle="--", color="grey")
+        self.ax.set_xlabel("Year")
+        self.ax.set_ylabel(ylabel)
+        self.ax.xaxis.set_major_locator(MaxNLocator(integer=True))
+        self.ax.grid(alpha=0.3)
+        self.legend = self.ax.legend(
+            [self.line, self.reference], ["", reference_label], loc="upper left"
+        )
+        # Fixed margins instead of tight_layout() on every chart
+        self.fig.subplots_adjust(left=0.12, right=0.97, top=0.9, bottom=0.13)
+
+    def render(self, job: dict, path: str) -> None:
+        """Draw one job (see build_chart_jobs) and save it to `path`."""
+        years, values, reference = job["years"], job["values"], job["reference"]
+
+        self.line.set_data(years, values)
+        self.legend.get_texts()[0].set_text(job["label"])
+        self.reference.set_data(years, reference)
+        self.ax.set_title(job["title"])
+
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.fig.savefig(path)
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_") or "unnamed"
+
+
+def _unique_slugs(names, codes: Optional[dict] = None) -> dict:
+    """
+    File-name slug for every name. Names sharing a slug ("Korea, Rep." and
+    "Korea Rep") get their code appended, or a counter if they have none.
+    """
+    slugs = {name: _slug(name) for name in names}
+    counts = Counter(slugs.values())
+    taken = set()
+    for name in names:
+        slug = slugs[name]
+        code = (codes or {}).get(name)
+        if counts[slug] > 1 and code:
+            slug = f"{slug}_{_slug(code)}"
+        base, n = slug, 2
+        while slug in taken:
+            slug, n = f"{base}_{n}", n + 1
+        taken.add(slug)
+        slugs[name] = slug
+    return slugs
+
+
+def chart_hash(job: dict) -> str:
+    """Content hash of everything a chart is drawn from."""
+    digest = hashlib.sha256(CHART_STYLE_VERSION.encode())
+    for field in ("title", "label", "ylabel"):
+        digest.update(job[field].encode("utf-8") + b"\0")
+    for field in ("years", "values", "reference"):
+        digest.update(np.ascontiguousarray(job[field], dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def build_chart_jobs(
+    df: pd.DataFrame,
+    value_col: str = "gdp_per_capita",
+    kinds: tuple = ("country", "region"),
+) -> list:
+    """
+    Build one chart job per country and/or per World Bank region.
+
+    Each job is a small picklable dict (filename, titles and the year,
+    value and world-average arrays), so it can be shipped to a worker
+    process without the source frame.
+
+    Args:
+        df (pd.DataFrame): Country-level frame returned by the loader.
+        value_col (str): Indicator column to chart.
+        kinds (tuple): Any of "country" and "region".
+
+    Returns:
+        list[dict]: The chart jobs.
+    """
+    label = value_col.replace("_", " ")
+    world = compute_global_yearly_average(AnalysisIndex(df, value_col), value_col)
+    jobs = []
+
+    def add_job(kind: str, name: str, slug: str, series: pd.Series) -> None:
+        series = series.dropna()
+        if series.empty:
+            return
+        years = series.index.to_numpy(dtype=np.float64)
+        jobs.append({
+            "filename": f"{kind}_{slug}_{value_col}.png",
+            "title": f"{name}: {label.capitalize()}",
+            "label": name,
+            "ylabel": label.capitalize(),
+            "years": years,
+            "values": series.to_numpy(dtype=np.float64),
+            "reference": world.reindex(series.index).to_numpy(dtype=np.float64),
+        })
+
+    if "country" in kinds:
+        query = PanelQuery(df)
+        codes = None
+        if "region_code" in df:
+            pairs = df[["region_name", "region_code"]].drop_duplicates("region_name")
+            codes = dict(zip(pairs["region_name"].astype(str), pairs["region_code"].astype(str)))
+        slugs = _unique_slugs(query.countries, codes)
+        for name in query.countries:
+            rows = query.country(name, ["year", value_col])
+            add_job("country", name, slugs[name], pd.Series(rows[value_col].to_numpy(), index=rows["year"].to_numpy()))
+
+    if "region" in kinds and "region_code" in df:
+        by_region = load_country_catalog().rollup(df, by="region", value_col=value_col)
+        slugs = _unique_slugs(list(by_region.columns))
+        for name in by_region.columns:
+            add_job("region", name, slugs[name], by_region[name])
+
+    return jobs
+
+
+def _render_chunk(jobs: list, out_dir: str) -> list:
+    """Worker: render a list of jobs with one reused figure per ylabel."""
+    renderers = {}
+    written = []
+    for job in jobs:
+        renderer = renderers.get(job["ylabel"])
+        if renderer is None:
+            renderer = renderers[job["ylabel"]] = ChartRenderer(job["ylabel"])
+        renderer.render(job, os.path.join(out_dir, job["filename"]))
+        written.append(job["filename"])
+    return written
+
+
+def _read_manifest(out_dir: str) -> dict:
+    try:
+        with open(os.path.join(out_dir, MANIFEST_FILENAME), "r") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_manifest(out_dir: str, manifest: dict) -> None:
+    path = os.path.join(out_dir, MANIFEST_FILENAME)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def render_charts(
+    df: pd.DataFrame,
+    out_dir: str = DEFAULT_CHART_DIR,
+    value_col: str = "gdp_per_capita",
+    kinds: tuple = ("country", "region"),
+    max_workers: Optional[int] = None,
+    force: bool = False,
+) -> dict:
+    """
+    Render per-country and per-region charts, skipping unchanged ones.
+
+    Args:
+        df (pd.DataFrame): Country-level frame returned by the loader.
+        out_dir (str): Directory for the PNGs and the render manifest.
+        value_col (str): Indicator column to chart.
+        kinds (tuple): Any of "country" and "region".
+        max_workers (int | None): Size of the process pool (defaults to the
+            CPU count); 1 renders in the current process.
+        force (bool): Redraw every chart, even if its data is unchanged.
+
+    Returns:
+        dict with keys:
+            total, rendered, skipped, seconds
+    """
+    start = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+
+    jobs = build_chart_jobs(df, value_col, kinds)
+    manifest = _read_manifest(out_dir)
+
+    # Content-addressed skip: same data hash and the PNG still exists
+    pending = []
+    for job in jobs:
+        job["hash"] = chart_hash(job)
+        up_to_date = (
+            manifest.get(job["filename"]) == job["hash"]
+            and os.path.exists(os.path.join(out_dir, job["filename"]))
+        )
+        if force or not up_to_date:
+            pending.append(job)
+
+    max_workers = max_workers or os.cpu_count() or 1
+    n_chunks = min(max_workers, len(pending))
+    if n_chunks <= 1:
+        written = _render_chunk(pending, out_dir)
+    else:
+        # Few large chunks: each worker builds its figure once
+        chunks = [pending[i::n_chunks] for i in range(n_chunks)]
+        with ProcessPoolExecutor(max_workers=n_chunks) as pool:
+            written = [
+                name
+                for names in pool.map(_render_chunk, chunks, [out_dir] * n_chunks)
+                for name in names
+            ]
+
+    hashes = {job["filename"]: job["hash"] for job in pending}
+    for name in written:
+        manifest[name] = hashes[name]
+    _write_manifest(out_dir, manifest)
 
-    # Save the figure object
-    output_path = "data/global_gdp_trend.png"
-    fig.savefig(output_path) # Save the figure object (fig)
\ No newline at end of file
+    return {
+        "total": len(jobs),
+        "rendered": len(written),
+        "skipped": len(jobs) - len(pending),
+        "seconds": time.perf_counter() - start,
+    }
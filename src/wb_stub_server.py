@@ -0,0 +1,190 @@
+"""
+A local stand-in for the World Bank v2 API.
+
+Serves indicator records from memory with the same paging envelope as
+the real API (`[metadata, records]`), so the loaders can be exercised
+offline by pointing their `base_url` at `FakeWorldBankServer.base_url`.
+
+Example:
+    with FakeWorldBankServer(records) as server:
+        fetch_indicator_records("NY.GDP.PCAP.CD", 2000, 2020, base_url=server.base_url)
+"""
+
+import json
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+
+def make_record(indicator: str, code: str, name: str, year: int, value) -> dict:
+    """Build one record shaped like a World Bank API observation."""
+    return {
+        "indicator": {"id": indicator, "value": indicator},
+        "country": {"id": code[:2], "value": name},
+        "countryiso3code": code,
+        "date": str(year),
+        "value": value,
+        "unit": "",
+        "obs_status": "",
+        "decimal": 0,
+    }
+
+
+def make_country_record(
+    code: str, name: str, region: str = "Aggregates", income_level: str = "Aggregates"
+) -> dict:
+    """Build one record shaped like a `/v2/country` metadata entry."""
+    aggregate = region == "Aggregates"
+    return {
+        "id": code,
+        "iso2Code": code[:2],
+        "name": name,
+        "region": {"id": "NA" if aggregate else code[:3], "value": region},
+        "incomeLevel": {"id": "NA" if aggregate else income_level[:3].upper(), "value": income_level},
+        "lendingType": {"id": "", "value": ""},
+        "capitalCity": "",
+    }
+
+
+class FakeWorldBankServer:
+    """
+    Threaded HTTP server answering `/v2/country/all/indicator/<code>` and
+    `/v2/country` (metadata catalog) requests.
+
+    Indicator responses carry ETag / Last-Modified headers derived from
+    `lastupdated`, and conditional requests are answered with 304.
+
+    Attributes:
+        records (dict[str, list[dict]]): Records per indicator code.
+        countries (list[dict]): Records served by `/v2/country`.
+        fail_first (int): Number of initial requests answered with HTTP 503,
+            used to exercise the retry logic.
+        lastupdated (str): Value reported in the paging metadata; change it
+            to simulate a new World Bank release.
+        request_count (int): Number of requests served so far.
+    """
+
+    def __init__(
+        self,
+        records: dict,
+        fail_first: int = 0,
+        lastupdated: str = "2024-01-01",
+        countries: Optional[list] = None,
+        host: str = "127.0.0.1",
+    ):
+        self.records = records
+        self.countries = countries or []
+        self.fail_first = fail_first
+        self.lastupdated = lastupdated
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v2"
+
+    def start(self) -> "FakeWorldBankServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeWorldBankServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ----- request handling -----
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            self.request_count += 1
+            return self.request_count <= self.fail_first
+
+    def _indicator_page(self, indicator: str, query: dict) -> list:
+        rows = self.records.get(indicator)
+        if rows is None:
+            return [{"message": [{"id": "120", "key": "Invalid value",
+                                  "value": "The provided parameter value is not valid"}]}]
+
+        date = query.get("date", [None])[0]
+        if date:
+            start, _, end = date.partition(":")
+            start, end = int(start), int(end or start)
+            rows = [r for r in rows if start <= int(r["date"]) <= end]
+
+        return self._paginate(rows, query)
+
+    def _paginate(self, rows: list, query: dict) -> list:
+        page = int(query.get("page", ["1"])[0])
+        per_page = int(query.get("per_page", ["50"])[0])
+
+        total = len(rows)
+        pages = max(1, math.ceil(total / per_page))
+        chunk = rows[(page - 1) * per_page: page * per_page]
+        meta = {
+            "page": page,
+            "pages": pages,
+            "per_page": per_page,
+            "total": total,
+            "sourceid": "2",
+            "lastupdated": self.lastupdated,
+        }
+        return [meta, chunk or None]
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if server._should_fail():
+                    self.send_error(503, "Service Unavailable")
+                    return
+
+                parsed = urlparse(self.path)
+                parts = parsed.path.strip("/").split("/")
+                query = parse_qs(parsed.query)
+
+                # /v2/country/all/indicator/<indicator>
+                if len(parts) == 5 and parts[1] == "country" and parts[3] == "indicator":
+                    etag = f'"{parts[4]}-{query.get("date", [""])[0]}-{server.lastupdated}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        self.send_response(304)
+                        self.send_header("ETag", etag)
+                        self.end_headers()
+                        return
+                    headers = {"ETag": etag, "Last-Modified": f"{server.lastupdated} 00:00:00 GMT"}
+                    self._send_json(server._indicator_page(parts[4], query), headers)
+                # /v2/country
+                elif len(parts) == 2 and parts[1] == "country":
+                    self._send_json(server._paginate(server.countries, query))
+                else:
+                    self.send_error(404, "Not Found")
+
+            def _send_json(self, payload, headers=None):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Keep test and benchmark output quiet
+                pass
+
+        return Handler
@@ -0,0 +1,45 @@
+"""
+Shared fixtures: a FakeWorldBankServer with a small synthetic indicator
+and an IndicatorCache in a temporary directory.
+"""
+
+import pytest
+
+from src.cache import IndicatorCache
+from src.wb_stub_server import FakeWorldBankServer, make_record
+
+
+INDICATOR = "NY.GDP.PCAP.CD"
+COUNTRIES = [(f"C{i:02d}", f"Country {i:02d}") for i in range(12)]
+FIRST_YEAR, LAST_YEAR = 1990, 2020
+
+
+def make_records(indicator: str = INDICATOR, scale: float = 1.0) -> dict:
+    """One record per country and year, value = scale * (1000 * country + year)."""
+    return {
+        indicator: [
+            make_record(indicator, code, name, year, scale * (1000 * i + year))
+            for i, (code, name) in enumerate(COUNTRIES)
+            for year in range(FIRST_YEAR, LAST_YEAR + 1)
+        ]
+    }
+
+
+@pytest.fixture
+def wb_server():
+    """Factory starting a stub server; every server is stopped at teardown."""
+    servers = []
+
+    def start(records=None, **kwargs) -> FakeWorldBankServer:
+        server = FakeWorldBankServer(make_records() if records is None else records, **kwargs)
+        servers.append(server.start())
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return IndicatorCache(cache_dir=str(tmp_path / "cache"))
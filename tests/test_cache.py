@@ -0,0 +1,97 @@
+"""
+IndicatorCache shared by several processes.
+"""
+
+import json
+import multiprocessing
+import os
+import time
+
+import pandas as pd
+
+from src.cache import INDEX_FILENAME, IndicatorCache
+
+
+N_PROCESSES = 8
+N_ENTRIES = 20
+
+
+def frame(n: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        "region_code": ["C00"] * n, "region_name": ["Country 00"] * n,
+        "year": range(2000, 2000 + n), "value": [float(i) for i in range(n)],
+    })
+
+
+def writer(cache_dir: str, worker: int) -> None:
+    cache = IndicatorCache(cache_dir)
+    for i in range(N_ENTRIES):
+        indicator = f"IND.{worker}.{i}"
+        cache.put(indicator, 2000, 2010, frame(11))
+        assert cache.get(indicator, 2000, 2010) is not None
+        cache.touch(indicator, 2000, 2010)
+
+
+def test_concurrent_processes_keep_the_index_complete(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    IndicatorCache(cache_dir)
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=writer, args=(cache_dir, w)) for w in range(N_PROCESSES)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert all(process.exitcode == 0 for process in processes)
+
+    with open(os.path.join(cache_dir, INDEX_FILENAME)) as file:
+        index = json.load(file)
+    files = {name[:-len(".arrow")] for name in os.listdir(cache_dir) if name.endswith(".arrow")}
+    assert len(index) == N_PROCESSES * N_ENTRIES
+    assert set(index) == files
+
+
+def test_eviction_keeps_index_and_files_in_sync(tmp_path):
+    cache = IndicatorCache(str(tmp_path / "cache"))
+    cache.put("A", 2000, 2010, frame(11))
+    size = cache.metadata("A", 2000, 2010)["bytes"]
+    cache.max_bytes = 2 * size
+    for indicator in ("B", "C", "D"):
+        cache.put(indicator, 2000, 2010, frame(11))
+
+    kept = {meta["indicator"] for meta in cache.entries("C") + cache.entries("D")}
+    assert kept == {"C", "D"}
+    assert cache.metadata("A", 2000, 2010) is None and cache.metadata("B", 2000, 2010) is None
+    assert len([n for n in os.listdir(cache.cache_dir) if n.endswith(".arrow")]) == 2
+
+
+def test_hit_does_not_rewrite_the_index(tmp_path):
+    cache = IndicatorCache(str(tmp_path / "cache"))
+    cache.put("A", 2000, 2010, frame(11))
+    index_path = os.path.join(cache.cache_dir, INDEX_FILENAME)
+    before = os.stat(index_path).st_mtime_ns
+
+    for _ in range(5):
+        assert cache.get("A", 2000, 2010) is not None
+    assert os.stat(index_path).st_mtime_ns == before
+
+
+def test_hits_count_for_lru_eviction(tmp_path):
+    cache = IndicatorCache(str(tmp_path / "cache"))
+    for indicator in ("A", "B"):
+        cache.put(indicator, 2000, 2010, frame(11))
+    # A was stored first but read last: B is the least recently used
+    time.sleep(0.01)
+    cache.get("A", 2000, 2010)
+
+    cache.max_bytes = 2 * cache.metadata("A", 2000, 2010)["bytes"]
+    cache.put("C", 2000, 2010, frame(11))
+    assert cache.metadata("B", 2000, 2010) is None
+    assert cache.metadata("A", 2000, 2010) is not None
+
+
+def test_default_cache_dir_is_under_the_project_root():
+    from src.cache import DEFAULT_CACHE_DIR
+    from src.constants import PROJECT_ROOT
+
+    assert os.path.isabs(DEFAULT_CACHE_DIR)
+    assert DEFAULT_CACHE_DIR == os.path.join(PROJECT_ROOT, "data", "cache")
@@ -0,0 +1,39 @@
+"""
+Demo CSV loader: blank lines, malformed rows and printed values.
+"""
+
+from src.demo_data import load_demo_data, print_countries
+
+
+def write_demo(tmp_path, lines) -> str:
+    path = tmp_path / "demo.csv"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_blank_lines_are_not_counted_as_malformed(tmp_path, capsys):
+    path = write_demo(tmp_path, [
+        "country,year,gdp_per_capita,life_expectancy",
+        '"Korea, Rep.",2020,31721.3,83.4',
+        "",
+        "India,2020,1913.2,70.2",
+        "   ",
+        "Broken,2020,n/a,70",
+        "",
+    ])
+    data = load_demo_data(path)
+    assert list(data.country) == ["Korea, Rep.", "India"]
+    assert data.skipped == 1
+    assert "skipped 1 malformed rows" in capsys.readouterr().out
+
+
+def test_printed_values_keep_full_precision(tmp_path, capsys):
+    path = write_demo(tmp_path, [
+        "country,year,gdp_per_capita,life_expectancy",
+        "India,2020,1402112000,70.123456789",
+        "Chile,2020,0.1,80",
+    ])
+    print_countries(load_demo_data(path))
+    out = capsys.readouterr().out
+    assert "GDP per capita: 1402112000 | Life expectancy: 70.123456789" in out
+    assert "GDP per capita: 0.1 | Life expectancy: 80" in out
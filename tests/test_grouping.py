@@ -0,0 +1,74 @@
+"""
+Aggregate detection with and without the country catalog.
+"""
+
+import pandas as pd
+
+from src import country_catalog, grouping
+from src.country_catalog import CountryCatalog, load_country_catalog
+from src.grouping import GroupClassifier, catalog_group_types, get_default_classifier
+from src.wb_stub_server import make_country_record
+
+
+def test_catalog_is_found_outside_the_project_root(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    load_country_catalog.cache_clear()
+    get_default_classifier.cache_clear()
+    try:
+        assert "SSF" in get_default_classifier().aggregate_codes
+    finally:
+        load_country_catalog.cache_clear()
+        get_default_classifier.cache_clear()
+
+
+def test_missing_catalog_falls_back_to_builtin_sets(tmp_path, monkeypatch):
+    monkeypatch.setattr(country_catalog, "BUNDLED_CATALOG_PATH", str(tmp_path / "none.csv"))
+    monkeypatch.setattr(country_catalog, "CATALOG_CACHE_PATH", str(tmp_path / "none.csv"))
+    load_country_catalog.cache_clear()
+    get_default_classifier.cache_clear()
+    try:
+        classifier = get_default_classifier()
+        assert classifier.code_lookup == grouping.AGGREGATE_CODES
+        assert classifier.classify("World") == "geographic"
+        assert classifier.classify("Kenya") == "other"
+    finally:
+        load_country_catalog.cache_clear()
+        get_default_classifier.cache_clear()
+
+
+def test_group_types_come_from_the_catalog():
+    catalog = CountryCatalog.from_api_records([
+        make_country_record("KEN", "Kenya", region="Sub-Saharan Africa", income_level="Lower middle income"),
+        make_country_record("SSF", "Sub-Saharan Africa"),
+        make_country_record("LMC", "Lower middle income"),
+        make_country_record("WLD", "World"),
+        make_country_record("XYZ", "Some new aggregate"),
+    ])
+    # make_country_record derives the ids from the names
+    catalog.frame.loc["KEN", ["region_id", "income_id"]] = ["SSF", "LMC"]
+
+    assert catalog_group_types(catalog) == {
+        "SSF": "geographic",
+        "LMC": "income_group",
+        "WLD": "geographic",      # typed by WB_AGGREGATES
+        "XYZ": "aggregate",       # unknown kind, still an aggregate
+    }
+
+    classifier = GroupClassifier(catalog)
+    names = pd.Series(["Kenya", "Some new aggregate", "Lower middle income"])
+    codes = pd.Series(["KEN", "XYZ", "LMC"])
+    assert list(classifier.classify_series(names, codes)) == ["other", "aggregate", "income_group"]
+    assert list(classifier.classify_series(names)) == ["other", "aggregate", "income_group"]
+    assert list(classifier.aggregate_mask(names, codes)) == [False, True, True]
+
+
+def test_object_and_categorical_columns_agree():
+    classifier = GroupClassifier()
+    names = pd.Series(["Kenya", "World", "High income", "Unknown", "Kenya", None] * 3)
+    codes = pd.Series(["KEN", "WLD", "HIC", "OED", "KEN", None] * 3)
+    expected = ["other", "geographic", "income_group", "income_group", "other", "other"] * 3
+
+    for n, c in ((names, codes), (names.astype("category"), codes.astype("category"))):
+        assert list(classifier.classify_series(n, c)) == expected
+        assert list(classifier.aggregate_mask(n, c)) == [g != "other" for g in expected]
+    assert list(classifier.classify_series(names)) == [classifier.classify(n) for n in names]
@@ -0,0 +1,48 @@
+"""
+GrowthEngine year-window validation and result caching.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.compare import ComparisonEngine
+from src.growth import GrowthEngine
+from src.memo import ResultCache
+
+
+def make_frame() -> pd.DataFrame:
+    years = np.arange(2000, 2011)
+    return pd.DataFrame({
+        "region_code": np.repeat(["AAA", "BBB"], len(years)),
+        "region_name": np.repeat(["A", "B"], len(years)),
+        "year": np.tile(years, 2),
+        "gdp_per_capita": np.r_[100 * 1.1 ** (years - 2000), 100 * 1.02 ** (years - 2000)],
+    })
+
+
+def test_cagr_between_two_years():
+    cagr = GrowthEngine(make_frame()).cagr(2000, 2010)
+    assert np.allclose(cagr.loc[["A", "B"]], [10.0, 2.0])
+
+
+@pytest.mark.parametrize("start_year, end_year", [(2005, 2005), (2010, 2000)])
+def test_empty_or_reversed_window_is_rejected(start_year, end_year):
+    engine = GrowthEngine(make_frame())
+    with pytest.raises(ValueError, match="end_year must be after start_year"):
+        engine.cagr(start_year, end_year)
+    with pytest.raises(ValueError, match="end_year must be after start_year"):
+        engine.summary(start_year, end_year)
+
+
+def test_engines_reuse_cached_results():
+    growth = GrowthEngine(make_frame())
+    assert growth.summary(2000, 2010) is growth.summary(2000, 2010)
+    comparison = ComparisonEngine(growth.panel)
+    assert comparison.rank_matrix() is comparison.rank_matrix()
+
+    calls = []
+    cache = ResultCache()
+    for _ in range(3):
+        cache.get(("key",), lambda: calls.append(1) or len(calls))
+    assert calls == [1] and len(cache) == 1
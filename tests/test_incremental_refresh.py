@@ -0,0 +1,87 @@
+"""
+Incremental refresh of cached indicator snapshots (refresh_indicator_frame),
+against the local stub server.
+"""
+
+from src.load_wb_data import fetch_indicator_frame
+from tests.conftest import COUNTRIES, INDICATOR, make_records
+
+
+def refresh(server, cache, start_year: int, end_year: int):
+    return fetch_indicator_frame(
+        INDICATOR, "gdp_per_capita", start_year, end_year,
+        base_url=server.base_url, cache=cache, incremental=True,
+    )
+
+
+def ranges(cache) -> list:
+    return sorted((m["start_year"], m["end_year"]) for m in cache.entries(INDICATOR))
+
+
+def assert_complete(df, start_year: int, end_year: int) -> None:
+    assert len(df) == len(COUNTRIES) * (end_year - start_year + 1)
+    assert set(df["year"]) == set(range(start_year, end_year + 1))
+    assert df["gdp_per_capita"].notna().all()
+
+
+def test_adjacent_range_extends_the_snapshot(wb_server, cache):
+    server = wb_server()
+    refresh(server, cache, 2000, 2005)
+    df = refresh(server, cache, 2006, 2010)
+
+    assert_complete(df, 2006, 2010)
+    assert ranges(cache) == [(2000, 2010)]
+    windows = [(e["start_year"], e["end_year"], e["reason"]) for e in cache.manifest(INDICATOR)]
+    assert windows == [(2000, 2005, "full"), (2006, 2010, "missing")]
+    assert_complete(refresh(server, cache, 2000, 2010), 2000, 2010)
+
+
+def test_overlapping_range_fetches_only_missing_years(wb_server, cache):
+    server = wb_server()
+    refresh(server, cache, 2000, 2005)
+    df = refresh(server, cache, 1998, 2008)
+
+    assert_complete(df, 1998, 2008)
+    assert ranges(cache) == [(1998, 2008)]
+    windows = {(e["start_year"], e["end_year"]) for e in cache.manifest(INDICATOR)[1:]}
+    assert windows == {(1998, 1999), (2006, 2008)}
+
+
+def test_disjoint_range_is_cached_separately(wb_server, cache):
+    server = wb_server()
+    refresh(server, cache, 2000, 2005)
+    df = refresh(server, cache, 2010, 2012)
+
+    assert_complete(df, 2010, 2012)
+    # No single entry may claim the 2006-2009 gap
+    assert ranges(cache) == [(2000, 2005), (2010, 2012)]
+
+    gap = refresh(server, cache, 2006, 2009)
+    assert_complete(gap, 2006, 2009)
+    for start_year, end_year in ((2000, 2012), (2003, 2011)):
+        assert_complete(refresh(server, cache, start_year, end_year), start_year, end_year)
+
+
+def test_fresh_covered_request_needs_no_request(wb_server, cache):
+    server = wb_server()
+    refresh(server, cache, 2000, 2010)
+    requests_before = server.request_count
+    df = refresh(server, cache, 2003, 2007)
+
+    assert server.request_count == requests_before
+    assert_complete(df, 2003, 2007)
+
+
+def test_new_release_refreshes_the_last_cached_years(wb_server, cache):
+    server = wb_server()
+    cache.ttl_seconds = 0
+    refresh(server, cache, 2000, 2010)
+
+    server.records = make_records(scale=-1.0)
+    server.lastupdated = "2024-07-01"
+    df = refresh(server, cache, 2000, 2010)
+
+    assert_complete(df, 2000, 2010)
+    revised = df[df["gdp_per_capita"] < 0]
+    assert set(revised["year"]) == {2008, 2009, 2010}
+    assert cache.manifest(INDICATOR)[-1]["reason"] == "revision"
@@ -0,0 +1,51 @@
+"""
+Stage memory measurements and environment parsing of the tracer.
+"""
+
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from src.constants import PROJECT_ROOT
+from src.instrumentation import Tracer, tracer_from_env
+
+
+def test_rss_mode_reports_the_stage_growth_not_the_process_peak():
+    tracer = Tracer(enabled=True, memory="rss")
+    # Raise the process high-water mark first, then free it
+    big = np.ones(64 * 2**20 // 8)
+    del big
+
+    with tracer.stage("small"):
+        small = np.ones(1024)
+    with tracer.stage("large"):
+        large = np.ones(32 * 2**20 // 8)
+    del small, large
+
+    small_record, large_record = tracer.records
+    assert small_record.peak_bytes < 8 * 2**20
+    assert large_record.peak_bytes >= 16 * 2**20
+
+
+def test_invalid_memory_mode_disables_tracing_with_a_warning():
+    with pytest.warns(RuntimeWarning, match="WEALTH_TRACE_MEMORY"):
+        tracer = tracer_from_env({"WEALTH_TRACE": "1", "WEALTH_TRACE_MEMORY": "bogus"})
+    assert not tracer.enabled
+
+    tracer = tracer_from_env({"WEALTH_TRACE": "1", "WEALTH_TRACE_MEMORY": "TraceMalloc"})
+    assert tracer.enabled and tracer.memory == "tracemalloc"
+
+
+def test_import_survives_a_malformed_environment():
+    result = subprocess.run(
+        [sys.executable, "-c", "import src.instrumentation as i; print(i.TRACER.enabled)"],
+        env={"WEALTH_TRACE": "1", "WEALTH_TRACE_MEMORY": "bogus"},
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "False"
+    assert "WEALTH_TRACE_MEMORY" in result.stderr
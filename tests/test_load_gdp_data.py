@@ -0,0 +1,65 @@
+"""
+End-to-end load_gdp_data runs against the stub server.
+"""
+
+import pandas as pd
+
+from src.load_wb_data import compact_frame, load_gdp_data
+from tests.conftest import COUNTRIES, INDICATOR, make_records
+
+
+def records_with_gaps() -> dict:
+    records = make_records()
+    for record in records[INDICATOR]:
+        if record["date"] in ("2003", "2004") and record["countryiso3code"] in ("C00", "C01"):
+            record["value"] = None
+    return records
+
+
+def test_coverage_is_returned_separately(wb_server, cache):
+    server = wb_server(records_with_gaps())
+    df, coverage = load_gdp_data(
+        indicators={"gdp_per_capita": INDICATOR}, start_year=2000, end_year=2010,
+        cache=cache, base_url=server.base_url, fill_method="linear", return_coverage=True,
+    )
+
+    assert not df.attrs
+    assert df["gdp_per_capita"].notna().all()
+    assert df["imputed"].sum() == 4
+
+    by_year = coverage.loc["gdp_per_capita"]
+    assert list(by_year.loc[[2002, 2003], "observed"]) == [len(COUNTRIES), len(COUNTRIES) - 2]
+    assert by_year.loc[2003, "filled"] == 2
+
+    # Frames of two loads can be combined
+    assert len(pd.concat([df, df])) == 2 * len(df)
+
+
+def test_no_coverage_without_filling(wb_server, cache):
+    server = wb_server()
+    df, coverage = load_gdp_data(
+        indicators={"gdp_per_capita": INDICATOR}, start_year=2000, end_year=2010,
+        cache=cache, base_url=server.base_url, return_coverage=True,
+    )
+    assert coverage is None
+    assert len(df) == len(COUNTRIES) * 11
+
+    df = load_gdp_data(
+        indicators={"gdp_per_capita": INDICATOR}, start_year=2000, end_year=2010,
+        cache=cache, base_url=server.base_url,
+    )
+    assert isinstance(df, pd.DataFrame)
+
+
+def test_float32_compaction_keeps_population_exact():
+    df = pd.DataFrame({
+        "region_code": ["IND", "CHN"],
+        "region_name": ["India", "China"],
+        "year": [2020, 2020],
+        "gdp_per_capita": [1913.2, 10408.7],
+        "population": [1_380_004_385.0, 1_411_100_001.0],
+    })
+    out = compact_frame(df, float_dtype="float32")
+    assert out["gdp_per_capita"].dtype == "float32"
+    assert out["population"].dtype == "float64"
+    assert out["population"].tolist() == df["population"].tolist()
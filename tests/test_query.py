@@ -0,0 +1,54 @@
+"""
+PanelQuery ordering, and the shared panel's sorted layout.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.query import PanelQuery, is_sorted, sort_panel
+from src.shared_panel import PanelPublisher, SharedPanelReader
+
+
+def make_frame() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    names = [f"Country {i:02d}" for i in range(20)]
+    df = pd.DataFrame({
+        "region_name": pd.Categorical(np.repeat(names, 10)),
+        "year": np.tile(np.arange(2000, 2010, dtype=np.int16), 20),
+        "gdp_per_capita": rng.lognormal(8, 1, 200),
+    })
+    return df.sample(frac=1, random_state=0)
+
+
+def test_unsorted_frame_is_sorted():
+    df = make_frame()
+    assert not is_sorted(df)
+    query = PanelQuery(df)
+    assert is_sorted(query.frame)
+    assert query.countries == sorted(query.countries)
+    assert list(query.country("Country 03")["year"]) == list(range(2000, 2010))
+
+
+def test_sorted_frame_is_not_copied():
+    df = make_frame().sort_values(["region_name", "year"])
+    query = PanelQuery(df)
+    assert isinstance(query.frame.index, pd.RangeIndex)
+    assert np.shares_memory(query.frame["gdp_per_capita"].to_numpy(), df["gdp_per_capita"].to_numpy())
+    pd.testing.assert_frame_equal(query.frame, sort_panel(make_frame()))
+
+
+def test_ties_on_the_first_key_are_ordered_by_the_second():
+    df = pd.DataFrame({"region_name": ["A", "A", "B"], "year": [2001, 2000, 1999]})
+    assert not is_sorted(df)
+    assert is_sorted(df.iloc[[1, 0, 2]])
+
+
+def test_published_panel_is_queried_in_place(tmp_path):
+    df = make_frame()
+    PanelPublisher(str(tmp_path)).publish(df)
+    mapped = SharedPanelReader(str(tmp_path)).get().data
+
+    assert is_sorted(mapped)
+    query = PanelQuery(mapped)
+    assert np.shares_memory(query.frame["gdp_per_capita"].to_numpy(), mapped["gdp_per_capita"].to_numpy())
+    pd.testing.assert_frame_equal(query.page(2, 25), PanelQuery(df).page(2, 25))
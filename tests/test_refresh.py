@@ -0,0 +1,55 @@
+"""
+Age of the first snapshot of a BackgroundRefresher.
+"""
+
+import time
+
+import pandas as pd
+
+from src.refresh import BackgroundRefresher
+
+
+OLD = pd.DataFrame({"value": [1.0]})
+NEW = pd.DataFrame({"value": [2.0]})
+
+
+def test_old_disk_snapshot_is_refreshed_at_once():
+    refresher = BackgroundRefresher(
+        loader=lambda: NEW, initial_loader=lambda: OLD,
+        initial_loaded_at=lambda: time.time() - 7200, max_age_seconds=3600,
+    )
+    first = refresher.get()
+    assert first.data is OLD and refresher.is_stale(first)
+    refresher.wait()
+    assert refresher.get().data is NEW and refresher.get().version == 2
+
+
+def test_recent_disk_snapshot_is_served_as_is():
+    refresher = BackgroundRefresher(
+        loader=lambda: NEW, initial_loader=lambda: OLD,
+        initial_loaded_at=lambda: time.time() - 60, max_age_seconds=3600,
+    )
+    assert refresher.get().data is OLD
+    assert not refresher.refreshing and refresher._thread is None
+
+
+def test_initial_loader_of_unknown_age_counts_as_stale():
+    refresher = BackgroundRefresher(loader=lambda: NEW, initial_loader=lambda: OLD)
+    assert refresher.get().loaded_at == 0
+    refresher.wait()
+    assert refresher.get().data is NEW
+
+
+def test_first_load_through_loader_is_fresh():
+    refresher = BackgroundRefresher(loader=lambda: NEW)
+    assert not refresher.is_stale(refresher.get())
+
+
+def test_panel_age_is_its_oldest_entry(cache):
+    frame = pd.DataFrame({"region_code": ["C00"], "region_name": ["Country 00"], "year": [2000], "value": [1.0]})
+    cache.put("A", 2000, 2020, frame)
+    cache.put("B", 2000, 2020, frame)
+    stamps = [cache.metadata(code, 2000, 2020)["fetched_at"] for code in ("A", "B")]
+
+    assert cache.fetched_at(["A", "B"], 2000, 2020) == min(stamps)
+    assert cache.fetched_at(["A", "B", "C"], 2000, 2020) == 0
@@ -0,0 +1,37 @@
+"""
+Startup budget of the entry points: each is imported in a fresh
+interpreter under `python -X importtime` (see benchmarks/bench_startup.py).
+The budgets get a generous margin here, so a busy test machine does not
+fail the suite; the benchmark applies them as-is.
+"""
+
+import importlib.util
+
+import pytest
+
+from benchmarks.bench_startup import ENTRY_POINTS, HEAVY_MODULES, measure
+
+
+BUDGET_MARGIN = 3
+REPEAT = 3
+
+# Project modules that pull in the loader or plotting stacks
+HEAVY_PROJECT_MODULES = ("src.load_wb_data", "src.visualization")
+
+
+@pytest.mark.parametrize("label", list(ENTRY_POINTS))
+def test_entry_point_imports_are_cheap(label):
+    module, budget = ENTRY_POINTS[label]
+    exclude = None
+    if module == "app":
+        if importlib.util.find_spec("streamlit") is None:
+            pytest.skip("streamlit not installed")
+        exclude = "streamlit"
+
+    heavy = HEAVY_PROJECT_MODULES + (("matplotlib",) if exclude else HEAVY_MODULES + ("streamlit",))
+    result = measure(module, REPEAT, exclude, check_modules=heavy)
+
+    assert not result["heavy"], f"{module} imports {', '.join(result['heavy'])} at startup"
+    assert result["import_ms"] <= budget * BUDGET_MARGIN, (
+        f"{module} import took {result['import_ms']:.1f} ms (budget {budget} ms x {BUDGET_MARGIN})"
+    )
@@ -0,0 +1,40 @@
+"""
+Chart file names: colliding country names must not overwrite each other.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.visualization import _unique_slugs, build_chart_jobs, render_charts
+
+
+def make_frame() -> pd.DataFrame:
+    names = {"KOR": "Korea, Rep.", "KRX": "Korea Rep", "FRA": "France"}
+    years = np.arange(2000, 2005)
+    return pd.DataFrame({
+        "region_code": np.repeat(list(names), len(years)),
+        "region_name": np.repeat(list(names.values()), len(years)),
+        "year": np.tile(years, len(names)),
+        "gdp_per_capita": np.arange(len(names) * len(years), dtype=float) + 1,
+    })
+
+
+def test_colliding_slugs_get_their_code():
+    slugs = _unique_slugs(["Korea, Rep.", "Korea Rep", "France"], {"Korea, Rep.": "KOR", "Korea Rep": "KRX"})
+    assert slugs == {"Korea, Rep.": "korea_rep_kor", "Korea Rep": "korea_rep_krx", "France": "france"}
+    # Without codes a counter keeps them apart
+    assert _unique_slugs(["A b", "a-b"]) == {"A b": "a_b", "a-b": "a_b_2"}
+
+
+def test_every_country_gets_its_own_chart(tmp_path):
+    df = make_frame()
+    filenames = [job["filename"] for job in build_chart_jobs(df, kinds=("country",))]
+    assert len(set(filenames)) == 3
+
+    out_dir = str(tmp_path / "charts")
+    first = render_charts(df, out_dir, kinds=("country",), max_workers=1)
+    assert first["rendered"] == 3
+    assert sorted(name for name in os.listdir(out_dir) if name.endswith(".png")) == sorted(filenames)
+    assert render_charts(df, out_dir, kinds=("country",), max_workers=1)["skipped"] == 3
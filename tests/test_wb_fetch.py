@@ -0,0 +1,120 @@
+"""
+Paging, retries and conditional requests of the World Bank loader,
+against the local stub server.
+"""
+
+from src.cache import IndicatorCache
+from src.load_wb_data import fetch_indicator_frame, fetch_indicator_records, probe_indicator
+from tests.conftest import COUNTRIES, FIRST_YEAR, INDICATOR, LAST_YEAR, make_records
+
+
+N_RECORDS = len(COUNTRIES) * (LAST_YEAR - FIRST_YEAR + 1)
+
+
+# --- 1. Paging ---
+
+def test_every_page_is_downloaded(wb_server):
+    server = wb_server()
+    records = fetch_indicator_records(
+        INDICATOR, FIRST_YEAR, LAST_YEAR, base_url=server.base_url, per_page=10, max_workers=4
+    )
+    assert len(records) == N_RECORDS
+    # First page alone, then the remaining pages
+    assert server.request_count == -(-N_RECORDS // 10)
+    keys = {(r["countryiso3code"], r["date"]) for r in records}
+    assert len(keys) == N_RECORDS
+
+
+def test_date_range_is_forwarded(wb_server):
+    server = wb_server()
+    records = fetch_indicator_records(INDICATOR, 2000, 2004, base_url=server.base_url, per_page=7)
+    assert len(records) == len(COUNTRIES) * 5
+    assert {int(r["date"]) for r in records} == set(range(2000, 2005))
+
+
+def test_unknown_indicator_returns_none(wb_server):
+    server = wb_server()
+    assert fetch_indicator_records("NO.SUCH.CODE", 2000, 2004, base_url=server.base_url) is None
+
+
+# --- 2. Retries ---
+
+def test_transient_errors_are_retried(wb_server):
+    server = wb_server(fail_first=2)
+    records = fetch_indicator_records(
+        INDICATOR, FIRST_YEAR, LAST_YEAR, base_url=server.base_url, backoff=0.01
+    )
+    assert len(records) == N_RECORDS
+    assert server.request_count == 3
+
+
+def test_gives_up_after_the_last_retry(wb_server):
+    server = wb_server(fail_first=10)
+    records = fetch_indicator_records(
+        INDICATOR, FIRST_YEAR, LAST_YEAR, base_url=server.base_url, retries=2, backoff=0.01
+    )
+    assert records is None
+    assert server.request_count == 3
+
+
+# --- 3. Conditional requests (ETag / 304) ---
+
+def test_probe_with_etag_is_not_modified(wb_server):
+    server = wb_server()
+    first = probe_indicator(INDICATOR, 2000, 2010, base_url=server.base_url)
+    assert not first["not_modified"]
+    assert first["etag"] and first["lastupdated"] == "2024-01-01"
+    assert first["total"] == len(COUNTRIES) * 11
+
+    again = probe_indicator(INDICATOR, 2000, 2010, base_url=server.base_url, etag=first["etag"])
+    assert again["not_modified"]
+
+    server.lastupdated = "2024-07-01"
+    changed = probe_indicator(INDICATOR, 2000, 2010, base_url=server.base_url, etag=first["etag"])
+    assert not changed["not_modified"]
+
+
+def test_stale_entry_is_revalidated_with_304(wb_server, tmp_path):
+    server = wb_server()
+    cache = IndicatorCache(cache_dir=str(tmp_path / "cache"), ttl_seconds=0)
+
+    first = fetch_indicator_frame(
+        INDICATOR, "gdp_per_capita", 2000, 2010, base_url=server.base_url, cache=cache
+    )
+    assert len(first) == len(COUNTRIES) * 11
+    fetched_at = cache.metadata(INDICATOR, 2000, 2010)["fetched_at"]
+
+    # Stale entry, unchanged data: one conditional request, served from disk
+    requests_before = server.request_count
+    second = fetch_indicator_frame(
+        INDICATOR, "gdp_per_capita", 2000, 2010, base_url=server.base_url, cache=cache
+    )
+    assert server.request_count == requests_before + 1
+    assert second.equals(first)
+    assert cache.metadata(INDICATOR, 2000, 2010)["fetched_at"] >= fetched_at
+
+
+def test_new_release_is_downloaded_again(wb_server, tmp_path):
+    server = wb_server()
+    cache = IndicatorCache(cache_dir=str(tmp_path / "cache"), ttl_seconds=0)
+    fetch_indicator_frame(INDICATOR, "gdp_per_capita", 2000, 2010, base_url=server.base_url, cache=cache)
+
+    server.records = make_records(scale=-1.0)
+    server.lastupdated = "2024-07-01"
+    df = fetch_indicator_frame(
+        INDICATOR, "gdp_per_capita", 2000, 2010, base_url=server.base_url, cache=cache
+    )
+    assert (df["gdp_per_capita"] < 0).all()
+    assert cache.metadata(INDICATOR, 2000, 2010)["lastupdated"] == "2024-07-01"
+
+
+def test_fresh_entry_needs_no_request(wb_server, cache):
+    server = wb_server()
+    fetch_indicator_frame(INDICATOR, "gdp_per_capita", 2000, 2010, base_url=server.base_url, cache=cache)
+    requests_before = server.request_count
+    df = fetch_indicator_frame(
+        INDICATOR, "gdp_per_capita", 2000, 2010, base_url=server.base_url, cache=cache
+    )
+    assert server.request_count == requests_before
+    assert len(df) == len(COUNTRIES) * 11
+